@@ -17,12 +17,52 @@ class Settings:
     # Database - supports Render's persistent disk via DATABASE_PATH env var
     DB_PATH: Path = Path(os.getenv("DATABASE_PATH", str(ROOT_DIR / 'laundry.db')))
     
+    # Database connection pool and SQLite pragmas
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "8"))
+    DB_POOL_TIMEOUT: float = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+    DB_JOURNAL_MODE: str = os.getenv("DB_JOURNAL_MODE", "WAL")
+    DB_SYNCHRONOUS: str = os.getenv("DB_SYNCHRONOUS", "NORMAL")
+    DB_BUSY_TIMEOUT_MS: int = int(os.getenv("DB_BUSY_TIMEOUT_MS", "5000"))
+    DB_CACHE_SIZE_KB: int = int(os.getenv("DB_CACHE_SIZE_KB", "16384"))
+    DB_MMAP_SIZE: int = int(os.getenv("DB_MMAP_SIZE", str(256 * 1024 * 1024)))
+    DB_STATEMENT_CACHE_SIZE: int = int(os.getenv("DB_STATEMENT_CACHE_SIZE", "256"))
+    # Threads serving async routes' database calls (defaults to the pool size)
+    DB_EXECUTOR_THREADS: int = int(os.getenv("DB_EXECUTOR_THREADS", os.getenv("DB_POOL_SIZE", "8")))
+    
     # CORS
     ALLOWED_ORIGINS: list[str] = os.getenv(
         "ALLOWED_ORIGINS", 
         "http://localhost:3000,http://127.0.0.1:3000"
     ).split(",")
     
+    # Catalog cache: max seconds between checks for writes from other processes
+    CATALOG_CHECK_INTERVAL: float = float(os.getenv("CATALOG_CHECK_INTERVAL", "0.05"))
+    
+    # Cost result cache
+    COST_CACHE_MAX_ENTRIES: int = int(os.getenv("COST_CACHE_MAX_ENTRIES", "1024"))
+    COST_CACHE_TTL: float = float(os.getenv("COST_CACHE_TTL", "300"))
+    
+    # Largest page size accepted by list endpoints
+    LIST_MAX_LIMIT: int = int(os.getenv("LIST_MAX_LIMIT", "1000"))
+    
+    # Encoded list responses: cache budget and compression threshold
+    ENCODED_CACHE_MAX_BYTES: int = int(os.getenv("ENCODED_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+    RESPONSE_COMPRESS_MIN_BYTES: int = int(os.getenv("RESPONSE_COMPRESS_MIN_BYTES", "1024"))
+    
+    # Meter readings import: rows per insert batch, upload bytes kept in memory
+    READINGS_BATCH_SIZE: int = int(os.getenv("READINGS_BATCH_SIZE", "5000"))
+    READINGS_SPOOL_MAX_BYTES: int = int(os.getenv("READINGS_SPOOL_MAX_BYTES", str(8 * 1024 * 1024)))
+    
+    # Cost analysis limits
+    BATCH_MAX_REQUESTS: int = int(os.getenv("BATCH_MAX_REQUESTS", "10000"))
+    SWEEP_MAX_POINTS: int = int(os.getenv("SWEEP_MAX_POINTS", "1000000"))
+    SIMULATION_MAX_SAMPLES: int = int(os.getenv("SIMULATION_MAX_SAMPLES", "1000000"))
+    PROJECTION_MAX_MONTHS: int = int(os.getenv("PROJECTION_MAX_MONTHS", "600"))
+    SCHEDULE_MAX_DAYS: int = int(os.getenv("SCHEDULE_MAX_DAYS", "366"))
+    PIPELINE_MAX_DAYS: int = int(os.getenv("PIPELINE_MAX_DAYS", "366"))
+    PIPELINE_MAX_ARRIVALS_PER_DAY: int = int(os.getenv("PIPELINE_MAX_ARRIVALS_PER_DAY", "96"))
+    FORECAST_MAX_PERIODS: int = int(os.getenv("FORECAST_MAX_PERIODS", "3660"))
+    
     # App settings
     DEBUG: bool = os.getenv("DEBUG", "false").lower() == "true"
     APP_TITLE: str = "Laundry Digital Twin API"
@@ -1,131 +1,210 @@
 """
 Database connection and initialization module.
-Handles SQLite database setup and connection management.
+Handles SQLite database setup and pooled connection management.
 """
+import asyncio
+import atexit
+import functools
+import os
+import queue
 import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
-from typing import Generator
+from typing import Any, Callable, Dict, Generator, List, Optional, TypeVar
 
 from .config import settings
 
 
+class ConnectionPool:
+    """
+    Bounded pool of reusable SQLite connections for one database file.
+    Connections are created lazily (up to DB_POOL_SIZE) with the pragmas
+    from settings applied once; callers wait up to DB_POOL_TIMEOUT seconds
+    for a free connection.
+    """
+    
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self.pid = os.getpid()
+        self._idle: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._all: List[sqlite3.Connection] = []
+        self._stats = {
+            "checkouts": 0,
+            "waits": 0,
+            "timeouts": 0,
+            "wait_time_total_ms": 0.0,
+            "wait_time_max_ms": 0.0,
+        }
+    
+    def _connect(self) -> sqlite3.Connection:
+        """Open a new connection with the configured pragmas."""
+        conn = sqlite3.connect(
+            self.db_path,
+            check_same_thread=False,
+            cached_statements=settings.DB_STATEMENT_CACHE_SIZE,
+        )
+        conn.row_factory = sqlite3.Row
+        conn.execute(f"PRAGMA busy_timeout = {int(settings.DB_BUSY_TIMEOUT_MS)}")
+        conn.execute(f"PRAGMA journal_mode = {settings.DB_JOURNAL_MODE}")
+        conn.execute(f"PRAGMA synchronous = {settings.DB_SYNCHRONOUS}")
+        conn.execute(f"PRAGMA cache_size = {-int(settings.DB_CACHE_SIZE_KB)}")
+        conn.execute(f"PRAGMA mmap_size = {int(settings.DB_MMAP_SIZE)}")
+        conn.execute("PRAGMA foreign_keys = ON")
+        return conn
+    
+    def acquire(self) -> sqlite3.Connection:
+        """Check out a connection, opening one or waiting if none is idle."""
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            conn = None
+        
+        if conn is None:
+            with self._lock:
+                can_open = len(self._all) < settings.DB_POOL_SIZE
+                if can_open:
+                    conn = self._connect()
+                    self._all.append(conn)
+        
+        if conn is None:
+            started = time.perf_counter()
+            try:
+                conn = self._idle.get(timeout=settings.DB_POOL_TIMEOUT)
+            except queue.Empty:
+                with self._lock:
+                    self._stats["timeouts"] += 1
+                raise TimeoutError(
+                    f"No database connection available after {settings.DB_POOL_TIMEOUT}s"
+                )
+            waited_ms = (time.perf_counter() - started) * 1000
+            with self._lock:
+                self._stats["waits"] += 1
+                self._stats["wait_time_total_ms"] += waited_ms
+                self._stats["wait_time_max_ms"] = max(self._stats["wait_time_max_ms"], waited_ms)
+        
+        with self._lock:
+            self._stats["checkouts"] += 1
+        return conn
+    
+    def release(self, conn: sqlite3.Connection) -> None:
+        """Return a connection, rolling back anything left uncommitted."""
+        if conn.in_transaction:
+            conn.rollback()
+        self._idle.put(conn)
+    
+    def close(self) -> None:
+        """Close every connection (checkpoints and removes the WAL file)."""
+        with self._lock:
+            for conn in self._all:
+                conn.close()
+            self._all.clear()
+        self._idle = queue.LifoQueue()
+    
+    def stats(self) -> Dict[str, Any]:
+        """Pool size, idle connections and checkout/wait metrics."""
+        with self._lock:
+            return {
+                **self._stats,
+                "wait_time_total_ms": round(self._stats["wait_time_total_ms"], 3),
+                "wait_time_max_ms": round(self._stats["wait_time_max_ms"], 3),
+                "size": len(self._all),
+                "max_size": settings.DB_POOL_SIZE,
+                "idle": self._idle.qsize(),
+            }
+
+
+_pools: Dict[str, ConnectionPool] = {}
+_pools_lock = threading.Lock()
+_local = threading.local()
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_pid: Optional[int] = None
+
+T = TypeVar("T")
+
+
+def get_pool() -> ConnectionPool:
+    """Pool for the configured database file (recreated after a fork)."""
+    db_path = str(settings.DB_PATH)
+    pool = _pools.get(db_path)
+    if pool is None or pool.pid != os.getpid():
+        with _pools_lock:
+            pool = _pools.get(db_path)
+            if pool is None or pool.pid != os.getpid():
+                pool = ConnectionPool(db_path)
+                _pools[db_path] = pool
+    return pool
+
+
+def close_pools() -> None:
+    """Close all pooled connections of this process."""
+    global _executor
+    with _pools_lock:
+        if _executor is not None and _executor_pid == os.getpid():
+            _executor.shutdown(wait=True)
+        _executor = None
+        for pool in _pools.values():
+            if pool.pid == os.getpid():
+                pool.close()
+        _pools.clear()
+
+
+def get_db_executor() -> ThreadPoolExecutor:
+    """Dedicated threads (and work queue) that run database calls for async code."""
+    global _executor, _executor_pid
+    if _executor is None or _executor_pid != os.getpid():
+        with _pools_lock:
+            if _executor is None or _executor_pid != os.getpid():
+                _executor = ThreadPoolExecutor(
+                    max_workers=settings.DB_EXECUTOR_THREADS,
+                    thread_name_prefix="db",
+                )
+                _executor_pid = os.getpid()
+    return _executor
+
+
+async def run_db(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    Run a blocking database function on the DB executor without blocking
+    the event loop.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_db_executor(), functools.partial(func, *args, **kwargs))
+
+
+atexit.register(close_pools)
+
+
 @contextmanager
 def get_db() -> Generator[sqlite3.Connection, None, None]:
     """
     Context manager for database connections.
-    Ensures proper cleanup and enables row factory for dict-like access.
+    Checks a pooled connection out for the duration of the block; nested
+    calls in the same thread reuse the outer connection.
     """
-    conn = sqlite3.connect(settings.DB_PATH)
-    conn.row_factory = sqlite3.Row
+    held = getattr(_local, "held", None)
+    if held is not None and held[0].db_path == str(settings.DB_PATH):
+        yield held[1]
+        return
+    
+    pool = get_pool()
+    conn = pool.acquire()
+    _local.held = (pool, conn)
     try:
         yield conn
     finally:
-        conn.close()
+        _local.held = None
+        pool.release(conn)
 
 
 def init_db() -> None:
     """
-    Initialize the database with all required tables.
-    Creates tables if they don't exist.
+    Initialize the database: apply any pending schema migrations.
+    Up-to-date databases only pay for a version lookup.
     """
+    from .migrations import migrate
+    
     with get_db() as conn:
-        cursor = conn.cursor()
-        
-        # Locations table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS locations (
-                id TEXT PRIMARY KEY,
-                name TEXT NOT NULL,
-                created_at TEXT NOT NULL
-            )
-        ''')
-        
-        # Washing machines table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS washing_machines (
-                id TEXT PRIMARY KEY,
-                model TEXT NOT NULL,
-                capacity_kg REAL NOT NULL,
-                water_consumption_l REAL NOT NULL,
-                energy_consumption_kwh REAL NOT NULL,
-                cycle_duration_min INTEGER NOT NULL,
-                created_at TEXT NOT NULL
-            )
-        ''')
-        
-        # Drying machines table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS drying_machines (
-                id TEXT PRIMARY KEY,
-                model TEXT NOT NULL,
-                capacity_kg REAL NOT NULL DEFAULT 10.0,
-                energy_consumption_kwh_per_cycle REAL NOT NULL,
-                cycle_duration_min INTEGER NOT NULL DEFAULT 45,
-                created_at TEXT NOT NULL
-            )
-        ''')
-        
-        # Ironing machines table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS ironing_machines (
-                id TEXT PRIMARY KEY,
-                model TEXT NOT NULL,
-                ironing_labor_hours REAL NOT NULL DEFAULT 10.0,
-                energy_consumption_kwh_per_hour REAL NOT NULL,
-                created_at TEXT NOT NULL
-            )
-        ''')
-        
-        # Chemicals table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS chemicals (
-                id TEXT PRIMARY KEY,
-                name TEXT NOT NULL,
-                type TEXT NOT NULL,
-                package_price REAL NOT NULL,
-                package_amount REAL NOT NULL,
-                usage_per_cycle REAL NOT NULL,
-                unit TEXT NOT NULL DEFAULT 'g',
-                created_at TEXT NOT NULL
-            )
-        ''')
-        
-        # Configurations table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS configurations (
-                id TEXT PRIMARY KEY,
-                name TEXT NOT NULL,
-                currency TEXT NOT NULL DEFAULT 'EUR',
-                electricity_rate REAL NOT NULL,
-                water_rate REAL NOT NULL,
-                labor_rate REAL NOT NULL,
-                season TEXT NOT NULL,
-                tariff_mode TEXT NOT NULL,
-                location_id TEXT,
-                washing_machine_id TEXT,
-                drying_machine_id TEXT,
-                ironing_machine_id TEXT,
-                cycles_per_month INTEGER NOT NULL,
-                operational_volume REAL DEFAULT 1000.0,
-                operational_period TEXT DEFAULT 'month',
-                washing_load_percentage REAL DEFAULT 80.0,
-                drying_load_percentage REAL DEFAULT 80.0,
-                ironing_labor_hours REAL DEFAULT 10.0,
-                chemical_ids TEXT DEFAULT '',
-                transport_enabled INTEGER DEFAULT 0,
-                transport_mode TEXT DEFAULT 'fixed',
-                transport_fixed_cost REAL DEFAULT 0.0,
-                transport_distance_km REAL DEFAULT 0.0,
-                transport_time_hours REAL DEFAULT 0.0,
-                transport_labor_rate REAL DEFAULT 0.0,
-                transport_fuel_rate REAL DEFAULT 0.0,
-                electricity_tariff_mode TEXT DEFAULT 'standard',
-                electricity_tariff_price REAL DEFAULT 1.0,
-                water_tariff_mode TEXT DEFAULT 'standard',
-                water_tariff_price REAL DEFAULT 1.0,
-                created_at TEXT NOT NULL,
-                updated_at TEXT NOT NULL
-            )
-        ''')
-        
-        conn.commit()
+        migrate(conn)
@@ -0,0 +1,83 @@
+"""
+Schema migrations - ordered, versioned upgrade steps for the database.
+
+Each migration module defines VERSION and upgrade(cursor). Applied
+versions are recorded in schema_migrations, so every migration runs once
+per database. Add new migrations to the end of MIGRATIONS.
+"""
+import sqlite3
+from datetime import datetime, timezone
+from typing import List
+
+from . import (
+    m0001_initial_schema,
+    m0002_table_versions,
+    m0003_unique_configuration_name,
+    m0004_lookup_indexes,
+    m0005_configuration_chemicals,
+    m0006_configuration_revisions,
+    m0007_meter_readings,
+    m0008_meter_rollups,
+    m0009_electricity_tariffs,
+    m0010_configuration_machines,
+)
+
+MIGRATIONS = [
+    m0001_initial_schema,
+    m0002_table_versions,
+    m0003_unique_configuration_name,
+    m0004_lookup_indexes,
+    m0005_configuration_chemicals,
+    m0006_configuration_revisions,
+    m0007_meter_readings,
+    m0008_meter_rollups,
+    m0009_electricity_tariffs,
+    m0010_configuration_machines,
+]
+
+LATEST_VERSION = MIGRATIONS[-1].VERSION
+
+
+def current_version(conn: sqlite3.Connection) -> int:
+    """Schema version of the database (0 if never migrated)."""
+    row = conn.execute("SELECT MAX(version) FROM schema_migrations").fetchone()
+    return row[0] or 0
+
+
+def migrate(conn: sqlite3.Connection) -> List[int]:
+    """
+    Apply pending migrations in one transaction and return their versions.
+    The write lock is taken before re-reading the version, so concurrently
+    starting workers apply each migration once.
+    """
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            applied_at TEXT NOT NULL
+        )
+    ''')
+    conn.commit()
+    if current_version(conn) >= LATEST_VERSION:
+        return []
+    
+    cursor = conn.cursor()
+    cursor.execute("BEGIN IMMEDIATE")
+    try:
+        version = current_version(conn)
+        applied = []
+        for migration in MIGRATIONS:
+            if migration.VERSION <= version:
+                continue
+            migration.upgrade(cursor)
+            cursor.execute(
+                "INSERT INTO schema_migrations (version, name, applied_at) VALUES (?, ?, ?)",
+                (migration.VERSION, migration.__name__.rsplit('.', 1)[-1],
+                 datetime.now(timezone.utc).isoformat())
+            )
+            applied.append(migration.VERSION)
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+    return applied
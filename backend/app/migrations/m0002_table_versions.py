@@ -0,0 +1,40 @@
+"""
+Per-table write counters, bumped by triggers so that writes from every
+process (e.g. several uvicorn workers) are counted.
+"""
+import sqlite3
+
+VERSION = 2
+
+VERSIONED_TABLES = (
+    "locations",
+    "washing_machines",
+    "drying_machines",
+    "ironing_machines",
+    "chemicals",
+    "configurations",
+)
+
+
+def upgrade(cursor: sqlite3.Cursor) -> None:
+    """Create table_versions and its insert/update/delete triggers."""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS table_versions (
+            table_name TEXT PRIMARY KEY,
+            version INTEGER NOT NULL DEFAULT 0
+        )
+    ''')
+    for table in VERSIONED_TABLES:
+        cursor.execute(
+            "INSERT OR IGNORE INTO table_versions (table_name, version) VALUES (?, 0)",
+            (table,)
+        )
+        for event in ("INSERT", "UPDATE", "DELETE"):
+            cursor.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS {table}_version_{event.lower()}
+                AFTER {event} ON {table}
+                BEGIN
+                    UPDATE table_versions SET version = version + 1
+                    WHERE table_name = '{table}';
+                END
+            ''')
@@ -0,0 +1,27 @@
+"""
+Unique configuration names: saves upsert on the name.
+"""
+import sqlite3
+
+VERSION = 3
+
+
+def upgrade(cursor: sqlite3.Cursor) -> None:
+    """Rename duplicate names and index the name."""
+    # The most recently updated row keeps the name; the others are renamed
+    # rather than deleted, as m0004 does for locations
+    cursor.execute('''
+        UPDATE configurations SET name = name || ' (' || substr(id, 1, 8) || ')'
+        WHERE rowid IN (
+            SELECT rowid FROM (
+                SELECT rowid, ROW_NUMBER() OVER (
+                    PARTITION BY name ORDER BY updated_at DESC, rowid DESC
+                ) AS rank
+                FROM configurations
+            ) WHERE rank > 1
+        )
+    ''')
+    cursor.execute('''
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_configurations_name
+        ON configurations(name)
+    ''')
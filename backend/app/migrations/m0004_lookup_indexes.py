@@ -0,0 +1,32 @@
+"""
+Indexes for hot lookups: latest configuration, location names and
+chemicals by type.
+"""
+import sqlite3
+
+VERSION = 4
+
+
+def upgrade(cursor: sqlite3.Cursor) -> None:
+    """Create the lookup indexes."""
+    # ConfigurationRepository.get_latest orders by updated_at
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_configurations_updated_at
+        ON configurations(updated_at)
+    ''')
+    
+    # Location names are unique; duplicates from before the index are
+    # renamed rather than deleted, configurations may reference them
+    cursor.execute('''
+        UPDATE locations SET name = name || ' (' || substr(id, 1, 8) || ')'
+        WHERE rowid NOT IN (SELECT MIN(rowid) FROM locations GROUP BY name)
+    ''')
+    cursor.execute('''
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_locations_name
+        ON locations(name)
+    ''')
+    
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_chemicals_type
+        ON chemicals(type)
+    ''')
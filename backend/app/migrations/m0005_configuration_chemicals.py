@@ -0,0 +1,53 @@
+"""
+Configuration chemicals join table, replacing the comma-separated
+configurations.chemical_ids column.
+"""
+import sqlite3
+
+VERSION = 5
+
+
+def upgrade(cursor: sqlite3.Cursor) -> None:
+    """Create configuration_chemicals, backfill it and drop the old column."""
+    # chemical_id has no foreign key: configurations keep the IDs exactly as
+    # saved, including chemicals that do not exist (yet or any more), which
+    # cost calculations skip
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS configuration_chemicals (
+            configuration_id TEXT NOT NULL
+                REFERENCES configurations(id) ON DELETE CASCADE,
+            chemical_id TEXT NOT NULL,
+            position INTEGER NOT NULL,
+            PRIMARY KEY (configuration_id, position)
+        ) WITHOUT ROWID
+    ''')
+    # "Which configurations use chemical X?"
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_configuration_chemicals_chemical
+        ON configuration_chemicals(chemical_id, configuration_id)
+    ''')
+    
+    # Backfill from the old strings, keeping every ID in its saved order
+    cursor.execute("SELECT id, chemical_ids FROM configurations")
+    links = []
+    for config_id, chemical_ids in cursor.fetchall():
+        chemical_ids = [cid for cid in (chemical_ids or '').split(',') if cid]
+        for position, chemical_id in enumerate(chemical_ids):
+            links.append((config_id, chemical_id, position))
+    cursor.executemany(
+        "INSERT OR IGNORE INTO configuration_chemicals "
+        "(configuration_id, chemical_id, position) VALUES (?, ?, ?)",
+        links
+    )
+    cursor.execute("ALTER TABLE configurations DROP COLUMN chemical_ids")
+    
+    # Changing a configuration's chemicals changes the configuration
+    for event in ("INSERT", "DELETE"):
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS configuration_chemicals_version_{event.lower()}
+            AFTER {event} ON configuration_chemicals
+            BEGIN
+                UPDATE table_versions SET version = version + 1
+                WHERE table_name = 'configurations';
+            END
+        ''')
@@ -0,0 +1,56 @@
+"""
+Append-only configuration history: one row per saved change, holding a
+diff against the previous revision and a full snapshot every few
+revisions, so any revision is rebuilt from a bounded number of rows.
+"""
+import json
+import sqlite3
+
+VERSION = 6
+
+
+def upgrade(cursor: sqlite3.Cursor) -> None:
+    """Create configuration_revisions and record every configuration as revision 1."""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS configuration_revisions (
+            configuration_id TEXT NOT NULL
+                REFERENCES configurations(id) ON DELETE CASCADE,
+            revision INTEGER NOT NULL,
+            created_at TEXT NOT NULL,
+            snapshot TEXT,
+            diff TEXT,
+            PRIMARY KEY (configuration_id, revision)
+        ) WITHOUT ROWID
+    ''')
+    # Point-in-time lookups: latest revision at or before a timestamp
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_configuration_revisions_time
+        ON configuration_revisions(configuration_id, created_at)
+    ''')
+    
+    cursor.execute(
+        "SELECT configuration_id, chemical_id FROM configuration_chemicals "
+        "ORDER BY configuration_id, position"
+    )
+    chemical_ids = {}
+    for config_id, chemical_id in cursor.fetchall():
+        chemical_ids.setdefault(config_id, []).append(chemical_id)
+    
+    cursor.execute("SELECT * FROM configurations")
+    columns = [column[0] for column in cursor.description]
+    revisions = []
+    for row in cursor.fetchall():
+        config = dict(zip(columns, row))
+        state = {
+            key: value for key, value in config.items()
+            if key not in ("id", "created_at", "updated_at")
+        }
+        state["transport_enabled"] = bool(state.get("transport_enabled"))
+        state["chemical_ids"] = chemical_ids.get(config["id"], [])
+        snapshot = json.dumps(state, sort_keys=True, separators=(",", ":"))
+        revisions.append((config["id"], config["updated_at"], snapshot))
+    cursor.executemany(
+        "INSERT OR IGNORE INTO configuration_revisions "
+        "(configuration_id, revision, created_at, snapshot) VALUES (?, 1, ?, ?)",
+        revisions
+    )
@@ -0,0 +1,26 @@
+"""
+Meter readings time series: one row per location, metric and date,
+loaded from the wide per-date-column utility sheets.
+"""
+import sqlite3
+
+VERSION = 7
+
+
+def upgrade(cursor: sqlite3.Cursor) -> None:
+    """Create meter_readings."""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS meter_readings (
+            location TEXT NOT NULL,
+            metric TEXT NOT NULL,
+            date TEXT NOT NULL,
+            value REAL NOT NULL,
+            source TEXT,
+            PRIMARY KEY (location, metric, date)
+        ) WITHOUT ROWID
+    ''')
+    # All metrics of a location over a date range
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_meter_readings_location_date
+        ON meter_readings(location, date)
+    ''')
@@ -0,0 +1,83 @@
+"""
+Meter readings keyed by location id, plus weekly, monthly and yearly
+rollups of them.
+"""
+import sqlite3
+import uuid
+from datetime import datetime, timezone
+
+VERSION = 8
+
+# Start of the period containing `date`, per rollup resolution
+PERIOD_STARTS = {
+    "week": "date(date, '-6 days', 'weekday 1')",
+    "month": "strftime('%Y-%m-01', date)",
+    "year": "strftime('%Y-01-01', date)",
+}
+
+
+def upgrade(cursor: sqlite3.Cursor) -> None:
+    """Move meter_readings to location ids, then create and backfill meter_rollups."""
+    # Readings were keyed by a free-text location; link them to locations,
+    # creating a location for every name that does not exist yet
+    cursor.execute(
+        "SELECT DISTINCT location FROM meter_readings WHERE location NOT IN "
+        "(SELECT id FROM locations) AND location NOT IN (SELECT name FROM locations)"
+    )
+    now = datetime.now(timezone.utc).isoformat()
+    cursor.executemany(
+        "INSERT INTO locations (id, name, created_at) VALUES (?, ?, ?)",
+        [(str(uuid.uuid4()), name, now) for (name,) in cursor.fetchall()]
+    )
+    
+    cursor.execute('''
+        CREATE TABLE meter_readings_new (
+            location_id TEXT NOT NULL
+                REFERENCES locations(id) ON DELETE CASCADE,
+            metric TEXT NOT NULL,
+            date TEXT NOT NULL,
+            value REAL NOT NULL,
+            source TEXT,
+            PRIMARY KEY (location_id, metric, date)
+        ) WITHOUT ROWID
+    ''')
+    cursor.execute('''
+        INSERT INTO meter_readings_new (location_id, metric, date, value, source)
+        SELECT COALESCE(
+                (SELECT id FROM locations WHERE id = r.location),
+                (SELECT id FROM locations WHERE name = r.location)
+            ), r.metric, r.date, r.value, r.source
+        FROM meter_readings r
+    ''')
+    cursor.execute("DROP TABLE meter_readings")
+    cursor.execute("ALTER TABLE meter_readings_new RENAME TO meter_readings")
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_meter_readings_location_date
+        ON meter_readings(location_id, date)
+    ''')
+    
+    # Aggregates per location, metric and period; the daily level is
+    # meter_readings itself
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS meter_rollups (
+            location_id TEXT NOT NULL
+                REFERENCES locations(id) ON DELETE CASCADE,
+            metric TEXT NOT NULL,
+            resolution TEXT NOT NULL,
+            period_start TEXT NOT NULL,
+            count INTEGER NOT NULL,
+            total REAL NOT NULL,
+            minimum REAL NOT NULL,
+            maximum REAL NOT NULL,
+            PRIMARY KEY (location_id, metric, resolution, period_start)
+        ) WITHOUT ROWID
+    ''')
+    for resolution, period_start in PERIOD_STARTS.items():
+        cursor.execute(f'''
+            INSERT OR REPLACE INTO meter_rollups
+                (location_id, metric, resolution, period_start, count, total, minimum, maximum)
+            SELECT location_id, metric, ?, {period_start},
+                COUNT(*), SUM(value), MIN(value), MAX(value)
+            FROM meter_readings
+            GROUP BY location_id, metric, {period_start}
+        ''', (resolution,))
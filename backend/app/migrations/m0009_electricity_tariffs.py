@@ -0,0 +1,21 @@
+"""
+Time-of-use electricity tariffs: one price schedule per location.
+"""
+import sqlite3
+
+VERSION = 9
+
+
+def upgrade(cursor: sqlite3.Cursor) -> None:
+    """Create electricity_tariffs."""
+    # The schedule is stored as given (JSON: hourly prices, or a base
+    # price with periods) and expanded to hour-of-week prices on use
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS electricity_tariffs (
+            location_id TEXT PRIMARY KEY
+                REFERENCES locations(id) ON DELETE CASCADE,
+            name TEXT,
+            schedule TEXT NOT NULL,
+            updated_at TEXT NOT NULL
+        )
+    ''')
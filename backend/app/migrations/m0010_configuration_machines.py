@@ -0,0 +1,43 @@
+"""
+Configuration machines join table: quantities of several machine models
+per stage (mixed fleets), next to the single machine ID columns.
+"""
+import sqlite3
+
+VERSION = 10
+
+
+def upgrade(cursor: sqlite3.Cursor) -> None:
+    """Create configuration_machines and the fleet allocation column."""
+    # machine_id refers to washing_machines, drying_machines or
+    # ironing_machines depending on kind, so it has no foreign key
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS configuration_machines (
+            configuration_id TEXT NOT NULL
+                REFERENCES configurations(id) ON DELETE CASCADE,
+            kind TEXT NOT NULL,
+            machine_id TEXT NOT NULL,
+            quantity INTEGER NOT NULL,
+            position INTEGER NOT NULL,
+            PRIMARY KEY (configuration_id, kind, machine_id)
+        ) WITHOUT ROWID
+    ''')
+    # "Which configurations use machine X?"
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_configuration_machines_machine
+        ON configuration_machines(machine_id, configuration_id)
+    ''')
+    cursor.execute(
+        "ALTER TABLE configurations ADD COLUMN fleet_allocation TEXT NOT NULL DEFAULT 'capacity'"
+    )
+    
+    # Changing a configuration's fleet changes the configuration
+    for event in ("INSERT", "DELETE"):
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS configuration_machines_version_{event.lower()}
+            AFTER {event} ON configuration_machines
+            BEGIN
+                UPDATE table_versions SET version = version + 1
+                WHERE table_name = 'configurations';
+            END
+        ''')
@@ -8,8 +8,29 @@ from .machine import (
     IroningMachine, IroningMachineCreate,
 )
 from .chemical import Chemical, ChemicalCreate
-from .configuration import Configuration, ConfigurationCreate
-from .cost import CostCalculationRequest, CostBreakdown
+from .configuration import (
+    FleetMachine, Configuration, ConfigurationCreate, ConfigurationRevision, ConfigurationAsOf,
+)
+from .cost import CostCalculationRequest, CostBreakdown, ConfigurationCost, RevisionCost
+from .reading import (
+    MeterReading, MeterMetric, ReadingsImportResult, SitesImportResult, ReadingRollup, ReadingSummary,
+)
+from .bulk import BulkUpsertRequest, BulkDeleteRequest, BulkRowError, BulkResult
+from .analysis import (
+    SweepRange, CostSweepRequest, CostSweepResult,
+    InputDistribution, CostSimulationRequest, SimulationSummary, CostSimulationResult,
+    CostSensitivityRequest, SensitivityEntry, CostSensitivityResult,
+    CostProjectionRequest, ProjectionMonth, ProjectionTotals, CostProjectionResult,
+)
+from .tariff import (
+    TariffPeriod, TariffSchedule, ElectricityTariff,
+    FleetGroup, CycleScheduleRequest, ScheduledStart, ScheduledGroup, CycleScheduleResult,
+)
+from .pipeline import PipelineSimulationRequest, StageStats, PipelineSimulationResult
+from .forecast import (
+    DemandForecastRequest, DemandFit, DemandPeriod, DemandForecastResult,
+    ForecastCostRequestsRequest, ForecastCostRequest,
+)
 
 __all__ = [
     # Location
@@ -21,7 +42,24 @@ __all__ = [
     # Chemical
     "Chemical", "ChemicalCreate",
     # Configuration
-    "Configuration", "ConfigurationCreate",
+    "FleetMachine", "Configuration", "ConfigurationCreate", "ConfigurationRevision", "ConfigurationAsOf",
     # Cost
-    "CostCalculationRequest", "CostBreakdown",
+    "CostCalculationRequest", "CostBreakdown", "ConfigurationCost", "RevisionCost",
+    # Meter readings
+    "MeterReading", "MeterMetric", "ReadingsImportResult", "SitesImportResult", "ReadingRollup", "ReadingSummary",
+    # Bulk operations
+    "BulkUpsertRequest", "BulkDeleteRequest", "BulkRowError", "BulkResult",
+    # Analysis
+    "SweepRange", "CostSweepRequest", "CostSweepResult",
+    "InputDistribution", "CostSimulationRequest", "SimulationSummary", "CostSimulationResult",
+    "CostSensitivityRequest", "SensitivityEntry", "CostSensitivityResult",
+    "CostProjectionRequest", "ProjectionMonth", "ProjectionTotals", "CostProjectionResult",
+    # Tariffs and cycle scheduling
+    "TariffPeriod", "TariffSchedule", "ElectricityTariff",
+    "FleetGroup", "CycleScheduleRequest", "ScheduledStart", "ScheduledGroup", "CycleScheduleResult",
+    # Pipeline simulation
+    "PipelineSimulationRequest", "StageStats", "PipelineSimulationResult",
+    # Demand forecast
+    "DemandForecastRequest", "DemandFit", "DemandPeriod", "DemandForecastResult",
+    "ForecastCostRequestsRequest", "ForecastCostRequest",
 ]
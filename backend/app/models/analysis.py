@@ -0,0 +1,160 @@
+"""
+Cost analysis Pydantic models (parameter sweeps, Monte Carlo simulation,
+sensitivity, monthly projections).
+"""
+from typing import Dict, List, Optional
+from pydantic import BaseModel
+
+from .cost import CostCalculationRequest, CostBreakdown
+
+
+class SweepRange(BaseModel):
+    """
+    Range of values for one numeric CostCalculationRequest field.
+    Either give explicit `values`, or `start`/`stop` with a number of `steps`.
+    """
+    field: str
+    values: Optional[List[float]] = None
+    start: Optional[float] = None
+    stop: Optional[float] = None
+    steps: int = 10
+
+
+class CostSweepRequest(BaseModel):
+    """Schema for a parameter sweep over a base cost calculation request."""
+    base: CostCalculationRequest
+    ranges: List[SweepRange]
+
+
+class CostSweepResult(BaseModel):
+    """
+    Schema for parameter sweep results.
+    Every column in `results` is the flattened (row-major) grid, whose
+    dimensions follow the order of `fields` with sizes given by `shape`.
+    """
+    fields: List[str]
+    shape: List[int]
+    axes: Dict[str, List[float]]
+    results: Dict[str, List[float]]
+
+
+class InputDistribution(BaseModel):
+    """
+    Probability distribution for one numeric CostCalculationRequest field.
+    normal: mean, std - uniform: low, high - triangular: low, mode, high
+    """
+    field: str
+    distribution: str  # "normal", "uniform" or "triangular"
+    mean: Optional[float] = None
+    std: Optional[float] = None
+    low: Optional[float] = None
+    mode: Optional[float] = None
+    high: Optional[float] = None
+
+
+class CostSimulationRequest(BaseModel):
+    """Schema for a Monte Carlo simulation around a base cost calculation request."""
+    base: CostCalculationRequest
+    distributions: List[InputDistribution]
+    samples: int = 100_000
+    seed: Optional[int] = None
+    percentiles: List[float] = [5.0, 50.0, 95.0]
+
+
+class SimulationSummary(BaseModel):
+    """Summary statistics of one simulated output."""
+    mean: float
+    std: float
+    min: float
+    max: float
+    percentiles: Dict[str, float]
+
+
+class CostSimulationResult(BaseModel):
+    """
+    Schema for Monte Carlo simulation results.
+    Re-running with the returned `seed` reproduces the same numbers.
+    """
+    samples: int
+    seed: int
+    total_monthly_cost: SimulationSummary
+    cost_per_kg: SimulationSummary
+
+
+class CostSensitivityRequest(BaseModel):
+    """
+    Schema for a sensitivity (tornado) analysis.
+    Every listed field (all numeric request fields by default) is moved by
+    plus and minus `perturbation_percentage` percent, one at a time.
+    """
+    base: CostCalculationRequest
+    perturbation_percentage: float = 10.0
+    fields: Optional[List[str]] = None
+
+
+class SensitivityEntry(BaseModel):
+    """Sensitivity of the cost outputs to one input field."""
+    field: str
+    base_value: float
+    low_value: float
+    high_value: float
+    low_cost_per_kg: float
+    high_cost_per_kg: float
+    # Elasticity (% change of output per % change of input) per output
+    elasticities: Dict[str, float]
+
+
+class CostSensitivityResult(BaseModel):
+    """
+    Schema for sensitivity analysis results.
+    Entries are sorted by the absolute elasticity of cost_per_kg (tornado order).
+    """
+    perturbation_percentage: float
+    base: CostBreakdown
+    entries: List[SensitivityEntry]
+
+
+class CostProjectionRequest(BaseModel):
+    """
+    Schema for a month-by-month cost projection of a base request.
+    `profiles` override numeric request fields per month: a list of
+    `months` values follows the horizon, otherwise a list of 12 values is
+    indexed by calendar month (January first). `season_multipliers` scale utility
+    costs per season (winter: Dec-Feb, spring: Mar-May, summer: Jun-Aug,
+    autumn: Sep-Nov); a season without a multiplier uses 1.
+    """
+    base: CostCalculationRequest
+    start: str  # First month, "YYYY-MM"
+    months: int = 12
+    profiles: Dict[str, List[float]] = {}
+    season_multipliers: Dict[str, float] = {}
+
+
+class ProjectionMonth(BaseModel):
+    """Cost breakdown of one projected month."""
+    month: str
+    season: str
+    season_multiplier: float
+    breakdown: CostBreakdown
+
+
+class ProjectionTotals(BaseModel):
+    """Sums over the projection horizon; cost_per_kg is total cost over total kg."""
+    electricity_kwh: float
+    electricity_cost: float
+    water_m3: float
+    water_cost: float
+    chemical_cost: float
+    labor_hours: float
+    labor_cost: float
+    ironing_hours: float
+    transport_cost: float
+    total_cost: float
+    total_kg_processed: float
+    cost_per_kg: float
+
+
+class CostProjectionResult(BaseModel):
+    """Schema for cost projection results."""
+    months: List[ProjectionMonth]
+    totals: ProjectionTotals
@@ -0,0 +1,35 @@
+"""
+Bulk operation Pydantic models.
+"""
+from typing import Any, Dict, List, Optional
+from pydantic import BaseModel
+
+
+class BulkUpsertRequest(BaseModel):
+    """
+    Schema for a bulk upsert.
+    Each item holds the fields of the entity's create schema plus an
+    optional `id`; items are validated one by one so a bad row does not
+    reject the whole batch.
+    """
+    items: List[Dict[str, Any]]
+
+
+class BulkDeleteRequest(BaseModel):
+    """Schema for a bulk delete."""
+    ids: List[str]
+
+
+class BulkRowError(BaseModel):
+    """Error for a single row of a bulk request."""
+    index: int
+    id: Optional[str] = None
+    detail: str
+
+
+class BulkResult(BaseModel):
+    """Schema for a bulk operation response (IDs in request order)."""
+    created: List[str] = []
+    updated: List[str] = []
+    deleted: List[str] = []
+    errors: List[BulkRowError] = []
@@ -1,8 +1,15 @@
 """
 Configuration Pydantic models.
 """
-from typing import List, Optional
-from pydantic import BaseModel
+from typing import Any, Dict, List, Literal, Optional
+from pydantic import BaseModel, Field
+
+
+class FleetMachine(BaseModel):
+    """Units of one machine model in a configuration's fleet."""
+    kind: Literal["washing", "drying", "ironing"]
+    machine_id: str
+    quantity: int = Field(1, ge=1)
 
 
 class ConfigurationCreate(BaseModel):
@@ -22,6 +29,9 @@ class ConfigurationCreate(BaseModel):
     washing_machine_id: Optional[str] = None
     drying_machine_id: Optional[str] = None
     ironing_machine_id: Optional[str] = None
+    # Mixed fleets; a stage listed here ignores its single machine ID
+    machines: List[FleetMachine] = []
+    fleet_allocation: Literal["capacity", "efficiency"] = "capacity"
     cycles_per_month: int
     operational_volume: float = 1000.0
     operational_period: str = "month"
@@ -57,6 +67,9 @@ class Configuration(BaseModel):
     washing_machine_id: Optional[str]
     drying_machine_id: Optional[str]
     ironing_machine_id: Optional[str]
+    # Mixed fleets; a stage listed here ignores its single machine ID
+    machines: List[FleetMachine] = []
+    fleet_allocation: Literal["capacity", "efficiency"] = "capacity"
     cycles_per_month: int
     operational_volume: float = 1000.0
     operational_period: str = "month"
@@ -74,3 +87,19 @@ class Configuration(BaseModel):
     transport_fuel_rate: float = 0.0
     created_at: str
     updated_at: str
+
+
+class ConfigurationRevision(BaseModel):
+    """Schema for one entry of a configuration's history."""
+    configuration_id: str
+    revision: int
+    created_at: str
+    changes: Dict[str, Any]
+
+
+class ConfigurationAsOf(BaseModel):
+    """Schema for a configuration's state at a point in time."""
+    configuration_id: str
+    revision: int
+    created_at: str
+    configuration: ConfigurationCreate
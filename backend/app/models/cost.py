@@ -1,9 +1,11 @@
 """
 Cost calculation Pydantic models.
 """
-from typing import List, Optional
+from typing import List, Literal, Optional
 from pydantic import BaseModel
 
+from .configuration import FleetMachine
+
 
 class CostCalculationRequest(BaseModel):
     """Schema for cost calculation request."""
@@ -24,6 +26,9 @@ class CostCalculationRequest(BaseModel):
     washing_machine_id: Optional[str] = None
     drying_machine_id: Optional[str] = None
     ironing_machine_id: Optional[str] = None
+    # Mixed fleets; a stage listed here ignores its single machine ID
+    machines: List[FleetMachine] = []
+    fleet_allocation: Literal["capacity", "efficiency"] = "capacity"
     chemical_ids: List[str] = []
     # Operational volume (kg per month) - used as total weight
     operational_volume: float = 0.0
@@ -57,3 +62,18 @@ class CostBreakdown(BaseModel):
     total_monthly_cost: float
     total_kg_processed: float
     cost_per_cycle: float
+
+
+class ConfigurationCost(BaseModel):
+    """Cost breakdown of a saved configuration."""
+    configuration_id: str
+    configuration_name: str
+    breakdown: CostBreakdown
+
+
+class RevisionCost(BaseModel):
+    """Cost breakdown of one revision of a configuration."""
+    configuration_id: str
+    revision: int
+    created_at: str
+    breakdown: CostBreakdown
@@ -0,0 +1,66 @@
+"""
+Demand forecast Pydantic models.
+"""
+from typing import Dict, List, Optional
+from pydantic import BaseModel
+
+from .cost import CostCalculationRequest
+
+
+class DemandForecastRequest(BaseModel):
+    """
+    Schema for a demand forecast.
+    Laundry volume metrics are fitted per location to the driver metrics
+    (as imported into the readings store) and projected for `periods`
+    months or days from `start`.
+    """
+    kg_metric: str = "Laundry / kg"
+    sets_metric: Optional[str] = "Laundry / sets"
+    drivers: List[str] = ["Occupancy"]
+    location_ids: Optional[List[str]] = None
+    resolution: str = "month"  # "month" or "day"
+    start: str
+    periods: int = 12
+    ridge: float = 0.1
+
+
+class DemandFit(BaseModel):
+    """Fitted model of one volume metric at one location (driver units)."""
+    location_id: str
+    metric: str
+    observations: int
+    intercept: Optional[float] = None
+    coefficients: Dict[str, float] = {}
+    r2: Optional[float] = None
+
+
+class DemandPeriod(BaseModel):
+    """Projected drivers and volume of one location and period."""
+    location_id: str
+    period_start: str
+    drivers: Dict[str, Optional[float]] = {}
+    kg: Optional[float] = None
+    sets: Optional[float] = None
+
+
+class DemandForecastResult(BaseModel):
+    """Schema for a demand forecast response."""
+    resolution: str
+    fits: List[DemandFit] = []
+    periods: List[DemandPeriod] = []
+
+
+class ForecastCostRequestsRequest(BaseModel):
+    """
+    Schema for turning a monthly forecast into cost requests: `base` with
+    operational_volume and cycles_per_month taken from the forecast.
+    """
+    base: CostCalculationRequest
+    forecast: DemandForecastRequest
+
+
+class ForecastCostRequest(BaseModel):
+    """Cost request of one location and month, ready for /api/calculate-cost."""
+    location_id: str
+    period_start: str
+    request: CostCalculationRequest
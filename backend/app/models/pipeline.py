@@ -0,0 +1,67 @@
+"""
+Laundry pipeline (wash -> dry -> iron) simulation Pydantic models.
+"""
+from typing import List, Optional
+from pydantic import BaseModel
+
+from .tariff import ALL_DAYS
+
+
+class PipelineSimulationRequest(BaseModel):
+    """
+    Schema for a discrete-event simulation of a site's wash, dry and iron
+    stages. operational_volume (kg per month) arrives every day in
+    `arrivals_per_day` deliveries spread over the shift. Operators load
+    and unload machines and iron, only within shift hours on
+    operating_days (day 0 is a Monday); machines finish running cycles
+    after hours. Set ironers to 0 to skip ironing.
+    """
+    washing_machine_id: str
+    drying_machine_id: str
+    washers: int = 1
+    dryers: int = 1
+    ironers: int = 1
+    operators: int = 1
+    operational_volume: float
+    washing_load_percentage: float = 80.0
+    drying_load_percentage: float = 80.0
+    ironing_kg_per_hour: float = 20.0
+    shift_start_hour: int = 7
+    shift_end_hour: int = 19
+    operating_days: List[int] = ALL_DAYS
+    arrivals_per_day: int = 2
+    days: int = 30
+
+
+class StageStats(BaseModel):
+    """
+    Activity of one stage (or of the operators). Utilization is the share
+    of available time in use: all hours for machines (in use from loading
+    until unloaded), shift hours for ironers and operators. Queues are kg
+    waiting for the stage.
+    """
+    name: str
+    units: int
+    cycles: int
+    kg: float
+    utilization: float
+    average_queue_kg: float = 0.0
+    max_queue_kg: float = 0.0
+
+
+class PipelineSimulationResult(BaseModel):
+    """
+    Schema for pipeline simulation results. lead_time_hours is the
+    average time a kg spends in the laundry (Little's law); keeps_up
+    means less than a day of arrivals is left unfinished at the end.
+    """
+    days: int
+    arrived_kg: float
+    finished_kg: float
+    backlog_kg: float
+    throughput_kg_per_day: float
+    lead_time_hours: Optional[float] = None
+    keeps_up: bool
+    bottleneck: str
+    stages: List[StageStats]
+    events: int
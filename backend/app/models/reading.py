@@ -0,0 +1,77 @@
+"""
+Meter reading Pydantic models.
+"""
+from typing import Dict, List, Optional
+from pydantic import BaseModel
+
+
+class MeterReading(BaseModel):
+    """Schema for one reading of a metric at a location on a date."""
+    location_id: str
+    metric: str
+    date: str
+    value: float
+    source: Optional[str] = None
+
+
+class MeterMetric(BaseModel):
+    """Schema for a metric's coverage at a location."""
+    location_id: str
+    metric: str
+    readings: int
+    first_date: str
+    last_date: str
+
+
+class ReadingsImportResult(BaseModel):
+    """Schema for a readings import response."""
+    location_id: str
+    source: Optional[str] = None
+    rows: int = 0
+    readings: int = 0
+    skipped_cells: int = 0
+    metrics: int = 0
+    first_date: Optional[str] = None
+    last_date: Optional[str] = None
+
+
+class SitesImportResult(BaseModel):
+    """Schema for a per-site volume import response."""
+    source: Optional[str] = None
+    rows: int = 0
+    readings: int = 0
+    skipped_cells: int = 0
+    metrics: int = 0
+    first_date: Optional[str] = None
+    last_date: Optional[str] = None
+    unmatched_sites: List[str] = []
+
+
+class ReadingRollup(BaseModel):
+    """Schema for the aggregate of a metric over one period."""
+    location_id: str
+    metric: str
+    resolution: str
+    period_start: str
+    count: int
+    total: float
+    minimum: float
+    maximum: float
+    average: float
+
+
+class ReadingSummary(BaseModel):
+    """
+    Schema for the aggregate of a metric over a date range, with the
+    number of periods of each resolution it was read from.
+    """
+    location_id: str
+    metric: str
+    start: str
+    end: str
+    count: int
+    total: float
+    minimum: Optional[float] = None
+    maximum: Optional[float] = None
+    average: Optional[float] = None
+    periods: Dict[str, int] = {}
@@ -0,0 +1,102 @@
+"""
+Electricity tariff and cycle scheduling Pydantic models.
+"""
+from typing import List, Optional
+from pydantic import BaseModel
+
+ALL_DAYS = [0, 1, 2, 3, 4, 5, 6]
+
+
+class TariffPeriod(BaseModel):
+    """
+    Price of the hours from start_hour up to end_hour (wrapping past
+    midnight if end_hour <= start_hour) on the given weekdays (0 = Monday).
+    """
+    start_hour: int
+    end_hour: int
+    price: float
+    days: List[int] = ALL_DAYS
+
+
+class TariffSchedule(BaseModel):
+    """
+    Schema for a time-of-use electricity tariff (price per kWh).
+    Give either `hourly_prices` (24 values for every day, or 168 for a
+    week starting Monday 00:00), or a `base_price` that `periods`
+    override; later periods win where they overlap.
+    """
+    name: Optional[str] = None
+    hourly_prices: Optional[List[float]] = None
+    base_price: Optional[float] = None
+    periods: List[TariffPeriod] = []
+
+
+class ElectricityTariff(TariffSchedule):
+    """Schema for a location's tariff response."""
+    location_id: str
+    updated_at: str
+
+
+class FleetGroup(BaseModel):
+    """Identical machines of one model and the cycles they must run over the horizon."""
+    kind: str  # "washing" or "drying"
+    machine_id: str
+    units: int = 1
+    cycles: int
+
+
+class CycleScheduleRequest(BaseModel):
+    """
+    Schema for scheduling wash and dry cycles against a tariff.
+    Uses `tariff` if given, otherwise the tariff of `location_id`.
+    Cycles run within open_hour..close_hour on operating_days and may
+    start at every `slot_minutes` (a divisor of 60).
+    """
+    location_id: Optional[str] = None
+    tariff: Optional[TariffSchedule] = None
+    start: str  # First day, ISO date
+    days: int = 30
+    open_hour: int = 6
+    close_hour: int = 22
+    operating_days: List[int] = ALL_DAYS
+    slot_minutes: int = 60
+    fleet: List[FleetGroup]
+
+
+class ScheduledStart(BaseModel):
+    """Cycles starting at one time."""
+    start: str
+    cycles: int
+
+
+class ScheduledGroup(BaseModel):
+    """
+    Schedule of one fleet group. flat_cost prices the same energy at the
+    average price of the operating hours.
+    """
+    kind: str
+    machine_id: str
+    model: str
+    units: int
+    cycles_requested: int
+    cycles_scheduled: int
+    energy_kwh: float
+    cost: float
+    flat_cost: float
+    starts: List[ScheduledStart] = []
+
+
+class CycleScheduleResult(BaseModel):
+    """
+    Schema for a cycle schedule response. average_price (cost per kWh of
+    the schedule) can be used as a cost request's electricity_rate.
+    """
+    start: str
+    days: int
+    slot_minutes: int
+    groups: List[ScheduledGroup]
+    energy_kwh: float
+    cost: float
+    flat_cost: float
+    savings: float
+    average_price: float
@@ -1,18 +1,44 @@
 """
 Repositories package - data access layer.
 """
+from .catalog_cache import CatalogCache
 from .location import LocationRepository
 from .washing_machine import WashingMachineRepository
 from .drying_machine import DryingMachineRepository
 from .ironing_machine import IroningMachineRepository
 from .chemical import ChemicalRepository
 from .configuration import ConfigurationRepository
+from .configuration_revision import ConfigurationRevisionRepository
+from .meter_reading import MeterReadingRepository
+from .meter_rollup import MeterRollupRepository
+from .electricity_tariff import ElectricityTariffRepository
+from .async_base import (
+    AsyncRepository,
+    AsyncLocationRepository,
+    AsyncWashingMachineRepository,
+    AsyncDryingMachineRepository,
+    AsyncIroningMachineRepository,
+    AsyncChemicalRepository,
+    AsyncConfigurationRepository,
+)
 
 __all__ = [
+    "CatalogCache",
     "LocationRepository",
     "WashingMachineRepository",
     "DryingMachineRepository",
     "IroningMachineRepository",
     "ChemicalRepository",
     "ConfigurationRepository",
+    "ConfigurationRevisionRepository",
+    "MeterReadingRepository",
+    "MeterRollupRepository",
+    "ElectricityTariffRepository",
+    "AsyncRepository",
+    "AsyncLocationRepository",
+    "AsyncWashingMachineRepository",
+    "AsyncDryingMachineRepository",
+    "AsyncIroningMachineRepository",
+    "AsyncChemicalRepository",
+    "AsyncConfigurationRepository",
 ]
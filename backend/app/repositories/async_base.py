@@ -0,0 +1,130 @@
+"""
+Async repositories - non-blocking counterparts of the repository classes.
+"""
+from typing import Any, Dict, List, Optional, Tuple, Type
+
+from pydantic import BaseModel
+
+from ..database import run_db
+from .base import BaseRepository
+from .location import LocationRepository
+from .washing_machine import WashingMachineRepository
+from .drying_machine import DryingMachineRepository
+from .ironing_machine import IroningMachineRepository
+from .chemical import ChemicalRepository
+from .configuration import ConfigurationRepository
+
+
+class AsyncRepository:
+    """
+    Async facade over a synchronous repository.
+    Every call runs on the dedicated database threads (see run_db), so async
+    routes never block the event loop and are not capped by the default
+    threadpool. Subclasses set `repository`.
+    """
+    repository: Type[BaseRepository] = BaseRepository
+    
+    @classmethod
+    async def get_all(cls) -> List[Dict[str, Any]]:
+        """Get all records from the table."""
+        return await run_db(cls.repository.get_all)
+    
+    @classmethod
+    async def get_page(
+        cls,
+        filters: Optional[Dict[str, Any]] = None,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Get one keyset page of records and the next page's cursor."""
+        return await run_db(cls.repository.get_page, filters, cursor, limit)
+    
+    @classmethod
+    async def get_by_id(cls, record_id: str) -> Optional[Dict[str, Any]]:
+        """Get a single record by ID."""
+        return await run_db(cls.repository.get_by_id, record_id)
+    
+    @classmethod
+    async def get_by_ids(cls, record_ids: List[str]) -> List[Dict[str, Any]]:
+        """Get multiple records by their IDs."""
+        return await run_db(cls.repository.get_by_ids, record_ids)
+    
+    @classmethod
+    async def exists(cls, record_id: str) -> bool:
+        """Check if a record exists."""
+        return await run_db(cls.repository.exists, record_id)
+    
+    @classmethod
+    async def delete(cls, record_id: str) -> bool:
+        """Delete a record by ID. Returns True if deleted."""
+        return await run_db(cls.repository.delete, record_id)
+    
+    @classmethod
+    async def create(cls, data: BaseModel) -> Optional[Dict[str, Any]]:
+        """Create a new record."""
+        return await run_db(cls.repository.create, data)
+    
+    @classmethod
+    async def update(cls, record_id: str, data: BaseModel) -> Optional[Dict[str, Any]]:
+        """Update an existing record."""
+        return await run_db(cls.repository.update, record_id, data)
+    
+    @classmethod
+    async def bulk_upsert(cls, items: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Create or update many records in one transaction."""
+        return await run_db(cls.repository.bulk_upsert, items)
+    
+    @classmethod
+    async def bulk_delete(cls, record_ids: List[str]) -> Dict[str, Any]:
+        """Delete many records in one transaction."""
+        return await run_db(cls.repository.bulk_delete, record_ids)
+
+
+class AsyncLocationRepository(AsyncRepository):
+    """Async repository for locations."""
+    repository = LocationRepository
+
+
+class AsyncWashingMachineRepository(AsyncRepository):
+    """Async repository for washing machines."""
+    repository = WashingMachineRepository
+
+
+class AsyncDryingMachineRepository(AsyncRepository):
+    """Async repository for drying machines."""
+    repository = DryingMachineRepository
+
+
+class AsyncIroningMachineRepository(AsyncRepository):
+    """Async repository for ironing machines."""
+    repository = IroningMachineRepository
+
+
+class AsyncChemicalRepository(AsyncRepository):
+    """Async repository for chemicals."""
+    repository = ChemicalRepository
+
+
+class AsyncConfigurationRepository(AsyncRepository):
+    """Async repository for configurations."""
+    repository = ConfigurationRepository
+    
+    @classmethod
+    async def save(cls, data: BaseModel) -> Dict[str, Any]:
+        """Save a configuration (update by name or create)."""
+        return await run_db(ConfigurationRepository.save, data)
+    
+    @classmethod
+    async def get_latest(cls) -> Optional[Dict[str, Any]]:
+        """Get the most recently updated configuration."""
+        return await run_db(ConfigurationRepository.get_latest)
+    
+    @classmethod
+    async def get_all_formatted(cls) -> List[Dict[str, Any]]:
+        """Get all configurations with their chemical_ids and machines."""
+        return await run_db(ConfigurationRepository.get_all_formatted)
+    
+    @classmethod
+    async def get_using_chemical(cls, chemical_id: str) -> List[Dict[str, Any]]:
+        """Configurations that use a chemical."""
+        return await run_db(ConfigurationRepository.get_using_chemical, chemical_id)
@@ -1,19 +1,53 @@
 """
 Base repository with common CRUD operations.
 """
+import base64
+import operator
+import sqlite3
 import uuid
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple, Type
+
+from pydantic import BaseModel, ValidationError
 
 from ..database import get_db
+from .catalog_cache import CatalogCache
+
+
+def encode_cursor(rowid: int) -> str:
+    """Opaque pagination cursor for the record with this rowid."""
+    return base64.urlsafe_b64encode(str(rowid).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> int:
+    """Rowid encoded in a pagination cursor. Raises ValueError if malformed."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        return int(base64.urlsafe_b64decode(padded.encode()).decode())
+    except (ValueError, UnicodeDecodeError) as exc:
+        raise ValueError("Invalid cursor") from exc
 
 
 class BaseRepository:
     """
     Base repository providing common CRUD operations.
     Subclasses should set table_name and implement any custom queries.
+    Catalog repositories set cached = True to serve reads from CatalogCache;
+    every write must call _mark_changed() after committing.
+    Bulk upserts validate rows with create_model; repositories with a
+    natural_key column match rows without an ID on that column.
+    List filters map a filter name to a (column, operator) pair.
     """
     table_name: str = ""
+    cached: bool = False
+    create_model: Optional[Type[BaseModel]] = None
+    natural_key: Optional[str] = None
+    filters: Dict[str, Tuple[str, str]] = {}
+    
+    _FILTER_OPERATORS = {"=": operator.eq, ">=": operator.ge, "<=": operator.le}
+    
+    # Max ids per "IN (...)" query, well below SQLite's host parameter limit
+    _ID_CHUNK_SIZE: int = 500
     
     @classmethod
     def _now(cls) -> str:
@@ -28,14 +62,80 @@ class BaseRepository:
     @classmethod
     def get_all(cls) -> List[Dict[str, Any]]:
         """Get all records from the table."""
+        if cls.cached:
+            return CatalogCache.all(cls.table_name)
         with get_db() as conn:
             cursor = conn.cursor()
             cursor.execute(f"SELECT * FROM {cls.table_name}")
             return [dict(row) for row in cursor.fetchall()]
     
+    @classmethod
+    def get_page(
+        cls,
+        filters: Optional[Dict[str, Any]] = None,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        Get records in insertion order, one keyset page at a time.
+        Returns the page and the cursor of the next page (None on the last).
+        Raises ValueError for an invalid cursor.
+        """
+        after = decode_cursor(cursor) if cursor else None
+        conditions = [
+            (*cls.filters[name], value)
+            for name, value in (filters or {}).items()
+            if value is not None
+        ]
+        if cls.cached:
+            def matches(record: Dict[str, Any]) -> bool:
+                return all(
+                    record[column] is not None and cls._FILTER_OPERATORS[op](record[column], value)
+                    for column, op, value in conditions
+                )
+            records, last = CatalogCache.page(cls.table_name, after, limit, matches if conditions else None)
+        else:
+            records, last = cls._select_page(after, limit, conditions)
+        return records, encode_cursor(last) if last is not None else None
+    
+    @classmethod
+    def _select_page(
+        cls,
+        after: Optional[int],
+        limit: Optional[int],
+        conditions: List[Tuple[str, str, Any]],
+    ) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+        """Keyset page straight from the table (rowid order)."""
+        where = [f"{column} {op} ?" for column, op, _ in conditions]
+        params: List[Any] = [value for _, _, value in conditions]
+        if after is not None:
+            where.append("rowid > ?")
+            params.append(after)
+        sql = f"SELECT rowid AS _rowid, * FROM {cls.table_name}"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY rowid"
+        if limit is not None:
+            # One extra row tells whether another page follows
+            sql += " LIMIT ?"
+            params.append(limit + 1)
+        
+        with get_db() as conn:
+            cursor = conn.cursor()
+            cursor.execute(sql, params)
+            rows = [dict(row) for row in cursor.fetchall()]
+        has_more = limit is not None and len(rows) > limit
+        rows = rows[:limit] if has_more else rows
+        last = rows[-1]['_rowid'] if has_more else None
+        for row in rows:
+            del row['_rowid']
+        return rows, last
+    
     @classmethod
     def get_by_id(cls, record_id: str) -> Optional[Dict[str, Any]]:
         """Get a single record by ID."""
+        if cls.cached:
+            return CatalogCache.get(cls.table_name, record_id)
         with get_db() as conn:
             cursor = conn.cursor()
             cursor.execute(
@@ -45,6 +145,28 @@ class BaseRepository:
             row = cursor.fetchone()
             return dict(row) if row else None
     
+    @classmethod
+    def get_by_ids(cls, record_ids: List[str]) -> List[Dict[str, Any]]:
+        """Get multiple records by their IDs in as few queries as possible."""
+        if cls.cached:
+            return CatalogCache.get_many(cls.table_name, record_ids)
+        unique_ids = list(dict.fromkeys(record_ids))
+        if not unique_ids:
+            return []
+        
+        records = []
+        with get_db() as conn:
+            cursor = conn.cursor()
+            for start in range(0, len(unique_ids), cls._ID_CHUNK_SIZE):
+                chunk = unique_ids[start:start + cls._ID_CHUNK_SIZE]
+                placeholders = ','.join('?' * len(chunk))
+                cursor.execute(
+                    f"SELECT * FROM {cls.table_name} WHERE id IN ({placeholders})",
+                    chunk
+                )
+                records.extend(dict(row) for row in cursor.fetchall())
+        return records
+    
     @classmethod
     def delete(cls, record_id: str) -> bool:
         """Delete a record by ID. Returns True if deleted."""
@@ -55,11 +177,15 @@ class BaseRepository:
                 (record_id,)
             )
             conn.commit()
-            return cursor.rowcount > 0
+            deleted = cursor.rowcount > 0
+        cls._mark_changed()
+        return deleted
     
     @classmethod
     def exists(cls, record_id: str) -> bool:
         """Check if a record exists."""
+        if cls.cached:
+            return CatalogCache.get(cls.table_name, record_id) is not None
         with get_db() as conn:
             cursor = conn.cursor()
             cursor.execute(
@@ -67,3 +193,174 @@ class BaseRepository:
                 (record_id,)
             )
             return cursor.fetchone() is not None
+    
+    @classmethod
+    def bulk_upsert(cls, items: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Create or update many records in one transaction.
+        Rows with an existing `id` (or natural key) are updated, all others
+        are created. Invalid rows are reported in `errors` and skipped.
+        """
+        result: Dict[str, Any] = {"created": [], "updated": [], "deleted": [], "errors": []}
+        valid = []
+        for index, item in enumerate(items):
+            item = dict(item)
+            record_id = item.pop("id", None)
+            if record_id is not None and not isinstance(record_id, str):
+                result["errors"].append({"index": index, "id": None, "detail": "id must be a string"})
+                continue
+            try:
+                data = cls.create_model.model_validate(item)
+            except ValidationError as exc:
+                detail = "; ".join(
+                    f"{'.'.join(str(part) for part in err['loc'])}: {err['msg']}"
+                    for err in exc.errors()
+                )
+                result["errors"].append({"index": index, "id": record_id, "detail": detail})
+                continue
+            valid.append((index, record_id, data))
+        if not valid:
+            return result
+        
+        now = cls._now()
+        with get_db() as conn:
+            cursor = conn.cursor()
+            existing_ids = cls._existing_ids(cursor, [rid for _, rid, _ in valid if rid])
+            key_ids = cls._natural_key_ids(cursor, valid)
+            existing_ids.update(key_ids.values())
+            
+            rows = []
+            for index, record_id, data in valid:
+                values = cls._row_values(data, now)
+                key_id = key_ids.get(values[cls.natural_key]) if cls.natural_key else None
+                if record_id is None:
+                    record_id = key_id or cls._generate_id()
+                elif key_id is not None and key_id != record_id:
+                    result["errors"].append({
+                        "index": index, "id": record_id,
+                        "detail": f"{cls.natural_key} already used by record {key_id}",
+                    })
+                    continue
+                if cls.natural_key:
+                    # Later rows with the same key update this one
+                    key_ids[values[cls.natural_key]] = record_id
+                rows.append((index, record_id, values))
+            if not rows:
+                return result
+            
+            columns = list(rows[0][2])
+            sql = (
+                f"INSERT INTO {cls.table_name} (id, {', '.join(columns)}, created_at) "
+                f"VALUES ({', '.join('?' * (len(columns) + 2))}) "
+                f"ON CONFLICT(id) DO UPDATE SET "
+                + ", ".join(f"{col} = excluded.{col}" for col in columns)
+            )
+            params = [(rid, *values.values(), now) for _, rid, values in rows]
+            
+            cursor.execute("SAVEPOINT bulk_upsert")
+            try:
+                cursor.executemany(sql, params)
+                written = rows
+            except sqlite3.DatabaseError:
+                # Fall back to row by row to find the offending rows
+                cursor.execute("ROLLBACK TO bulk_upsert")
+                written = []
+                for row, row_params in zip(rows, params):
+                    cursor.execute("SAVEPOINT bulk_row")
+                    try:
+                        cursor.execute(sql, row_params)
+                    except sqlite3.DatabaseError as exc:
+                        cursor.execute("ROLLBACK TO bulk_row")
+                        result["errors"].append({"index": row[0], "id": row[1], "detail": str(exc)})
+                    else:
+                        written.append(row)
+                    cursor.execute("RELEASE bulk_row")
+            data_by_index = {index: data for index, _, data in valid}
+            cls._write_related(cursor, [(rid, data_by_index[index]) for index, rid, _ in written], now)
+            cursor.execute("RELEASE bulk_upsert")
+            conn.commit()
+        cls._mark_changed()
+        
+        seen = set(existing_ids)
+        for _, record_id, _ in written:
+            result["updated" if record_id in seen else "created"].append(record_id)
+            seen.add(record_id)
+        result["errors"].sort(key=lambda err: err["index"])
+        return result
+    
+    @classmethod
+    def bulk_delete(cls, record_ids: List[str]) -> Dict[str, Any]:
+        """
+        Delete many records in one transaction; missing IDs are reported as
+        errors. An ID listed more than once is deleted and reported once.
+        """
+        result: Dict[str, Any] = {"created": [], "updated": [], "deleted": [], "errors": []}
+        unique_ids = list(dict.fromkeys(record_ids))
+        with get_db() as conn:
+            cursor = conn.cursor()
+            existing_ids = cls._existing_ids(cursor, unique_ids)
+            cursor.executemany(
+                f"DELETE FROM {cls.table_name} WHERE id = ?",
+                [(rid,) for rid in unique_ids if rid in existing_ids]
+            )
+            conn.commit()
+        cls._mark_changed()
+        
+        seen = set()
+        for index, record_id in enumerate(record_ids):
+            if record_id in seen:
+                continue
+            seen.add(record_id)
+            if record_id in existing_ids:
+                result["deleted"].append(record_id)
+            else:
+                result["errors"].append({"index": index, "id": record_id, "detail": "Not found"})
+        return result
+    
+    @classmethod
+    def _row_values(cls, data: BaseModel, now: str) -> Dict[str, Any]:
+        """Column values of a validated row (created_at excluded)."""
+        return data.model_dump()
+    
+    @classmethod
+    def _write_related(cls, cursor: sqlite3.Cursor, records: List[tuple], now: str) -> None:
+        """Write rows of dependent tables for upserted (id, data) records."""
+    
+    @classmethod
+    def _existing_ids(cls, cursor: sqlite3.Cursor, record_ids: List[str]) -> set:
+        """Which of the given IDs exist in the table."""
+        unique_ids = list(dict.fromkeys(record_ids))
+        found = set()
+        for start in range(0, len(unique_ids), cls._ID_CHUNK_SIZE):
+            chunk = unique_ids[start:start + cls._ID_CHUNK_SIZE]
+            placeholders = ','.join('?' * len(chunk))
+            cursor.execute(
+                f"SELECT id FROM {cls.table_name} WHERE id IN ({placeholders})",
+                chunk
+            )
+            found.update(row['id'] for row in cursor.fetchall())
+        return found
+    
+    @classmethod
+    def _natural_key_ids(cls, cursor: sqlite3.Cursor, valid: List[tuple]) -> Dict[Any, str]:
+        """Map natural key values used by the rows to existing record IDs."""
+        if not cls.natural_key:
+            return {}
+        keys = list(dict.fromkeys(getattr(data, cls.natural_key) for _, _, data in valid))
+        found: Dict[Any, str] = {}
+        for start in range(0, len(keys), cls._ID_CHUNK_SIZE):
+            chunk = keys[start:start + cls._ID_CHUNK_SIZE]
+            placeholders = ','.join('?' * len(chunk))
+            cursor.execute(
+                f"SELECT id, {cls.natural_key} FROM {cls.table_name} "
+                f"WHERE {cls.natural_key} IN ({placeholders}) ORDER BY rowid",
+                chunk
+            )
+            for row in cursor.fetchall():
+                found.setdefault(row[cls.natural_key], row['id'])
+        return found
+    
+    @classmethod
+    def _mark_changed(cls) -> None:
+        """Make this process see a committed write to the table immediately."""
+        CatalogCache.invalidate(cls.table_name)
@@ -0,0 +1,211 @@
+"""
+Catalog cache - process-local snapshot of rarely changing catalog tables.
+"""
+import bisect
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from ..config import settings
+from ..database import get_db
+
+
+class CatalogCache:
+    """
+    In-memory snapshot of the catalog tables (machines, chemicals, locations).
+    
+    Every table has a version row in `table_versions`, bumped by database
+    triggers on each insert/update/delete, so writes from any process are
+    counted. The cache notices them through `PRAGMA data_version` on a
+    dedicated connection (checked at most every CATALOG_CHECK_INTERVAL
+    seconds) and reloads only the tables whose version moved. Writes made
+    through this process's repositories invalidate immediately.
+    
+    Each record also has an entry version: the table version at which its
+    content last changed, so dependants can tell which entries were edited.
+    
+    Returned records are shared with the cache and must not be mutated.
+    """
+    TABLES = (
+        "locations",
+        "washing_machines",
+        "drying_machines",
+        "ironing_machines",
+        "chemicals",
+    )
+    
+    _lock = threading.RLock()
+    _db_path: Optional[str] = None
+    _watch_conn: Optional[sqlite3.Connection] = None
+    _data_version: Optional[int] = None
+    _last_check: float = 0.0
+    _versions: Dict[str, int] = {}
+    _snapshots: Dict[str, Dict[str, Dict[str, Any]]] = {}
+    _snapshot_versions: Dict[str, int] = {}
+    # Per table: rowids and records in rowid order, for keyset paging
+    _rowids: Dict[str, Tuple[List[int], List[Dict[str, Any]]]] = {}
+    _stale: Set[str] = set()
+    _entry_versions: Dict[Tuple[str, str], int] = {}
+    
+    @classmethod
+    def get(cls, table: str, record_id: Optional[str]) -> Optional[Dict[str, Any]]:
+        """Get a record by ID without touching the database."""
+        if not record_id:
+            return None
+        return cls._snapshot(table).get(record_id)
+    
+    @classmethod
+    def get_many(cls, table: str, record_ids: List[str]) -> List[Dict[str, Any]]:
+        """Get the records that exist for the given IDs, in request order, without duplicates."""
+        snapshot = cls._snapshot(table)
+        return [snapshot[rid] for rid in dict.fromkeys(record_ids) if rid in snapshot]
+    
+    @classmethod
+    def all(cls, table: str) -> List[Dict[str, Any]]:
+        """Get all records of a table, in insertion order."""
+        return list(cls._snapshot(table).values())
+    
+    @classmethod
+    def page(
+        cls,
+        table: str,
+        after: Optional[int],
+        limit: Optional[int],
+        predicate: Optional[Callable[[Dict[str, Any]], bool]] = None,
+    ) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+        """
+        Keyset page of a table in rowid order: up to `limit` records after
+        rowid `after` that match `predicate`, plus the rowid to continue
+        after (None on the last page).
+        """
+        with cls._lock:
+            cls._snapshot(table)
+            rowids, records = cls._rowids[table]
+        
+        start = bisect.bisect_right(rowids, after) if after is not None else 0
+        page: List[Dict[str, Any]] = []
+        last_rowid = None
+        for position in range(start, len(records)):
+            record = records[position]
+            if predicate is not None and not predicate(record):
+                continue
+            if limit is not None and len(page) == limit:
+                return page, last_rowid
+            page.append(record)
+            last_rowid = rowids[position]
+        return page, None
+    
+    @classmethod
+    def version(cls, table: str) -> int:
+        """Current version of a table (monotonically increasing)."""
+        with cls._lock:
+            cls._check_versions()
+            return cls._versions.get(table, 0)
+    
+    @classmethod
+    def entry_version(cls, table: str, record_id: Optional[str]) -> Optional[int]:
+        """
+        Version of a single record: changes whenever the record is edited.
+        None if the record does not exist.
+        """
+        if not record_id:
+            return None
+        with cls._lock:
+            cls._snapshot(table)
+            return cls._entry_versions.get((table, record_id))
+    
+    @classmethod
+    def invalidate(cls, table: Optional[str] = None) -> None:
+        """
+        Mark the snapshot of a table (or all tables) as outdated after a local
+        write and force a version check on the next access.
+        """
+        with cls._lock:
+            cls._stale.update(cls._snapshots if table is None else [table])
+            cls._last_check = 0.0
+    
+    @classmethod
+    def _snapshot(cls, table: str) -> Dict[str, Dict[str, Any]]:
+        """Current snapshot of a table, loading it if missing or outdated."""
+        with cls._lock:
+            cls._check_versions()
+            snapshot = cls._snapshots.get(table)
+            if snapshot is None or table in cls._stale:
+                snapshot = cls._load(table)
+            return snapshot
+    
+    @classmethod
+    def _check_versions(cls) -> None:
+        """Drop snapshots of tables that changed since they were loaded."""
+        now = time.monotonic()
+        if cls._last_check and now - cls._last_check < settings.CATALOG_CHECK_INTERVAL:
+            return
+        cls._last_check = now
+        
+        db_path = str(settings.DB_PATH)
+        if db_path != cls._db_path:
+            cls._reset(db_path)
+        
+        data_version = cls._watch_conn.execute("PRAGMA data_version").fetchone()[0]
+        if data_version == cls._data_version and cls._versions:
+            return
+        cls._data_version = data_version
+        
+        rows = cls._watch_conn.execute("SELECT table_name, version FROM table_versions").fetchall()
+        versions = {name: version for name, version in rows}
+        for table, snapshot_version in cls._snapshot_versions.items():
+            if versions.get(table, 0) != snapshot_version:
+                cls._stale.add(table)
+        cls._versions = versions
+    
+    @classmethod
+    def _load(cls, table: str) -> Dict[str, Dict[str, Any]]:
+        """Load a table and the version it was read at in one read transaction."""
+        with get_db() as conn:
+            cursor = conn.cursor()
+            own_transaction = not conn.in_transaction
+            if own_transaction:
+                cursor.execute("BEGIN")
+            cursor.execute("SELECT version FROM table_versions WHERE table_name = ?", (table,))
+            row = cursor.fetchone()
+            version = row[0] if row else 0
+            cursor.execute(f"SELECT rowid AS _rowid, * FROM {table} ORDER BY rowid")
+            rowids = []
+            snapshot = {}
+            for row in cursor.fetchall():
+                record = dict(row)
+                rowids.append(record.pop('_rowid'))
+                snapshot[record['id']] = record
+            if own_transaction:
+                conn.rollback()
+        
+        # Entries that are new or differ from the previous snapshot get the
+        # table version they were loaded at; removed entries lose theirs
+        previous = cls._snapshots.get(table, {})
+        for record_id, record in snapshot.items():
+            if previous.get(record_id) != record or (table, record_id) not in cls._entry_versions:
+                cls._entry_versions[(table, record_id)] = version
+        for record_id in previous.keys() - snapshot.keys():
+            cls._entry_versions.pop((table, record_id), None)
+        
+        cls._snapshots[table] = snapshot
+        cls._rowids[table] = (rowids, list(snapshot.values()))
+        cls._snapshot_versions[table] = version
+        cls._stale.discard(table)
+        return snapshot
+    
+    @classmethod
+    def _reset(cls, db_path: str) -> None:
+        """Forget all state and watch a (new) database file."""
+        if cls._watch_conn is not None:
+            cls._watch_conn.close()
+        cls._watch_conn = sqlite3.connect(db_path, check_same_thread=False)
+        cls._db_path = db_path
+        cls._data_version = None
+        cls._versions = {}
+        cls._snapshots = {}
+        cls._snapshot_versions = {}
+        cls._rowids = {}
+        cls._stale = set()
+        cls._entry_versions = {}
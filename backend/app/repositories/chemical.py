@@ -1,7 +1,7 @@
 """
 Chemical repository - data access for chemicals table.
 """
-from typing import Dict, Any, List
+from typing import Dict, Any
 
 from .base import BaseRepository
 from ..database import get_db
@@ -11,6 +11,12 @@ from ..models import ChemicalCreate
 class ChemicalRepository(BaseRepository):
     """Repository for chemical CRUD operations."""
     table_name = "chemicals"
+    cached = True
+    create_model = ChemicalCreate
+    filters = {
+        "type": ("type", "="),
+        "name": ("name", "="),
+    }
     
     @classmethod
     def create(cls, data: ChemicalCreate) -> Dict[str, Any]:
@@ -28,6 +34,7 @@ class ChemicalRepository(BaseRepository):
                  data.package_amount, data.usage_per_cycle, data.unit, now)
             )
             conn.commit()
+        cls._mark_changed()
         
         return {
             "id": chemical_id,
@@ -54,20 +61,6 @@ class ChemicalRepository(BaseRepository):
                  data.usage_per_cycle, data.unit, chemical_id)
             )
             conn.commit()
+        cls._mark_changed()
         
         return cls.get_by_id(chemical_id)
-    
-    @classmethod
-    def get_by_ids(cls, chemical_ids: List[str]) -> List[Dict[str, Any]]:
-        """Get multiple chemicals by their IDs."""
-        if not chemical_ids:
-            return []
-        
-        with get_db() as conn:
-            cursor = conn.cursor()
-            placeholders = ','.join('?' * len(chemical_ids))
-            cursor.execute(
-                f"SELECT * FROM chemicals WHERE id IN ({placeholders})",
-                chemical_ids
-            )
-            return [dict(row) for row in cursor.fetchall()]
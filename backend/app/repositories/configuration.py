@@ -1,9 +1,11 @@
 """
 Configuration repository - data access for configurations table.
 """
-from typing import Dict, Any, Optional, List
+import sqlite3
+from typing import Dict, Any, Optional, List, Tuple
 
 from .base import BaseRepository
+from .configuration_revision import ConfigurationRevisionRepository
 from ..database import get_db
 from ..models import ConfigurationCreate
 
@@ -11,6 +13,14 @@ from ..models import ConfigurationCreate
 class ConfigurationRepository(BaseRepository):
     """Repository for configuration CRUD operations."""
     table_name = "configurations"
+    create_model = ConfigurationCreate
+    natural_key = "name"
+    filters = {
+        "location_id": ("location_id", "="),
+        "washing_machine_id": ("washing_machine_id", "="),
+        "season": ("season", "="),
+        "updated_since": ("updated_at", ">="),
+    }
     
     @classmethod
     def get_by_name(cls, name: str) -> Optional[Dict[str, Any]]:
@@ -22,7 +32,11 @@ class ConfigurationRepository(BaseRepository):
                 (name,)
             )
             row = cursor.fetchone()
-            return dict(row) if row else None
+            if not row:
+                return None
+            return cls._format(
+                row, cls._chemical_ids(cursor, [row['id']]), cls._machines(cursor, [row['id']])
+            )
     
     @classmethod
     def get_latest(cls) -> Optional[Dict[str, Any]]:
@@ -33,102 +47,209 @@ class ConfigurationRepository(BaseRepository):
                 "SELECT * FROM configurations ORDER BY updated_at DESC LIMIT 1"
             )
             row = cursor.fetchone()
-            if row:
-                config = dict(row)
-                # Parse chemical_ids from comma-separated string
-                chemical_ids_str = config.get('chemical_ids', '')
-                config['chemical_ids'] = (
-                    [cid for cid in chemical_ids_str.split(',') if cid]
-                    if chemical_ids_str else []
-                )
-                # Convert transport_enabled from int to bool
-                config['transport_enabled'] = bool(config.get('transport_enabled', 0))
-                return config
-            return None
+            if not row:
+                return None
+            return cls._format(
+                row, cls._chemical_ids(cursor, [row['id']]), cls._machines(cursor, [row['id']])
+            )
+    
+    @classmethod
+    def get_page(
+        cls,
+        filters: Optional[Dict[str, Any]] = None,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Keyset page of configurations with their chemical_ids and machines."""
+        rows, next_cursor = super().get_page(filters, cursor, limit)
+        config_ids = [row['id'] for row in rows]
+        with get_db() as conn:
+            chemical_ids = cls._chemical_ids(conn.cursor(), config_ids)
+            machines = cls._machines(conn.cursor(), config_ids)
+        return [cls._format(row, chemical_ids, machines) for row in rows], next_cursor
+    
+    @classmethod
+    def get_ids_using_chemical(cls, chemical_id: str) -> List[str]:
+        """IDs of the configurations that use a chemical (index lookup)."""
+        with get_db() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT DISTINCT configuration_id FROM configuration_chemicals WHERE chemical_id = ?",
+                (chemical_id,)
+            )
+            return [row[0] for row in cursor.fetchall()]
+    
+    @classmethod
+    def get_using_chemical(cls, chemical_id: str) -> List[Dict[str, Any]]:
+        """Configurations that use a chemical, formatted."""
+        with get_db() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """SELECT * FROM configurations WHERE id IN (
+                    SELECT configuration_id FROM configuration_chemicals WHERE chemical_id = ?
+                )""",
+                (chemical_id,)
+            )
+            rows = cursor.fetchall()
+            config_ids = [row['id'] for row in rows]
+            chemical_ids = cls._chemical_ids(cursor, config_ids)
+            machines = cls._machines(cursor, config_ids)
+            return [cls._format(row, chemical_ids, machines) for row in rows]
     
     @classmethod
     def save(cls, data: ConfigurationCreate) -> Dict[str, Any]:
         """
         Save a configuration. Updates existing if name matches, creates new otherwise.
+        A single upsert statement on the unique name, returning the written row.
         """
         now = cls._now()
-        chemical_ids_str = ','.join(data.chemical_ids) if data.chemical_ids else ''
+        values = cls._row_values(data, now)
+        columns = list(values)
         
         with get_db() as conn:
             cursor = conn.cursor()
-            
-            # Check if config with this name exists
-            existing = cls.get_by_name(data.name)
-            
-            if existing:
-                config_id = existing['id']
-                cursor.execute(
-                    """UPDATE configurations SET
-                    currency = ?, electricity_rate = ?, water_rate = ?, labor_rate = ?, 
-                    season = ?, tariff_mode = ?, electricity_tariff_mode = ?, electricity_tariff_price = ?,
-                    water_tariff_mode = ?, water_tariff_price = ?,
-                    location_id = ?, washing_machine_id = ?, 
-                    drying_machine_id = ?, ironing_machine_id = ?, cycles_per_month = ?,
-                    operational_volume = ?, operational_period = ?,
-                    washing_load_percentage = ?, drying_load_percentage = ?, ironing_labor_hours = ?, 
-                    chemical_ids = ?, transport_enabled = ?, transport_mode = ?, 
-                    transport_fixed_cost = ?, transport_distance_km = ?, transport_time_hours = ?,
-                    transport_labor_rate = ?, transport_fuel_rate = ?, updated_at = ?
-                    WHERE id = ?""",
-                    (data.currency, data.electricity_rate, data.water_rate, data.labor_rate,
-                     data.season, data.tariff_mode, data.electricity_tariff_mode, data.electricity_tariff_price,
-                     data.water_tariff_mode, data.water_tariff_price,
-                     data.location_id, data.washing_machine_id,
-                     data.drying_machine_id, data.ironing_machine_id, data.cycles_per_month,
-                     data.operational_volume, data.operational_period,
-                     data.washing_load_percentage, data.drying_load_percentage, data.ironing_labor_hours,
-                     chemical_ids_str, 1 if data.transport_enabled else 0, data.transport_mode,
-                     data.transport_fixed_cost, data.transport_distance_km, data.transport_time_hours,
-                     data.transport_labor_rate, data.transport_fuel_rate, now, config_id)
-                )
-            else:
-                config_id = cls._generate_id()
-                cursor.execute(
-                    """INSERT INTO configurations 
-                    (id, name, currency, electricity_rate, water_rate, labor_rate, season, tariff_mode,
-                     electricity_tariff_mode, electricity_tariff_price, water_tariff_mode, water_tariff_price,
-                     location_id, washing_machine_id, drying_machine_id, ironing_machine_id, cycles_per_month, 
-                     operational_volume, operational_period,
-                     washing_load_percentage, drying_load_percentage, ironing_labor_hours, chemical_ids,
-                     transport_enabled, transport_mode, transport_fixed_cost, transport_distance_km, 
-                     transport_time_hours, transport_labor_rate, transport_fuel_rate, created_at, updated_at) 
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-                    (config_id, data.name, data.currency, data.electricity_rate, data.water_rate, data.labor_rate,
-                     data.season, data.tariff_mode, data.electricity_tariff_mode, data.electricity_tariff_price,
-                     data.water_tariff_mode, data.water_tariff_price,
-                     data.location_id, data.washing_machine_id, data.drying_machine_id,
-                     data.ironing_machine_id, data.cycles_per_month, 
-                     data.operational_volume, data.operational_period,
-                     data.washing_load_percentage, data.drying_load_percentage, data.ironing_labor_hours,
-                     chemical_ids_str, 1 if data.transport_enabled else 0, data.transport_mode,
-                     data.transport_fixed_cost, data.transport_distance_km, data.transport_time_hours,
-                     data.transport_labor_rate, data.transport_fuel_rate, now, now)
-                )
-            
+            cursor.execute(
+                f"""INSERT INTO configurations (id, {', '.join(columns)}, created_at)
+                VALUES ({', '.join('?' * (len(columns) + 2))})
+                ON CONFLICT(name) DO UPDATE SET
+                {', '.join(f"{col} = excluded.{col}" for col in columns if col != 'name')}
+                RETURNING *""",
+                (cls._generate_id(), *values.values(), now)
+            )
+            row = cursor.fetchone()
+            cls._write_related(cursor, [(row['id'], data)], now)
+            chemical_ids = cls._chemical_ids(cursor, [row['id']])
+            machines = cls._machines(cursor, [row['id']])
             conn.commit()
+        cls._mark_changed()
+        
+        return cls._format(row, chemical_ids, machines)
+    
+    @classmethod
+    def _format(
+        cls, row: Any, chemical_ids: Dict[str, List[str]], machines: Dict[str, List[Dict[str, Any]]]
+    ) -> Dict[str, Any]:
+        """Convert a stored configuration row to its API form."""
+        config = dict(row)
+        config['chemical_ids'] = chemical_ids.get(config['id'], [])
+        config['machines'] = machines.get(config['id'], [])
+        # Convert transport_enabled from int to bool
+        config['transport_enabled'] = bool(config.get('transport_enabled', 0))
+        return config
+    
+    @classmethod
+    def _chemical_ids(cls, cursor: sqlite3.Cursor, config_ids: Optional[List[str]] = None) -> Dict[str, List[str]]:
+        """Chemical IDs per configuration in saved order (all configurations if None)."""
+        chemical_ids: Dict[str, List[str]] = {}
+        for config_id, chemical_id in cls._links(cursor, "configuration_chemicals", "chemical_id", config_ids):
+            chemical_ids.setdefault(config_id, []).append(chemical_id)
+        return chemical_ids
+    
+    @classmethod
+    def _machines(
+        cls, cursor: sqlite3.Cursor, config_ids: Optional[List[str]] = None
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """Fleet machines per configuration in saved order (all configurations if None)."""
+        machines: Dict[str, List[Dict[str, Any]]] = {}
+        rows = cls._links(cursor, "configuration_machines", "kind, machine_id, quantity", config_ids)
+        for config_id, kind, machine_id, quantity in rows:
+            machines.setdefault(config_id, []).append(
+                {'kind': kind, 'machine_id': machine_id, 'quantity': quantity}
+            )
+        return machines
+    
+    @classmethod
+    def _links(
+        cls, cursor: sqlite3.Cursor, table: str, columns: str, config_ids: Optional[List[str]]
+    ) -> List[tuple]:
+        """(configuration_id, *columns) rows of a join table in saved order."""
+        if config_ids is None:
+            cursor.execute(
+                f"SELECT configuration_id, {columns} FROM {table} "
+                "ORDER BY configuration_id, position"
+            )
+            return cursor.fetchall()
+        
+        rows = []
+        unique_ids = list(dict.fromkeys(config_ids))
+        for start in range(0, len(unique_ids), cls._ID_CHUNK_SIZE):
+            chunk = unique_ids[start:start + cls._ID_CHUNK_SIZE]
+            placeholders = ','.join('?' * len(chunk))
+            cursor.execute(
+                f"""SELECT configuration_id, {columns} FROM {table}
+                WHERE configuration_id IN ({placeholders})
+                ORDER BY configuration_id, position""",
+                chunk
+            )
+            rows.extend(cursor.fetchall())
+        return rows
+    
+    @classmethod
+    def _row_values(cls, data: ConfigurationCreate, now: str) -> Dict[str, Any]:
+        """Column values of a configuration in its stored form."""
+        values = data.model_dump(exclude={'chemical_ids', 'machines'})
+        values['transport_enabled'] = 1 if data.transport_enabled else 0
+        values['updated_at'] = now
+        return values
+    
+    @classmethod
+    def _write_related(cls, cursor: sqlite3.Cursor, records: List[tuple], now: str) -> None:
+        """
+        Replace the chemical and fleet machine links of the given
+        configurations and append their new state to the revision history.
+        Chemical and machine IDs are kept exactly as given, including
+        unknown ones (cost calculations skip unknown chemicals and price
+        unknown machines as missing); a machine listed twice adds up its
+        quantities.
+        """
+        cursor.executemany(
+            "DELETE FROM configuration_chemicals WHERE configuration_id = ?",
+            [(config_id,) for config_id, _ in records]
+        )
+        cursor.executemany(
+            """INSERT OR IGNORE INTO configuration_chemicals (configuration_id, chemical_id, position)
+            VALUES (?, ?, ?)""",
+            [
+                (config_id, chemical_id, position)
+                for config_id, data in records
+                for position, chemical_id in enumerate(data.chemical_ids)
+            ]
+        )
+        
+        cursor.executemany(
+            "DELETE FROM configuration_machines WHERE configuration_id = ?",
+            [(config_id,) for config_id, _ in records]
+        )
+        cursor.executemany(
+            """INSERT INTO configuration_machines (configuration_id, kind, machine_id, quantity, position)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(configuration_id, kind, machine_id) DO UPDATE SET
+            quantity = quantity + excluded.quantity""",
+            [
+                (config_id, machine.kind, machine.machine_id, machine.quantity, position)
+                for config_id, data in records
+                for position, machine in enumerate(data.machines)
+            ]
+        )
         
-        # Return the saved config
-        return cls.get_latest()
+        config_ids = [config_id for config_id, _ in records]
+        chemical_ids = cls._chemical_ids(cursor, config_ids)
+        machines = cls._machines(cursor, config_ids)
+        for config_id, data in records:
+            state = {
+                **data.model_dump(),
+                'chemical_ids': chemical_ids.get(config_id, []),
+                'machines': machines.get(config_id, []),
+            }
+            ConfigurationRevisionRepository.append(cursor, config_id, state, now)
     
     @classmethod
     def get_all_formatted(cls) -> List[Dict[str, Any]]:
-        """Get all configurations with formatted chemical_ids."""
+        """Get all configurations with their chemical_ids and machines."""
         with get_db() as conn:
             cursor = conn.cursor()
             cursor.execute("SELECT * FROM configurations")
-            configs = []
-            for row in cursor.fetchall():
-                config = dict(row)
-                chemical_ids_str = config.get('chemical_ids', '')
-                config['chemical_ids'] = (
-                    [cid for cid in chemical_ids_str.split(',') if cid]
-                    if chemical_ids_str else []
-                )
-                config['transport_enabled'] = bool(config.get('transport_enabled', 0))
-                configs.append(config)
-            return configs
+            rows = cursor.fetchall()
+            chemical_ids = cls._chemical_ids(cursor)
+            machines = cls._machines(cursor)
+            return [cls._format(row, chemical_ids, machines) for row in rows]
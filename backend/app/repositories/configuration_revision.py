@@ -0,0 +1,185 @@
+"""
+Configuration revision repository - append-only history of configurations.
+"""
+import json
+import sqlite3
+from typing import Any, Dict, List, Optional, Tuple
+
+from .base import BaseRepository
+from ..database import get_db
+
+
+class ConfigurationRevisionRepository(BaseRepository):
+    """
+    Append-only configuration history.
+    
+    Revision n of a configuration stores the fields that changed since
+    revision n - 1 (`diff`); every KEYFRAME_INTERVAL-th revision, starting
+    with the first, stores the full state instead (`snapshot`). Rebuilding
+    any revision therefore reads at most KEYFRAME_INTERVAL rows, found
+    through the primary key, and point-in-time lookups use the
+    (configuration_id, created_at) index.
+    """
+    table_name = "configuration_revisions"
+    
+    KEYFRAME_INTERVAL: int = 16
+    
+    @classmethod
+    def _keyframe(cls, revision: int) -> int:
+        """Revision holding the snapshot that `revision` is rebuilt from."""
+        return (revision - 1) // cls.KEYFRAME_INTERVAL * cls.KEYFRAME_INTERVAL + 1
+    
+    @staticmethod
+    def _encode(state: Dict[str, Any]) -> str:
+        """Compact, key-ordered JSON of a state or diff."""
+        return json.dumps(state, sort_keys=True, separators=(",", ":"))
+    
+    @classmethod
+    def append(
+        cls,
+        cursor: sqlite3.Cursor,
+        config_id: str,
+        state: Dict[str, Any],
+        created_at: str,
+    ) -> Optional[int]:
+        """
+        Record a configuration's new state inside the caller's write
+        transaction. Returns the new revision, or None if nothing changed.
+        """
+        latest = cls._latest(cursor, config_id)
+        revision = latest[0] + 1 if latest else 1
+        if latest is not None:
+            _, previous_at, previous = latest
+            diff = {key: value for key, value in state.items() if previous.get(key) != value}
+            if not diff:
+                return None
+            # Keep history ordered in time even if saves commit out of order
+            created_at = max(created_at, previous_at)
+        
+        if revision == cls._keyframe(revision):
+            cursor.execute(
+                "INSERT INTO configuration_revisions (configuration_id, revision, created_at, snapshot) "
+                "VALUES (?, ?, ?, ?)",
+                (config_id, revision, created_at, cls._encode(state))
+            )
+        else:
+            cursor.execute(
+                "INSERT INTO configuration_revisions (configuration_id, revision, created_at, diff) "
+                "VALUES (?, ?, ?, ?)",
+                (config_id, revision, created_at, cls._encode(diff))
+            )
+        return revision
+    
+    @classmethod
+    def get_revisions(cls, config_id: str) -> List[Dict[str, Any]]:
+        """Revision list of a configuration with the fields each one changed."""
+        with get_db() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT revision, created_at, snapshot, diff FROM configuration_revisions "
+                "WHERE configuration_id = ? ORDER BY revision",
+                (config_id,)
+            )
+            revisions = []
+            state: Dict[str, Any] = {}
+            for revision, created_at, snapshot, diff in cursor.fetchall():
+                if snapshot is not None:
+                    new_state = json.loads(snapshot)
+                    changes = {k: v for k, v in new_state.items() if state.get(k) != v}
+                    state = new_state
+                else:
+                    changes = json.loads(diff)
+                    state.update(changes)
+                revisions.append({
+                    "configuration_id": config_id,
+                    "revision": revision,
+                    "created_at": created_at,
+                    "changes": changes,
+                })
+            return revisions
+    
+    @classmethod
+    def get_as_of(cls, config_id: str, timestamp: str) -> Optional[Dict[str, Any]]:
+        """State of a configuration as of an ISO timestamp (None if it did not exist yet)."""
+        with get_db() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT revision, created_at FROM configuration_revisions "
+                "WHERE configuration_id = ? AND created_at <= ? "
+                "ORDER BY created_at DESC, revision DESC LIMIT 1",
+                (config_id, timestamp)
+            )
+            row = cursor.fetchone()
+            if row is None:
+                return None
+            return {
+                "configuration_id": config_id,
+                "revision": row[0],
+                "created_at": row[1],
+                "configuration": cls._state(cursor, config_id, row[0]),
+            }
+    
+    @classmethod
+    def get_states(
+        cls, config_id: Optional[str] = None
+    ) -> List[Tuple[str, int, str, Dict[str, Any]]]:
+        """
+        Every revision's full state - (configuration_id, revision, created_at,
+        state) - of one or all configurations, rebuilt in a single ordered scan.
+        """
+        sql = (
+            "SELECT configuration_id, revision, created_at, snapshot, diff "
+            "FROM configuration_revisions"
+        )
+        params: Tuple[Any, ...] = ()
+        if config_id is not None:
+            sql += " WHERE configuration_id = ?"
+            params = (config_id,)
+        sql += " ORDER BY configuration_id, revision"
+        
+        with get_db() as conn:
+            cursor = conn.cursor()
+            cursor.execute(sql, params)
+            states = []
+            current_id = None
+            state: Dict[str, Any] = {}
+            for row_id, revision, created_at, snapshot, diff in cursor.fetchall():
+                if row_id != current_id:
+                    current_id, state = row_id, {}
+                if snapshot is not None:
+                    state = json.loads(snapshot)
+                else:
+                    state = {**state, **json.loads(diff)}
+                states.append((row_id, revision, created_at, state))
+            return states
+    
+    @classmethod
+    def _latest(
+        cls, cursor: sqlite3.Cursor, config_id: str
+    ) -> Optional[Tuple[int, str, Dict[str, Any]]]:
+        """Latest revision number, timestamp and state of a configuration."""
+        cursor.execute(
+            "SELECT revision, created_at FROM configuration_revisions "
+            "WHERE configuration_id = ? ORDER BY revision DESC LIMIT 1",
+            (config_id,)
+        )
+        row = cursor.fetchone()
+        if row is None:
+            return None
+        return row[0], row[1], cls._state(cursor, config_id, row[0])
+    
+    @classmethod
+    def _state(cls, cursor: sqlite3.Cursor, config_id: str, revision: int) -> Dict[str, Any]:
+        """Rebuild a revision from its keyframe (at most KEYFRAME_INTERVAL rows)."""
+        cursor.execute(
+            "SELECT snapshot, diff FROM configuration_revisions "
+            "WHERE configuration_id = ? AND revision BETWEEN ? AND ? ORDER BY revision",
+            (config_id, cls._keyframe(revision), revision)
+        )
+        state: Dict[str, Any] = {}
+        for snapshot, diff in cursor.fetchall():
+            if snapshot is not None:
+                state = json.loads(snapshot)
+            else:
+                state.update(json.loads(diff))
+        return state
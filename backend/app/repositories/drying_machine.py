@@ -11,6 +11,13 @@ from ..models import DryingMachineCreate
 class DryingMachineRepository(BaseRepository):
     """Repository for drying machine CRUD operations."""
     table_name = "drying_machines"
+    cached = True
+    create_model = DryingMachineCreate
+    filters = {
+        "capacity_min": ("capacity_kg", ">="),
+        "capacity_max": ("capacity_kg", "<="),
+        "model": ("model", "="),
+    }
     
     @classmethod
     def create(cls, data: DryingMachineCreate) -> Dict[str, Any]:
@@ -29,6 +36,7 @@ class DryingMachineRepository(BaseRepository):
                  data.energy_consumption_kwh_per_cycle, data.cycle_duration_min, now)
             )
             conn.commit()
+        cls._mark_changed()
         
         return {
             "id": machine_id,
@@ -53,5 +61,6 @@ class DryingMachineRepository(BaseRepository):
                  data.cycle_duration_min, machine_id)
             )
             conn.commit()
+        cls._mark_changed()
         
         return cls.get_by_id(machine_id)
@@ -0,0 +1,52 @@
+"""
+Electricity tariff repository - time-of-use price schedules per location.
+"""
+import json
+from typing import Any, Dict, Optional
+
+from .base import BaseRepository
+from ..database import get_db
+
+
+class ElectricityTariffRepository(BaseRepository):
+    """One tariff per location, stored as the schedule JSON it was given."""
+    table_name = "electricity_tariffs"
+    
+    @classmethod
+    def get(cls, location_id: str) -> Optional[Dict[str, Any]]:
+        """A location's tariff (schedule fields plus location_id and updated_at), or None."""
+        with get_db() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT schedule, updated_at FROM electricity_tariffs WHERE location_id = ?",
+                (location_id,)
+            )
+            row = cursor.fetchone()
+        if row is None:
+            return None
+        return {**json.loads(row["schedule"]), "location_id": location_id, "updated_at": row["updated_at"]}
+    
+    @classmethod
+    def upsert(cls, location_id: str, schedule: Dict[str, Any]) -> Dict[str, Any]:
+        """Create or replace a location's tariff."""
+        now = cls._now()
+        with get_db() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "INSERT INTO electricity_tariffs (location_id, name, schedule, updated_at) "
+                "VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(location_id) DO UPDATE SET "
+                "name = excluded.name, schedule = excluded.schedule, updated_at = excluded.updated_at",
+                (location_id, schedule.get("name"), json.dumps(schedule, separators=(",", ":")), now)
+            )
+            conn.commit()
+        return {**schedule, "location_id": location_id, "updated_at": now}
+    
+    @classmethod
+    def delete(cls, location_id: str) -> bool:
+        """Delete a location's tariff. Returns False if it had none."""
+        with get_db() as conn:
+            cursor = conn.cursor()
+            cursor.execute("DELETE FROM electricity_tariffs WHERE location_id = ?", (location_id,))
+            conn.commit()
+            return cursor.rowcount > 0
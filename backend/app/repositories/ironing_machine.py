@@ -11,6 +11,9 @@ from ..models import IroningMachineCreate
 class IroningMachineRepository(BaseRepository):
     """Repository for ironing machine CRUD operations."""
     table_name = "ironing_machines"
+    cached = True
+    create_model = IroningMachineCreate
+    filters = {"model": ("model", "=")}
     
     @classmethod
     def create(cls, data: IroningMachineCreate) -> Dict[str, Any]:
@@ -28,6 +31,7 @@ class IroningMachineRepository(BaseRepository):
                  data.energy_consumption_kwh_per_hour, now)
             )
             conn.commit()
+        cls._mark_changed()
         
         return {
             "id": machine_id,
@@ -50,5 +54,6 @@ class IroningMachineRepository(BaseRepository):
                  data.energy_consumption_kwh_per_hour, machine_id)
             )
             conn.commit()
+        cls._mark_changed()
         
         return cls.get_by_id(machine_id)
@@ -1,6 +1,7 @@
 """
 Location repository - data access for locations table.
 """
+import sqlite3
 from typing import Dict, Any, Optional
 
 from .base import BaseRepository
@@ -11,40 +12,47 @@ from ..models import LocationCreate
 class LocationRepository(BaseRepository):
     """Repository for location CRUD operations."""
     table_name = "locations"
+    cached = True
+    create_model = LocationCreate
+    natural_key = "name"
+    filters = {"name": ("name", "=")}
     
     @classmethod
     def create(cls, data: LocationCreate) -> Optional[Dict[str, Any]]:
         """Create a new location. Returns None if duplicate name exists."""
-        # Check for duplicate
-        with get_db() as conn:
-            cursor = conn.cursor()
-            cursor.execute("SELECT 1 FROM locations WHERE name = ?", (data.name,))
-            if cursor.fetchone():
-                return None  # Duplicate exists
-        
         location_id = cls._generate_id()
         now = cls._now()
         
         with get_db() as conn:
             cursor = conn.cursor()
-            cursor.execute(
-                """INSERT INTO locations (id, name, created_at) 
-                VALUES (?, ?, ?)""",
-                (location_id, data.name, now)
-            )
+            try:
+                cursor.execute(
+                    """INSERT INTO locations (id, name, created_at) 
+                    VALUES (?, ?, ?)""",
+                    (location_id, data.name, now)
+                )
+            except sqlite3.IntegrityError:
+                conn.rollback()
+                return None  # Duplicate exists (unique index on name)
             conn.commit()
+        cls._mark_changed()
         
         return {"id": location_id, "name": data.name, "created_at": now}
     
     @classmethod
-    def update(cls, location_id: str, data: LocationCreate) -> Dict[str, Any]:
-        """Update an existing location."""
+    def update(cls, location_id: str, data: LocationCreate) -> Optional[Dict[str, Any]]:
+        """Update an existing location. Returns None if another location has the name."""
         with get_db() as conn:
             cursor = conn.cursor()
-            cursor.execute(
-                "UPDATE locations SET name = ? WHERE id = ?",
-                (data.name, location_id)
-            )
+            try:
+                cursor.execute(
+                    "UPDATE locations SET name = ? WHERE id = ?",
+                    (data.name, location_id)
+                )
+            except sqlite3.IntegrityError:
+                conn.rollback()
+                return None  # Duplicate exists (unique index on name)
             conn.commit()
+        cls._mark_changed()
         
         return cls.get_by_id(location_id)
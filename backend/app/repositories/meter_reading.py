@@ -0,0 +1,82 @@
+"""
+Meter reading repository - long-format time series of utility readings.
+"""
+import sqlite3
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from ..database import get_db
+
+
+class MeterReadingRepository:
+    """
+    Readings keyed by (location_id, metric, date). Re-importing a sheet
+    overwrites the values it contains and leaves other dates untouched.
+    """
+    table_name = "meter_readings"
+    
+    @classmethod
+    def upsert_many(
+        cls,
+        cursor: sqlite3.Cursor,
+        readings: Iterable[Tuple[str, str, str, float, Optional[str]]],
+    ) -> None:
+        """
+        Write (location_id, metric, date, value, source) rows inside the
+        caller's transaction with one prepared statement.
+        """
+        cursor.executemany(
+            "INSERT INTO meter_readings (location_id, metric, date, value, source) "
+            "VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT(location_id, metric, date) DO UPDATE SET "
+            "value = excluded.value, source = excluded.source",
+            readings
+        )
+    
+    @classmethod
+    def query(
+        cls,
+        location_id: str,
+        metric: Optional[str] = None,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """Readings of a location (optionally one metric) between two ISO dates, inclusive."""
+        sql = "SELECT location_id, metric, date, value, source FROM meter_readings WHERE location_id = ?"
+        params: List[Any] = [location_id]
+        if metric is not None:
+            sql += " AND metric = ?"
+            params.append(metric)
+        if start is not None:
+            sql += " AND date >= ?"
+            params.append(start)
+        if end is not None:
+            sql += " AND date <= ?"
+            params.append(end)
+        sql += " ORDER BY metric, date" if metric is None else " ORDER BY date"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        
+        with get_db() as conn:
+            cursor = conn.cursor()
+            cursor.execute(sql, params)
+            return [dict(row) for row in cursor.fetchall()]
+    
+    @classmethod
+    def get_metrics(cls, location_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Metrics with their reading count and date range, per location."""
+        sql = (
+            "SELECT location_id, metric, COUNT(*) AS readings, "
+            "MIN(date) AS first_date, MAX(date) AS last_date FROM meter_readings"
+        )
+        params: Tuple[Any, ...] = ()
+        if location_id is not None:
+            sql += " WHERE location_id = ?"
+            params = (location_id,)
+        sql += " GROUP BY location_id, metric ORDER BY location_id, metric"
+        
+        with get_db() as conn:
+            cursor = conn.cursor()
+            cursor.execute(sql, params)
+            return [dict(row) for row in cursor.fetchall()]
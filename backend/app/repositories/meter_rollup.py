@@ -0,0 +1,253 @@
+"""
+Meter rollup repository - weekly, monthly and yearly aggregates of meter
+readings, maintained as readings are written.
+"""
+import sqlite3
+from datetime import date, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from ..database import get_db
+
+# Finest to coarsest; "day" is served by meter_readings itself
+RESOLUTIONS = ("day", "week", "month", "year")
+
+
+def period_start(resolution: str, day: date) -> date:
+    """First day of the period of a resolution that contains `day` (weeks start on Monday)."""
+    if resolution == "week":
+        return day - timedelta(days=day.weekday())
+    if resolution == "month":
+        return day.replace(day=1)
+    if resolution == "year":
+        return day.replace(month=1, day=1)
+    return day
+
+
+def period_end(resolution: str, start: date) -> date:
+    """First day after the period starting at `start`."""
+    if resolution == "week":
+        return start + timedelta(days=7)
+    if resolution == "month":
+        return (start.replace(day=28) + timedelta(days=4)).replace(day=1)
+    if resolution == "year":
+        return start.replace(year=start.year + 1)
+    return start + timedelta(days=1)
+
+
+class MeterRollupRepository:
+    """
+    Aggregates (count, total, minimum, maximum) of every metric per
+    location and week, month and year.
+    
+    Rollups are refreshed inside the transaction that writes the readings,
+    for the periods those readings fall in only: weeks and months are
+    re-aggregated from their days through the meter_readings primary key,
+    years from their twelve months. Months are built from days rather than
+    weeks because weeks straddle month boundaries.
+    """
+    table_name = "meter_rollups"
+    
+    @classmethod
+    def refresh(
+        cls,
+        cursor: sqlite3.Cursor,
+        readings: Iterable[Tuple[str, str, str, Any, Any]],
+    ) -> int:
+        """
+        Re-aggregate the periods touched by written (location_id, metric,
+        date, ...) rows. Returns the number of rollup rows refreshed.
+        """
+        touched: Dict[str, Set[Tuple[str, str, date]]] = {"week": set(), "month": set(), "year": set()}
+        for location_id, metric, day, *_ in readings:
+            day = date.fromisoformat(day)
+            for resolution, periods in touched.items():
+                periods.add((location_id, metric, period_start(resolution, day)))
+        
+        for resolution, source in (("week", "meter_readings"), ("month", "meter_readings"), ("year", "month")):
+            params = [
+                (resolution, start.isoformat(), location_id, metric,
+                 start.isoformat(), period_end(resolution, start).isoformat())
+                for location_id, metric, start in touched[resolution]
+            ]
+            if source == "meter_readings":
+                cursor.executemany(
+                    "INSERT OR REPLACE INTO meter_rollups "
+                    "(location_id, metric, resolution, period_start, count, total, minimum, maximum) "
+                    "SELECT location_id, metric, ?, ?, COUNT(*), SUM(value), MIN(value), MAX(value) "
+                    "FROM meter_readings WHERE location_id = ? AND metric = ? AND date >= ? AND date < ? "
+                    "GROUP BY location_id, metric",
+                    params
+                )
+            else:
+                cursor.executemany(
+                    "INSERT OR REPLACE INTO meter_rollups "
+                    "(location_id, metric, resolution, period_start, count, total, minimum, maximum) "
+                    "SELECT location_id, metric, ?, ?, SUM(count), SUM(total), MIN(minimum), MAX(maximum) "
+                    "FROM meter_rollups WHERE location_id = ? AND metric = ? AND resolution = 'month' "
+                    "AND period_start >= ? AND period_start < ? "
+                    "GROUP BY location_id, metric",
+                    params
+                )
+        return sum(len(periods) for periods in touched.values())
+    
+    @classmethod
+    def coarsest_resolution(cls, start: date, end: date) -> str:
+        """Coarsest resolution whose periods tile start..end (inclusive) exactly."""
+        after = end + timedelta(days=1)
+        for resolution in reversed(RESOLUTIONS):
+            if period_start(resolution, start) == start and period_start(resolution, after) == after:
+                return resolution
+        return "day"
+    
+    @classmethod
+    def decompose(cls, start: date, end: date) -> List[Tuple[str, date]]:
+        """
+        Cover start..end (inclusive) with as few periods as possible: whole
+        years, then whole months, then whole weeks inside a month, then days.
+        """
+        periods = []
+        day = start
+        while day <= end:
+            for resolution in ("year", "month", "week", "day"):
+                if period_start(resolution, day) != day:
+                    continue
+                next_day = period_end(resolution, day)
+                if next_day > end + timedelta(days=1):
+                    continue
+                # Weeks stay inside a month, so whole months can follow
+                if resolution == "week" and period_start("month", next_day - timedelta(days=1)) > day:
+                    continue
+                periods.append((resolution, day))
+                day = next_day
+                break
+        return periods
+    
+    @classmethod
+    def get_series(
+        cls,
+        location_id: str,
+        metric: str,
+        start: date,
+        end: date,
+        resolution: Optional[str] = None,
+    ) -> Tuple[str, List[Dict[str, Any]]]:
+        """
+        Aggregates of the periods starting within start..end, at the given
+        resolution or, by default, the coarsest one that tiles the range.
+        Returns the resolution used and the periods in date order.
+        """
+        if resolution is None:
+            resolution = cls.coarsest_resolution(start, end)
+        if resolution not in RESOLUTIONS:
+            raise ValueError(f"Unknown resolution: {resolution}")
+        
+        with get_db() as conn:
+            cursor = conn.cursor()
+            if resolution == "day":
+                cursor.execute(
+                    "SELECT date AS period_start, 1 AS count, value AS total, "
+                    "value AS minimum, value AS maximum FROM meter_readings "
+                    "WHERE location_id = ? AND metric = ? AND date >= ? AND date <= ? ORDER BY date",
+                    (location_id, metric, start.isoformat(), end.isoformat())
+                )
+            else:
+                cursor.execute(
+                    "SELECT period_start, count, total, minimum, maximum FROM meter_rollups "
+                    "WHERE location_id = ? AND metric = ? AND resolution = ? "
+                    "AND period_start >= ? AND period_start <= ? ORDER BY period_start",
+                    (location_id, metric, resolution, start.isoformat(), end.isoformat())
+                )
+            periods = [
+                {
+                    "location_id": location_id,
+                    "metric": metric,
+                    "resolution": resolution,
+                    **dict(row),
+                    "average": row["total"] / row["count"],
+                }
+                for row in cursor.fetchall()
+            ]
+        return resolution, periods
+    
+    @classmethod
+    def get_values(
+        cls,
+        metrics: List[str],
+        resolution: str,
+        location_ids: Optional[List[str]] = None,
+    ) -> List[Tuple[str, str, str, float, int]]:
+        """
+        (location_id, metric, period_start, total, count) of several metrics
+        at one resolution, across all locations or the given ones.
+        """
+        if resolution not in RESOLUTIONS:
+            raise ValueError(f"Unknown resolution: {resolution}")
+        placeholders = ",".join("?" * len(metrics))
+        params: List[Any] = list(metrics)
+        if resolution == "day":
+            sql = (
+                "SELECT location_id, metric, date, value, 1 FROM meter_readings "
+                f"WHERE metric IN ({placeholders})"
+            )
+        else:
+            sql = (
+                "SELECT location_id, metric, period_start, total, count FROM meter_rollups "
+                f"WHERE resolution = ? AND metric IN ({placeholders})"
+            )
+            params.insert(0, resolution)
+        if location_ids:
+            sql += f" AND location_id IN ({','.join('?' * len(location_ids))})"
+            params.extend(location_ids)
+        
+        with get_db() as conn:
+            cursor = conn.cursor()
+            # Plain tuples: this feeds array building, not dicts
+            cursor.row_factory = None
+            cursor.execute(sql, params)
+            return cursor.fetchall()
+    
+    @classmethod
+    def get_summary(cls, location_id: str, metric: str, start: date, end: date) -> Dict[str, Any]:
+        """
+        Aggregate of start..end (inclusive), read from the fewest rollup
+        rows (see decompose) plus the readings of the leftover days.
+        """
+        periods = cls.decompose(start, end)
+        by_resolution: Dict[str, List[str]] = {}
+        for resolution, day in periods:
+            by_resolution.setdefault(resolution, []).append(day.isoformat())
+        
+        rows = []
+        with get_db() as conn:
+            cursor = conn.cursor()
+            for resolution, starts in by_resolution.items():
+                placeholders = ",".join("?" * len(starts))
+                if resolution == "day":
+                    cursor.execute(
+                        "SELECT 1, value, value, value FROM meter_readings "
+                        f"WHERE location_id = ? AND metric = ? AND date IN ({placeholders})",
+                        (location_id, metric, *starts)
+                    )
+                else:
+                    cursor.execute(
+                        "SELECT count, total, minimum, maximum FROM meter_rollups "
+                        "WHERE location_id = ? AND metric = ? AND resolution = ? "
+                        f"AND period_start IN ({placeholders})",
+                        (location_id, metric, resolution, *starts)
+                    )
+                rows.extend(cursor.fetchall())
+        
+        count = sum(row[0] for row in rows)
+        total = sum(row[1] for row in rows)
+        return {
+            "location_id": location_id,
+            "metric": metric,
+            "start": start.isoformat(),
+            "end": end.isoformat(),
+            "count": count,
+            "total": total,
+            "minimum": min((row[2] for row in rows), default=None),
+            "maximum": max((row[3] for row in rows), default=None),
+            "average": total / count if count else None,
+            "periods": {resolution: len(starts) for resolution, starts in by_resolution.items()},
+        }
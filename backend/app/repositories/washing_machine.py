@@ -11,6 +11,13 @@ from ..models import WashingMachineCreate
 class WashingMachineRepository(BaseRepository):
     """Repository for washing machine CRUD operations."""
     table_name = "washing_machines"
+    cached = True
+    create_model = WashingMachineCreate
+    filters = {
+        "capacity_min": ("capacity_kg", ">="),
+        "capacity_max": ("capacity_kg", "<="),
+        "model": ("model", "="),
+    }
     
     @classmethod
     def create(cls, data: WashingMachineCreate) -> Dict[str, Any]:
@@ -29,6 +36,7 @@ class WashingMachineRepository(BaseRepository):
                  data.energy_consumption_kwh, data.cycle_duration_min, now)
             )
             conn.commit()
+        cls._mark_changed()
         
         return {
             "id": machine_id,
@@ -54,5 +62,6 @@ class WashingMachineRepository(BaseRepository):
                  data.energy_consumption_kwh, data.cycle_duration_min, machine_id)
             )
             conn.commit()
+        cls._mark_changed()
         
         return cls.get_by_id(machine_id)
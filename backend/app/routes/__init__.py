@@ -3,6 +3,8 @@ Routes package - API endpoints.
 """
 from fastapi import APIRouter
 
+from ..database import get_pool
+
 from .locations import router as locations_router
 from .washing_machines import router as washing_machines_router
 from .drying_machines import router as drying_machines_router
@@ -10,6 +12,10 @@ from .ironing_machines import router as ironing_machines_router
 from .chemicals import router as chemicals_router
 from .configurations import router as configurations_router
 from .cost import router as cost_router
+from .readings import router as readings_router
+from .forecast import router as forecast_router
+from .tariffs import router as tariffs_router
+from .operations import router as operations_router
 
 
 def create_api_router() -> APIRouter:
@@ -22,6 +28,11 @@ def create_api_router() -> APIRouter:
         """Health check endpoint for Docker healthcheck."""
         return {"status": "healthy", "service": "laundry-backend"}
     
+    @api_router.get("/health/db")
+    def database_pool_stats():
+        """Connection pool metrics: checkouts, waits and wait times."""
+        return get_pool().stats()
+    
     # Include all entity routers
     api_router.include_router(locations_router)
     api_router.include_router(washing_machines_router)
@@ -30,5 +41,9 @@ def create_api_router() -> APIRouter:
     api_router.include_router(chemicals_router)
     api_router.include_router(configurations_router)
     api_router.include_router(cost_router)
+    api_router.include_router(readings_router)
+    api_router.include_router(forecast_router)
+    api_router.include_router(tariffs_router)
+    api_router.include_router(operations_router)
     
     return api_router
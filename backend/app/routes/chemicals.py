@@ -1,37 +1,80 @@
 """
 Chemical routes - API endpoints for chemical management.
 """
-from fastapi import APIRouter, HTTPException
+from typing import Optional
 
-from ..models import Chemical, ChemicalCreate
-from ..repositories import ChemicalRepository
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+
+from ..database import run_db
+from ..models import (
+    Chemical, ChemicalCreate, ConfigurationCost,
+    BulkUpsertRequest, BulkDeleteRequest, BulkResult,
+)
+from ..repositories import AsyncChemicalRepository
+from .pagination import ListParams, list_response
+from ..services import CostCalculatorService
 
 router = APIRouter(prefix="/chemicals", tags=["chemicals"])
 
 
 @router.post("", response_model=Chemical)
-def create_chemical(data: ChemicalCreate):
+async def create_chemical(data: ChemicalCreate):
     """Create a new chemical."""
-    return ChemicalRepository.create(data)
+    return await AsyncChemicalRepository.create(data)
 
 
 @router.get("", response_model=list[Chemical])
-def get_chemicals():
-    """Get all chemicals."""
-    return ChemicalRepository.get_all()
+async def get_chemicals(
+    request: Request,
+    type: Optional[str] = Query(None, description="Chemical type"),
+    name: Optional[str] = Query(None, description="Exact chemical name"),
+    params: ListParams = Depends(),
+):
+    """
+    Get chemicals, optionally filtered, paginated (limit/cursor) and
+    projected to selected fields.
+    """
+    return await list_response(request, AsyncChemicalRepository, Chemical, params, {
+        "type": type,
+        "name": name,
+    })
+
+
+@router.post("/bulk", response_model=BulkResult)
+async def bulk_upsert_chemicals(data: BulkUpsertRequest):
+    """
+    Create or update many chemicals in one transaction.
+    Items with an existing id are updated; invalid items are
+    reported per row and skipped.
+    """
+    return await AsyncChemicalRepository.bulk_upsert(data.items)
+
+
+@router.post("/bulk-delete", response_model=BulkResult)
+async def bulk_delete_chemicals(data: BulkDeleteRequest):
+    """Delete many chemicals in one transaction; unknown IDs are reported per row."""
+    return await AsyncChemicalRepository.bulk_delete(data.ids)
+
+
+@router.get("/{chemical_id}/impact", response_model=list[ConfigurationCost])
+async def get_chemical_impact(chemical_id: str):
+    """Recalculate the costs of the saved configurations that use a chemical."""
+    if not await AsyncChemicalRepository.exists(chemical_id):
+        raise HTTPException(status_code=404, detail="Chemical not found")
+    return await run_db(CostCalculatorService.calculate_for_chemical, chemical_id)
 
 
 @router.put("/{chemical_id}", response_model=Chemical)
-def update_chemical(chemical_id: str, data: ChemicalCreate):
+async def update_chemical(chemical_id: str, data: ChemicalCreate):
     """Update an existing chemical."""
-    if not ChemicalRepository.exists(chemical_id):
+    if not await AsyncChemicalRepository.exists(chemical_id):
         raise HTTPException(status_code=404, detail="Chemical not found")
-    return ChemicalRepository.update(chemical_id, data)
+    return await AsyncChemicalRepository.update(chemical_id, data)
 
 
 @router.delete("/{chemical_id}")
-def delete_chemical(chemical_id: str):
+async def delete_chemical(chemical_id: str):
     """Delete a chemical."""
-    if not ChemicalRepository.delete(chemical_id):
+    if not await AsyncChemicalRepository.delete(chemical_id):
         raise HTTPException(status_code=404, detail="Chemical not found")
     return {"message": "Chemical deleted"}
@@ -0,0 +1,39 @@
+"""
+Conditional GET helpers - ETags derived from per-table version counters.
+"""
+import hashlib
+from typing import Optional
+
+from fastapi import Request, Response
+
+from ..database import run_db
+from ..repositories import CatalogCache
+
+
+async def table_etag(request: Request, table: str) -> str:
+    """
+    ETag for a read of `table`: its version counter plus the query string
+    (filters, pages and projections are separate representations).
+    Read it before the data, so a concurrent write can only make the tag
+    older than the body, never newer.
+    """
+    version = await run_db(CatalogCache.version, table)
+    query = request.url.query
+    suffix = f"-{hashlib.sha1(query.encode()).hexdigest()[:12]}" if query else ""
+    return f'"{table}-{version}{suffix}"'
+
+
+def not_modified(request: Request, etag: str) -> Optional[Response]:
+    """A 304 response if the client's If-None-Match already has `etag`."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return None
+    candidates = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    if "*" in candidates or etag in candidates:
+        return Response(status_code=304, headers=cache_headers(etag))
+    return None
+
+
+def cache_headers(etag: str) -> dict:
+    """Headers that make clients revalidate with the ETag on every poll."""
+    return {"ETag": etag, "Cache-Control": "no-cache"}
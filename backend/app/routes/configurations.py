@@ -1,41 +1,129 @@
 """
 Configuration routes - API endpoints for configuration management.
 """
-from fastapi import APIRouter, HTTPException
+from datetime import datetime, timezone
+from typing import Optional
 
-from ..models import Configuration, ConfigurationCreate
-from ..repositories import ConfigurationRepository
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+
+from ..database import run_db
+from ..models import (
+    Configuration, ConfigurationCreate, ConfigurationRevision, ConfigurationAsOf, RevisionCost,
+    BulkUpsertRequest, BulkDeleteRequest, BulkResult,
+)
+from ..repositories import AsyncConfigurationRepository, ConfigurationRevisionRepository
+from ..services import CostCalculatorService
+from .conditional import cache_headers, not_modified, table_etag
+from .pagination import ListParams, list_response
 
 router = APIRouter(prefix="/configurations", tags=["configurations"])
 
 
 @router.post("", response_model=Configuration)
-def save_configuration(data: ConfigurationCreate):
+async def save_configuration(data: ConfigurationCreate):
     """
     Save a configuration.
     Updates existing if name matches, creates new otherwise.
     """
-    return ConfigurationRepository.save(data)
+    return await AsyncConfigurationRepository.save(data)
 
 
 @router.get("", response_model=list[Configuration])
-def get_configurations():
-    """Get all configurations."""
-    return ConfigurationRepository.get_all_formatted()
+async def get_configurations(
+    request: Request,
+    location_id: Optional[str] = Query(None, description="Location ID"),
+    washing_machine_id: Optional[str] = Query(None, description="Washing machine ID"),
+    season: Optional[str] = Query(None, description="Season"),
+    updated_since: Optional[str] = Query(None, description="ISO timestamp; only configurations updated since"),
+    params: ListParams = Depends(),
+):
+    """
+    Get configurations, optionally filtered, paginated (limit/cursor) and
+    projected to selected fields.
+    """
+    return await list_response(request, AsyncConfigurationRepository, Configuration, params, {
+        "location_id": location_id,
+        "washing_machine_id": washing_machine_id,
+        "season": season,
+        "updated_since": updated_since,
+    })
 
 
 @router.get("/latest", response_model=Configuration)
-def get_latest_configuration():
-    """Get the most recently updated configuration."""
-    config = ConfigurationRepository.get_latest()
+async def get_latest_configuration(request: Request, response: Response):
+    """
+    Get the most recently updated configuration.
+    Supports conditional GET: a matching If-None-Match gets a 304.
+    """
+    etag = await table_etag(request, "configurations")
+    cached = not_modified(request, etag)
+    if cached is not None:
+        return cached
+    config = await AsyncConfigurationRepository.get_latest()
     if not config:
         raise HTTPException(status_code=404, detail="No configuration found")
+    response.headers.update(cache_headers(etag))
     return config
 
 
+@router.post("/bulk", response_model=BulkResult)
+async def bulk_upsert_configurations(data: BulkUpsertRequest):
+    """
+    Create or update many configurations in one transaction.
+    Items with an existing id (or name) are updated; invalid items are
+    reported per row and skipped.
+    """
+    return await AsyncConfigurationRepository.bulk_upsert(data.items)
+
+
+@router.post("/bulk-delete", response_model=BulkResult)
+async def bulk_delete_configurations(data: BulkDeleteRequest):
+    """Delete many configurations in one transaction; unknown IDs are reported per row."""
+    return await AsyncConfigurationRepository.bulk_delete(data.ids)
+
+
+@router.get("/cost-history", response_model=list[RevisionCost])
+async def get_all_cost_history():
+    """Recompute the cost of every revision of every configuration in one pass."""
+    return await run_db(CostCalculatorService.calculate_history)
+
+
+@router.get("/{config_id}/revisions", response_model=list[ConfigurationRevision])
+async def get_configuration_revisions(config_id: str):
+    """Get a configuration's history: each revision with the fields it changed."""
+    revisions = await run_db(ConfigurationRevisionRepository.get_revisions, config_id)
+    if not revisions:
+        raise HTTPException(status_code=404, detail="Configuration not found")
+    return revisions
+
+
+@router.get("/{config_id}/as-of", response_model=ConfigurationAsOf)
+async def get_configuration_as_of(
+    config_id: str,
+    timestamp: datetime = Query(..., description="Point in time (ISO 8601; UTC if no offset)"),
+):
+    """Get a configuration as it was at a point in time."""
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.replace(tzinfo=timezone.utc)
+    as_of = timestamp.astimezone(timezone.utc).isoformat(timespec="microseconds")
+    state = await run_db(ConfigurationRevisionRepository.get_as_of, config_id, as_of)
+    if state is None:
+        raise HTTPException(status_code=404, detail="Configuration did not exist at that time")
+    return state
+
+
+@router.get("/{config_id}/cost-history", response_model=list[RevisionCost])
+async def get_configuration_cost_history(config_id: str):
+    """Recompute the cost of every revision of a configuration in one pass."""
+    history = await run_db(CostCalculatorService.calculate_history, config_id)
+    if not history:
+        raise HTTPException(status_code=404, detail="Configuration not found")
+    return history
+
+
 @router.delete("/{config_id}")
-def delete_configuration(config_id: str):
+async def delete_configuration(config_id: str):
     """Delete a configuration."""
-    if not ConfigurationRepository.delete(config_id):
+    if not await AsyncConfigurationRepository.delete(config_id):
         raise HTTPException(status_code=404, detail="Configuration not found")
     return {"message": "Configuration deleted"}
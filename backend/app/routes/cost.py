@@ -1,15 +1,100 @@
 """
-Cost calculation routes - API endpoint for cost calculations.
+Cost calculation routes - API endpoints for cost calculations.
 """
-from fastapi import APIRouter
+from typing import List
 
-from ..models import CostCalculationRequest, CostBreakdown
-from ..services import CostCalculatorService
+from fastapi import APIRouter, HTTPException
+
+from ..config import settings
+from ..database import run_db
+from ..models import (
+    CostCalculationRequest, CostBreakdown,
+    CostSweepRequest, CostSweepResult,
+    CostSimulationRequest, CostSimulationResult,
+    CostSensitivityRequest, CostSensitivityResult,
+    CostProjectionRequest, CostProjectionResult,
+)
+from ..services import (
+    CostCalculatorService, CostSweepService, CostSimulationService, CostSensitivityService,
+    CostProjectionService,
+    CostResultCache, CostSingleFlight,
+)
 
 router = APIRouter(prefix="/calculate-cost", tags=["cost-calculation"])
 
 
 @router.post("", response_model=CostBreakdown)
-def calculate_cost(data: CostCalculationRequest):
+async def calculate_cost(data: CostCalculationRequest):
     """Calculate comprehensive cost breakdown based on configuration."""
-    return CostCalculatorService.calculate(data)
+    return await CostCalculatorService.calculate_async(data)
+
+
+@router.get("/cache-stats")
+def get_cost_cache_stats():
+    """
+    Hit/miss/eviction/invalidation counters of the cost result cache, plus
+    how many requests were coalesced into an identical in-flight calculation.
+    """
+    return {**CostResultCache.stats(), **CostSingleFlight.stats()}
+
+
+@router.post("/batch", response_model=List[CostBreakdown])
+async def calculate_cost_batch(data: List[CostCalculationRequest]):
+    """
+    Calculate cost breakdowns for a list of configurations in one call.
+    Results are returned in the same order as the requests.
+    """
+    if len(data) > settings.BATCH_MAX_REQUESTS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Batch has {len(data)} requests, the limit is {settings.BATCH_MAX_REQUESTS}",
+        )
+    return await run_db(CostCalculatorService.calculate_batch, data)
+
+
+@router.post("/sweep", response_model=CostSweepResult)
+async def calculate_cost_sweep(data: CostSweepRequest):
+    """
+    Evaluate the cost model over the Cartesian grid of the given field ranges.
+    Results are returned as flattened columns, one per CostBreakdown field.
+    """
+    try:
+        return await run_db(CostSweepService.run, data)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+
+@router.post("/simulate", response_model=CostSimulationResult)
+async def simulate_cost(data: CostSimulationRequest):
+    """
+    Run a Monte Carlo simulation of monthly cost under uncertain inputs.
+    Pass the returned seed back in to reproduce a run exactly.
+    """
+    try:
+        return await run_db(CostSimulationService.run, data)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+
+@router.post("/sensitivity", response_model=CostSensitivityResult)
+async def calculate_cost_sensitivity(data: CostSensitivityRequest):
+    """
+    Elasticity of cost per kg and its components to each numeric input.
+    Entries come back sorted for a tornado chart.
+    """
+    try:
+        return await run_db(CostSensitivityService.run, data)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+
+@router.post("/projection", response_model=CostProjectionResult)
+async def calculate_cost_projection(data: CostProjectionRequest):
+    """
+    Month-by-month cost breakdowns over a horizon, with per-month profiles
+    (volume, rates, ...) and seasonal multipliers, plus horizon totals.
+    """
+    try:
+        return await run_db(CostProjectionService.run, data)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
@@ -1,37 +1,69 @@
 """
 Drying machine routes - API endpoints for drying machine management.
 """
-from fastapi import APIRouter, HTTPException
+from typing import Optional
 
-from ..models import DryingMachine, DryingMachineCreate
-from ..repositories import DryingMachineRepository
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+
+from ..models import DryingMachine, DryingMachineCreate, BulkUpsertRequest, BulkDeleteRequest, BulkResult
+from ..repositories import AsyncDryingMachineRepository
+from .pagination import ListParams, list_response
 
 router = APIRouter(prefix="/drying-machines", tags=["drying-machines"])
 
 
 @router.post("", response_model=DryingMachine)
-def create_drying_machine(data: DryingMachineCreate):
+async def create_drying_machine(data: DryingMachineCreate):
     """Create a new drying machine."""
-    return DryingMachineRepository.create(data)
+    return await AsyncDryingMachineRepository.create(data)
 
 
 @router.get("", response_model=list[DryingMachine])
-def get_drying_machines():
-    """Get all drying machines."""
-    return DryingMachineRepository.get_all()
+async def get_drying_machines(
+    request: Request,
+    capacity_min: Optional[float] = Query(None, description="Minimum capacity (kg)"),
+    capacity_max: Optional[float] = Query(None, description="Maximum capacity (kg)"),
+    model: Optional[str] = Query(None, description="Exact model name"),
+    params: ListParams = Depends(),
+):
+    """
+    Get drying machines, optionally filtered, paginated (limit/cursor) and
+    projected to selected fields.
+    """
+    return await list_response(request, AsyncDryingMachineRepository, DryingMachine, params, {
+        "capacity_min": capacity_min,
+        "capacity_max": capacity_max,
+        "model": model,
+    })
+
+
+@router.post("/bulk", response_model=BulkResult)
+async def bulk_upsert_drying_machines(data: BulkUpsertRequest):
+    """
+    Create or update many drying machines in one transaction.
+    Items with an existing id are updated; invalid items are
+    reported per row and skipped.
+    """
+    return await AsyncDryingMachineRepository.bulk_upsert(data.items)
+
+
+@router.post("/bulk-delete", response_model=BulkResult)
+async def bulk_delete_drying_machines(data: BulkDeleteRequest):
+    """Delete many drying machines in one transaction; unknown IDs are reported per row."""
+    return await AsyncDryingMachineRepository.bulk_delete(data.ids)
 
 
 @router.put("/{machine_id}", response_model=DryingMachine)
-def update_drying_machine(machine_id: str, data: DryingMachineCreate):
+async def update_drying_machine(machine_id: str, data: DryingMachineCreate):
     """Update an existing drying machine."""
-    if not DryingMachineRepository.exists(machine_id):
+    if not await AsyncDryingMachineRepository.exists(machine_id):
         raise HTTPException(status_code=404, detail="Drying machine not found")
-    return DryingMachineRepository.update(machine_id, data)
+    return await AsyncDryingMachineRepository.update(machine_id, data)
 
 
 @router.delete("/{machine_id}")
-def delete_drying_machine(machine_id: str):
+async def delete_drying_machine(machine_id: str):
     """Delete a drying machine."""
-    if not DryingMachineRepository.delete(machine_id):
+    if not await AsyncDryingMachineRepository.delete(machine_id):
         raise HTTPException(status_code=404, detail="Drying machine not found")
     return {"message": "Drying machine deleted"}
@@ -0,0 +1,143 @@
+"""
+Pre-encoded JSON responses - orjson bodies cached per table version, with
+negotiated gzip/brotli compression.
+"""
+import gzip
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import orjson
+from fastapi import Request, Response
+
+from ..config import settings
+
+try:
+    import brotli
+except ImportError:  # optional dependency
+    brotli = None
+
+_COMPRESSORS: Dict[str, Callable[[bytes], bytes]] = {
+    "gzip": lambda body: gzip.compress(body, compresslevel=6, mtime=0),
+}
+if brotli is not None:
+    _COMPRESSORS["br"] = lambda body: brotli.compress(body, quality=5)
+
+
+def negotiate_encoding(request: Request) -> Optional[str]:
+    """Best supported content coding the client accepts (brotli first), or None."""
+    header = request.headers.get("accept-encoding", "")
+    accepted = set()
+    for part in header.split(","):
+        coding, _, params = part.strip().partition(";")
+        if params.strip().replace(" ", "") in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            continue
+        accepted.add(coding.strip().lower())
+    for coding in ("br", "gzip"):
+        if coding in _COMPRESSORS and (coding in accepted or "*" in accepted):
+            return coding
+    return None
+
+
+class EncodedResponseCache:
+    """
+    LRU cache of encoded JSON bodies keyed by ETag.
+    ETags embed the table version, so entries never go stale: a write
+    changes the tag and old entries age out. Compressed variants are built
+    on first request and kept next to the plain body.
+    """
+    _lock = threading.Lock()
+    # etag -> (headers, {"identity" | coding: body})
+    _entries: "OrderedDict[str, Tuple[Dict[str, str], Dict[str, bytes]]]" = OrderedDict()
+    _size: int = 0
+    _stats: Dict[str, int] = {"hits": 0, "misses": 0, "evictions": 0}
+    
+    @classmethod
+    def get(cls, etag: str) -> Optional[Tuple[bytes, Dict[str, str]]]:
+        """Cached plain body and its extra headers."""
+        with cls._lock:
+            entry = cls._entries.get(etag)
+            if entry is None:
+                cls._stats["misses"] += 1
+                return None
+            cls._entries.move_to_end(etag)
+            cls._stats["hits"] += 1
+            return entry[1]["identity"], entry[0]
+    
+    @classmethod
+    def put(cls, etag: str, body: bytes, headers: Dict[str, str]) -> None:
+        """Store a plain body; bodies over half the budget are not cached."""
+        if len(body) > settings.ENCODED_CACHE_MAX_BYTES // 2:
+            return
+        with cls._lock:
+            previous = cls._entries.pop(etag, None)
+            if previous is not None:
+                cls._size -= sum(len(b) for b in previous[1].values())
+            cls._entries[etag] = (headers, {"identity": body})
+            cls._size += len(body)
+            cls._evict()
+    
+    @classmethod
+    def compressed(cls, etag: str, body: bytes, encoding: str) -> bytes:
+        """`body` compressed with `encoding`, reusing the cached variant if any."""
+        with cls._lock:
+            entry = cls._entries.get(etag)
+            cached = entry[1].get(encoding) if entry is not None else None
+        if cached is not None:
+            return cached
+        
+        compressed = _COMPRESSORS[encoding](body)
+        with cls._lock:
+            entry = cls._entries.get(etag)
+            if entry is not None and entry[1]["identity"] is body and encoding not in entry[1]:
+                entry[1][encoding] = compressed
+                cls._size += len(compressed)
+                cls._evict()
+        return compressed
+    
+    @classmethod
+    def stats(cls) -> Dict[str, int]:
+        """Hit/miss/eviction counters, entry count and cached bytes."""
+        with cls._lock:
+            return {**cls._stats, "size": len(cls._entries), "bytes": cls._size}
+    
+    @classmethod
+    def clear(cls) -> None:
+        """Drop all cached bodies (counters are kept)."""
+        with cls._lock:
+            cls._entries.clear()
+            cls._size = 0
+    
+    @classmethod
+    def _evict(cls) -> None:
+        """Drop least recently used entries beyond the byte budget (lock held)."""
+        while cls._size > settings.ENCODED_CACHE_MAX_BYTES and cls._entries:
+            _, (_, variants) = cls._entries.popitem(last=False)
+            cls._size -= sum(len(b) for b in variants.values())
+            cls._stats["evictions"] += 1
+
+
+def encode_json(content: Any) -> bytes:
+    """Encode rows straight to JSON bytes."""
+    return orjson.dumps(content)
+
+
+def encoded_response(
+    request: Request,
+    etag: str,
+    body: bytes,
+    headers: Optional[Dict[str, str]] = None,
+) -> Response:
+    """
+    Response for an already encoded JSON body.
+    Bodies of at least RESPONSE_COMPRESS_MIN_BYTES are compressed when the
+    client accepts br or gzip; the ETag is then weak, as for any
+    transfer-level recompression.
+    """
+    headers = {**(headers or {}), "ETag": etag, "Vary": "Accept-Encoding"}
+    encoding = negotiate_encoding(request)
+    if encoding and len(body) >= settings.RESPONSE_COMPRESS_MIN_BYTES:
+        body = EncodedResponseCache.compressed(etag, body, encoding)
+        headers["Content-Encoding"] = encoding
+        headers["ETag"] = f"W/{etag}"
+    return Response(content=body, media_type="application/json", headers=headers)
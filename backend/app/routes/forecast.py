@@ -0,0 +1,36 @@
+"""
+Demand forecast routes - occupancy-driven volume projections.
+"""
+from fastapi import APIRouter, HTTPException
+
+from ..models import (
+    DemandForecastRequest, DemandForecastResult,
+    ForecastCostRequestsRequest, ForecastCostRequest,
+)
+from ..services import DemandForecastService
+
+router = APIRouter(prefix="/forecast", tags=["forecast"])
+
+
+@router.post("/demand", response_model=DemandForecastResult)
+def forecast_demand(data: DemandForecastRequest):
+    """
+    Fit laundry kg and sets to the driver metrics of every location and
+    project them for the requested months or days.
+    """
+    try:
+        return DemandForecastService.run(data)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+
+@router.post("/cost-requests", response_model=list[ForecastCostRequest])
+def forecast_cost_requests(data: ForecastCostRequestsRequest):
+    """
+    Monthly forecast turned into cost requests: the base request with
+    operational_volume and cycles_per_month of each location and month.
+    """
+    try:
+        return DemandForecastService.cost_requests(data)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
@@ -1,37 +1,65 @@
 """
 Ironing machine routes - API endpoints for ironing machine management.
 """
-from fastapi import APIRouter, HTTPException
+from typing import Optional
 
-from ..models import IroningMachine, IroningMachineCreate
-from ..repositories import IroningMachineRepository
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+
+from ..models import IroningMachine, IroningMachineCreate, BulkUpsertRequest, BulkDeleteRequest, BulkResult
+from ..repositories import AsyncIroningMachineRepository
+from .pagination import ListParams, list_response
 
 router = APIRouter(prefix="/ironing-machines", tags=["ironing-machines"])
 
 
 @router.post("", response_model=IroningMachine)
-def create_ironing_machine(data: IroningMachineCreate):
+async def create_ironing_machine(data: IroningMachineCreate):
     """Create a new ironing machine."""
-    return IroningMachineRepository.create(data)
+    return await AsyncIroningMachineRepository.create(data)
 
 
 @router.get("", response_model=list[IroningMachine])
-def get_ironing_machines():
-    """Get all ironing machines."""
-    return IroningMachineRepository.get_all()
+async def get_ironing_machines(
+    request: Request,
+    model: Optional[str] = Query(None, description="Exact model name"),
+    params: ListParams = Depends(),
+):
+    """
+    Get ironing machines, optionally filtered, paginated (limit/cursor) and
+    projected to selected fields.
+    """
+    return await list_response(request, AsyncIroningMachineRepository, IroningMachine, params, {
+        "model": model,
+    })
+
+
+@router.post("/bulk", response_model=BulkResult)
+async def bulk_upsert_ironing_machines(data: BulkUpsertRequest):
+    """
+    Create or update many ironing machines in one transaction.
+    Items with an existing id are updated; invalid items are
+    reported per row and skipped.
+    """
+    return await AsyncIroningMachineRepository.bulk_upsert(data.items)
+
+
+@router.post("/bulk-delete", response_model=BulkResult)
+async def bulk_delete_ironing_machines(data: BulkDeleteRequest):
+    """Delete many ironing machines in one transaction; unknown IDs are reported per row."""
+    return await AsyncIroningMachineRepository.bulk_delete(data.ids)
 
 
 @router.put("/{machine_id}", response_model=IroningMachine)
-def update_ironing_machine(machine_id: str, data: IroningMachineCreate):
+async def update_ironing_machine(machine_id: str, data: IroningMachineCreate):
     """Update an existing ironing machine."""
-    if not IroningMachineRepository.exists(machine_id):
+    if not await AsyncIroningMachineRepository.exists(machine_id):
         raise HTTPException(status_code=404, detail="Ironing machine not found")
-    return IroningMachineRepository.update(machine_id, data)
+    return await AsyncIroningMachineRepository.update(machine_id, data)
 
 
 @router.delete("/{machine_id}")
-def delete_ironing_machine(machine_id: str):
+async def delete_ironing_machine(machine_id: str):
     """Delete an ironing machine."""
-    if not IroningMachineRepository.delete(machine_id):
+    if not await AsyncIroningMachineRepository.delete(machine_id):
         raise HTTPException(status_code=404, detail="Ironing machine not found")
     return {"message": "Ironing machine deleted"}
@@ -1,40 +1,71 @@
 """
 Location routes - API endpoints for location management.
 """
-from fastapi import APIRouter, HTTPException
+from typing import Optional
 
-from ..models import Location, LocationCreate
-from ..repositories import LocationRepository
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+
+from ..models import Location, LocationCreate, BulkUpsertRequest, BulkDeleteRequest, BulkResult
+from ..repositories import AsyncLocationRepository
+from .pagination import ListParams, list_response
 
 router = APIRouter(prefix="/locations", tags=["locations"])
 
 
 @router.post("", response_model=Location)
-def create_location(data: LocationCreate):
+async def create_location(data: LocationCreate):
     """Create a new location."""
-    location = LocationRepository.create(data)
+    location = await AsyncLocationRepository.create(data)
     if location is None:
         raise HTTPException(status_code=400, detail="Location with this name already exists")
     return location
 
 
 @router.get("", response_model=list[Location])
-def get_locations():
-    """Get all locations."""
-    return LocationRepository.get_all()
+async def get_locations(
+    request: Request,
+    name: Optional[str] = Query(None, description="Exact location name"),
+    params: ListParams = Depends(),
+):
+    """
+    Get locations, optionally filtered, paginated (limit/cursor) and
+    projected to selected fields.
+    """
+    return await list_response(request, AsyncLocationRepository, Location, params, {
+        "name": name,
+    })
+
+
+@router.post("/bulk", response_model=BulkResult)
+async def bulk_upsert_locations(data: BulkUpsertRequest):
+    """
+    Create or update many locations in one transaction.
+    Items with an existing id (or name) are updated; invalid items are
+    reported per row and skipped.
+    """
+    return await AsyncLocationRepository.bulk_upsert(data.items)
+
+
+@router.post("/bulk-delete", response_model=BulkResult)
+async def bulk_delete_locations(data: BulkDeleteRequest):
+    """Delete many locations in one transaction; unknown IDs are reported per row."""
+    return await AsyncLocationRepository.bulk_delete(data.ids)
 
 
 @router.put("/{location_id}", response_model=Location)
-def update_location(location_id: str, data: LocationCreate):
+async def update_location(location_id: str, data: LocationCreate):
     """Update an existing location."""
-    if not LocationRepository.exists(location_id):
+    if not await AsyncLocationRepository.exists(location_id):
         raise HTTPException(status_code=404, detail="Location not found")
-    return LocationRepository.update(location_id, data)
+    location = await AsyncLocationRepository.update(location_id, data)
+    if location is None:
+        raise HTTPException(status_code=400, detail="Location with this name already exists")
+    return location
 
 
 @router.delete("/{location_id}")
-def delete_location(location_id: str):
+async def delete_location(location_id: str):
     """Delete a location."""
-    if not LocationRepository.delete(location_id):
+    if not await AsyncLocationRepository.delete(location_id):
         raise HTTPException(status_code=404, detail="Location not found")
     return {"message": "Location deleted"}
@@ -0,0 +1,23 @@
+"""
+Operations routes - time-based simulation of a site's laundry pipeline.
+"""
+from fastapi import APIRouter, HTTPException
+
+from ..database import run_db
+from ..models import PipelineSimulationRequest, PipelineSimulationResult
+from ..services import PipelineSimulationService
+
+router = APIRouter(prefix="/operations", tags=["operations"])
+
+
+@router.post("/simulate", response_model=PipelineSimulationResult)
+async def simulate_pipeline(data: PipelineSimulationRequest):
+    """
+    Simulate wash -> dry -> iron with the given machines, operators and
+    shifts. Reports throughput, utilization, queue lengths and the
+    bottleneck stage, and whether the site keeps up with its volume.
+    """
+    try:
+        return await run_db(PipelineSimulationService.run, data)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
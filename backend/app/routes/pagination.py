@@ -0,0 +1,77 @@
+"""
+List endpoint helpers - keyset pagination, filters and field projection.
+"""
+from typing import Any, Dict, Optional, Type
+
+from fastapi import HTTPException, Query, Request, Response
+from pydantic import BaseModel
+
+from ..config import settings
+from ..repositories import AsyncRepository
+from .conditional import cache_headers, not_modified, table_etag
+from .encoded import EncodedResponseCache, encode_json, encoded_response
+
+
+class ListParams:
+    """Query parameters shared by all list endpoints."""
+    
+    def __init__(
+        self,
+        limit: Optional[int] = Query(
+            None, ge=1, le=settings.LIST_MAX_LIMIT,
+            description="Page size; without it all matching records are returned"
+        ),
+        cursor: Optional[str] = Query(
+            None, description="X-Next-Cursor value of the previous page"
+        ),
+        fields: Optional[str] = Query(
+            None, description="Comma-separated fields to return (id is always included)"
+        ),
+    ):
+        self.limit = limit
+        self.cursor = cursor
+        self.fields = fields
+
+
+async def list_response(
+    request: Request,
+    repository: Type[AsyncRepository],
+    model: Type[BaseModel],
+    params: ListParams,
+    filters: Optional[Dict[str, Any]] = None,
+) -> Response:
+    """
+    One page of records as JSON, with the next page's cursor in the
+    X-Next-Cursor header. Carries an ETag; a matching If-None-Match gets a
+    304 without reading or serializing anything.
+    
+    Records are encoded as stored (no per-item model round trip) and the
+    encoded body is cached under the ETag, i.e. per table version.
+    """
+    fields = None
+    if params.fields:
+        fields = list(dict.fromkeys(["id", *(f.strip() for f in params.fields.split(",") if f.strip())]))
+        unknown = [field for field in fields if field not in model.model_fields]
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+    
+    etag = await table_etag(request, repository.repository.table_name)
+    cached = not_modified(request, etag)
+    if cached is not None:
+        return cached
+    
+    hit = EncodedResponseCache.get(etag)
+    if hit is not None:
+        body, extra_headers = hit
+    else:
+        try:
+            records, next_cursor = await repository.get_page(filters, params.cursor, params.limit)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        if fields:
+            records = [{field: record.get(field) for field in fields} for record in records]
+        body = encode_json(records)
+        extra_headers = {"X-Next-Cursor": next_cursor} if next_cursor else {}
+        EncodedResponseCache.put(etag, body, extra_headers)
+    
+    return encoded_response(request, etag, body, {**cache_headers(etag), **extra_headers})
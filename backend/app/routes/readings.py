@@ -0,0 +1,133 @@
+"""
+Meter reading routes - import of utility sheets and time-series queries.
+"""
+import csv
+import io
+import tempfile
+from datetime import date
+from typing import Any, Callable, Optional
+
+from fastapi import APIRouter, HTTPException, Query, Request
+
+from ..config import settings
+from ..database import run_db
+from ..models import (
+    MeterReading, MeterMetric, ReadingsImportResult, SitesImportResult, ReadingRollup, ReadingSummary,
+)
+from ..repositories import AsyncLocationRepository, MeterReadingRepository, MeterRollupRepository
+from ..services import ReadingsIngestService
+
+router = APIRouter(prefix="/readings", tags=["readings"])
+
+
+@router.post("/import", response_model=ReadingsImportResult)
+async def import_readings(
+    request: Request,
+    location_id: str = Query(..., description="ID of the location the sheet belongs to"),
+    year: Optional[int] = Query(
+        None, ge=1900, le=2100,
+        description="Year of day.month columns, or of month columns without a year row"
+    ),
+    source: Optional[str] = Query(None, description="Recorded with every reading, e.g. the file name"),
+):
+    """
+    Import a wide meter-readings sheet (one row per metric, one column per
+    date) sent as the raw CSV request body. The upload is spooled to disk
+    beyond READINGS_SPOOL_MAX_BYTES and parsed as a stream.
+    """
+    if not await AsyncLocationRepository.exists(location_id):
+        raise HTTPException(status_code=404, detail="Location not found")
+    
+    return await _ingest_body(request, ReadingsIngestService.ingest, location_id, year, source)
+
+
+@router.post("/import-sites", response_model=SitesImportResult)
+async def import_site_volumes(
+    request: Request,
+    year: int = Query(..., ge=1900, le=2100, description="Year of the month columns"),
+    source: Optional[str] = Query(None, description="Recorded with every reading, e.g. the file name"),
+    prefix: str = Query("Laundry", description="Metric prefix; metrics are stored as '<prefix> / kg'"),
+):
+    """
+    Import a per-site volume sheet (one row per site, kg and sets columns
+    per month) sent as the raw CSV request body. Sites are matched to
+    locations by name; unmatched sites are skipped and listed.
+    """
+    return await _ingest_body(request, ReadingsIngestService.ingest_sites, year, source, prefix)
+
+
+async def _ingest_body(request: Request, ingest: Callable[..., Any], *args: Any) -> Any:
+    """
+    Spool the raw request body (to disk beyond READINGS_SPOOL_MAX_BYTES)
+    and run an ingest on it as a text stream.
+    """
+    spool = tempfile.SpooledTemporaryFile(max_size=settings.READINGS_SPOOL_MAX_BYTES)
+    try:
+        async for chunk in request.stream():
+            spool.write(chunk)
+        spool.seek(0)
+        stream = io.TextIOWrapper(spool, encoding="utf-8-sig", newline="")
+        try:
+            return await run_db(ingest, stream, *args)
+        except (ValueError, csv.Error) as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    finally:
+        spool.close()
+
+
+@router.get("", response_model=list[MeterReading])
+async def get_readings(
+    location_id: str = Query(..., description="Location ID"),
+    metric: Optional[str] = Query(None, description="Metric; all metrics if omitted"),
+    start: Optional[str] = Query(None, description="First date (ISO), inclusive"),
+    end: Optional[str] = Query(None, description="Last date (ISO), inclusive"),
+    limit: Optional[int] = Query(
+        None, ge=1, le=settings.LIST_MAX_LIMIT,
+        description="Maximum readings; without it all matching readings are returned"
+    ),
+):
+    """Readings of a location in date order (grouped by metric when no metric is given)."""
+    return await run_db(MeterReadingRepository.query, location_id, metric, start, end, limit)
+
+
+@router.get("/metrics", response_model=list[MeterMetric])
+async def get_reading_metrics(location_id: Optional[str] = Query(None, description="Location ID")):
+    """Imported metrics with their reading count and date range."""
+    return await run_db(MeterReadingRepository.get_metrics, location_id)
+
+
+@router.get("/rollups", response_model=list[ReadingRollup])
+async def get_reading_rollups(
+    location_id: str = Query(..., description="Location ID"),
+    metric: str = Query(..., description="Metric"),
+    start: date = Query(..., description="First date, inclusive"),
+    end: date = Query(..., description="Last date, inclusive"),
+    resolution: Optional[str] = Query(
+        None, pattern="^(day|week|month|year)$",
+        description="Period size; defaults to the coarsest one whose periods tile start..end"
+    ),
+):
+    """
+    Aggregates (count, total, min, max, average) of a metric per period,
+    for the periods starting within start..end.
+    """
+    if end < start:
+        raise HTTPException(status_code=400, detail="end must not be before start")
+    _, periods = await run_db(MeterRollupRepository.get_series, location_id, metric, start, end, resolution)
+    return periods
+
+
+@router.get("/summary", response_model=ReadingSummary)
+async def get_reading_summary(
+    location_id: str = Query(..., description="Location ID"),
+    metric: str = Query(..., description="Metric"),
+    start: date = Query(..., description="First date, inclusive"),
+    end: date = Query(..., description="Last date, inclusive"),
+):
+    """
+    Aggregate of a metric over start..end, read from the coarsest rollups
+    that fit inside the range (years, months, weeks) plus single days.
+    """
+    if end < start:
+        raise HTTPException(status_code=400, detail="end must not be before start")
+    return await run_db(MeterRollupRepository.get_summary, location_id, metric, start, end)
@@ -0,0 +1,55 @@
+"""
+Electricity tariff routes - time-of-use prices per location and cycle scheduling.
+"""
+from fastapi import APIRouter, HTTPException
+
+from ..database import run_db
+from ..models import ElectricityTariff, TariffSchedule, CycleScheduleRequest, CycleScheduleResult
+from ..repositories import AsyncLocationRepository, ElectricityTariffRepository
+from ..services import CycleSchedulerService, tariff_prices
+
+router = APIRouter(prefix="/tariffs", tags=["tariffs"])
+
+
+@router.post("/schedule", response_model=CycleScheduleResult)
+async def schedule_cycles(data: CycleScheduleRequest):
+    """
+    Place each fleet group's wash or dry cycles into the cheapest operating
+    hours of the horizon under the request's (or location's) tariff.
+    """
+    if data.tariff is None and data.location_id is not None:
+        if not await AsyncLocationRepository.exists(data.location_id):
+            raise HTTPException(status_code=404, detail="Location not found")
+    try:
+        return await run_db(CycleSchedulerService.run, data)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+
+@router.get("/{location_id}", response_model=ElectricityTariff)
+async def get_tariff(location_id: str):
+    """Get a location's time-of-use tariff."""
+    tariff = await run_db(ElectricityTariffRepository.get, location_id)
+    if tariff is None:
+        raise HTTPException(status_code=404, detail="Tariff not found")
+    return tariff
+
+
+@router.put("/{location_id}", response_model=ElectricityTariff)
+async def put_tariff(location_id: str, data: TariffSchedule):
+    """Create or replace a location's time-of-use tariff."""
+    if not await AsyncLocationRepository.exists(location_id):
+        raise HTTPException(status_code=404, detail="Location not found")
+    try:
+        tariff_prices(data)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    return await run_db(ElectricityTariffRepository.upsert, location_id, data.model_dump())
+
+
+@router.delete("/{location_id}")
+async def delete_tariff(location_id: str):
+    """Delete a location's tariff."""
+    if not await run_db(ElectricityTariffRepository.delete, location_id):
+        raise HTTPException(status_code=404, detail="Tariff not found")
+    return {"message": "Tariff deleted"}
@@ -1,37 +1,69 @@
 """
 Washing machine routes - API endpoints for washing machine management.
 """
-from fastapi import APIRouter, HTTPException
+from typing import Optional
 
-from ..models import WashingMachine, WashingMachineCreate
-from ..repositories import WashingMachineRepository
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+
+from ..models import WashingMachine, WashingMachineCreate, BulkUpsertRequest, BulkDeleteRequest, BulkResult
+from ..repositories import AsyncWashingMachineRepository
+from .pagination import ListParams, list_response
 
 router = APIRouter(prefix="/washing-machines", tags=["washing-machines"])
 
 
 @router.post("", response_model=WashingMachine)
-def create_washing_machine(data: WashingMachineCreate):
+async def create_washing_machine(data: WashingMachineCreate):
     """Create a new washing machine."""
-    return WashingMachineRepository.create(data)
+    return await AsyncWashingMachineRepository.create(data)
 
 
 @router.get("", response_model=list[WashingMachine])
-def get_washing_machines():
-    """Get all washing machines."""
-    return WashingMachineRepository.get_all()
+async def get_washing_machines(
+    request: Request,
+    capacity_min: Optional[float] = Query(None, description="Minimum capacity (kg)"),
+    capacity_max: Optional[float] = Query(None, description="Maximum capacity (kg)"),
+    model: Optional[str] = Query(None, description="Exact model name"),
+    params: ListParams = Depends(),
+):
+    """
+    Get washing machines, optionally filtered, paginated (limit/cursor) and
+    projected to selected fields.
+    """
+    return await list_response(request, AsyncWashingMachineRepository, WashingMachine, params, {
+        "capacity_min": capacity_min,
+        "capacity_max": capacity_max,
+        "model": model,
+    })
+
+
+@router.post("/bulk", response_model=BulkResult)
+async def bulk_upsert_washing_machines(data: BulkUpsertRequest):
+    """
+    Create or update many washing machines in one transaction.
+    Items with an existing id are updated; invalid items are
+    reported per row and skipped.
+    """
+    return await AsyncWashingMachineRepository.bulk_upsert(data.items)
+
+
+@router.post("/bulk-delete", response_model=BulkResult)
+async def bulk_delete_washing_machines(data: BulkDeleteRequest):
+    """Delete many washing machines in one transaction; unknown IDs are reported per row."""
+    return await AsyncWashingMachineRepository.bulk_delete(data.ids)
 
 
 @router.put("/{machine_id}", response_model=WashingMachine)
-def update_washing_machine(machine_id: str, data: WashingMachineCreate):
+async def update_washing_machine(machine_id: str, data: WashingMachineCreate):
     """Update an existing washing machine."""
-    if not WashingMachineRepository.exists(machine_id):
+    if not await AsyncWashingMachineRepository.exists(machine_id):
         raise HTTPException(status_code=404, detail="Washing machine not found")
-    return WashingMachineRepository.update(machine_id, data)
+    return await AsyncWashingMachineRepository.update(machine_id, data)
 
 
 @router.delete("/{machine_id}")
-def delete_washing_machine(machine_id: str):
+async def delete_washing_machine(machine_id: str):
     """Delete a washing machine."""
-    if not WashingMachineRepository.delete(machine_id):
+    if not await AsyncWashingMachineRepository.delete(machine_id):
         raise HTTPException(status_code=404, detail="Washing machine not found")
     return {"message": "Washing machine deleted"}
@@ -1,6 +1,29 @@
 """
 Services package - business logic layer.
 """
+from .cost_cache import CostResultCache, CostSingleFlight
 from .cost_calculator import CostCalculatorService
+from .cost_sweep import CostSweepService
+from .cost_simulation import CostSimulationService
+from .cost_sensitivity import CostSensitivityService
+from .cost_projection import CostProjectionService
+from .readings_ingest import ReadingsIngestService, parse_localized_number
+from .demand_forecast import DemandForecastService
+from .cycle_scheduler import CycleSchedulerService, tariff_prices
+from .pipeline_simulation import PipelineSimulationService
 
-__all__ = ["CostCalculatorService"]
+__all__ = [
+    "CostResultCache",
+    "CostSingleFlight",
+    "CostCalculatorService",
+    "CostSweepService",
+    "CostSimulationService",
+    "CostSensitivityService",
+    "CostProjectionService",
+    "ReadingsIngestService",
+    "parse_localized_number",
+    "DemandForecastService",
+    "CycleSchedulerService",
+    "tariff_prices",
+    "PipelineSimulationService",
+]
@@ -0,0 +1,166 @@
+"""
+Cost result cache - memoized cost breakdowns keyed by canonical request,
+plus single-flight coalescing of identical requests computed concurrently.
+"""
+import asyncio
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+from ..config import settings
+from ..models import CostCalculationRequest, CostBreakdown
+
+
+def canonical_request_key(data: CostCalculationRequest) -> str:
+    """
+    Canonical hash of a cost request.
+    Requests that only differ in JSON key order, repeated chemical IDs or
+    the order of fleet machines map to the same key.
+    """
+    canonical = data.model_dump(mode="json")
+    canonical["chemical_ids"] = list(dict.fromkeys(canonical["chemical_ids"]))
+    canonical["machines"] = sorted(
+        canonical["machines"], key=lambda m: (m["kind"], m["machine_id"], m["quantity"])
+    )
+    encoded = json.dumps(canonical, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+class CostResultCache:
+    """
+    LRU + TTL cache of CostBreakdown results.
+    
+    Each entry stores the versions of the catalog entries it was computed
+    from. A lookup with different versions (a used machine or chemical was
+    edited) drops the entry and counts as an invalidation.
+    """
+    _lock = threading.Lock()
+    _entries: "OrderedDict[str, Tuple[Hashable, CostBreakdown, float]]" = OrderedDict()
+    _stats: Dict[str, int] = {"hits": 0, "misses": 0, "evictions": 0, "invalidations": 0}
+    
+    @classmethod
+    def get(cls, key: str, versions: Hashable) -> Optional[CostBreakdown]:
+        """Get a cached result computed from the given catalog versions."""
+        with cls._lock:
+            entry = cls._entries.get(key)
+            if entry is None:
+                cls._stats["misses"] += 1
+                return None
+            
+            entry_versions, result, expires_at = entry
+            if entry_versions != versions:
+                del cls._entries[key]
+                cls._stats["invalidations"] += 1
+                cls._stats["misses"] += 1
+                return None
+            if expires_at <= time.monotonic():
+                del cls._entries[key]
+                cls._stats["evictions"] += 1
+                cls._stats["misses"] += 1
+                return None
+            
+            cls._entries.move_to_end(key)
+            cls._stats["hits"] += 1
+            return result
+    
+    @classmethod
+    def put(cls, key: str, versions: Hashable, result: CostBreakdown) -> None:
+        """Store a result, evicting the least recently used entries if full."""
+        if settings.COST_CACHE_MAX_ENTRIES <= 0:
+            return
+        with cls._lock:
+            cls._entries[key] = (versions, result, time.monotonic() + settings.COST_CACHE_TTL)
+            cls._entries.move_to_end(key)
+            while len(cls._entries) > settings.COST_CACHE_MAX_ENTRIES:
+                cls._entries.popitem(last=False)
+                cls._stats["evictions"] += 1
+    
+    @classmethod
+    def stats(cls) -> Dict[str, Any]:
+        """Hit/miss/eviction/invalidation counters and current size."""
+        with cls._lock:
+            return {**cls._stats, "size": len(cls._entries)}
+    
+    @classmethod
+    def clear(cls) -> None:
+        """Drop all cached results (counters are kept)."""
+        with cls._lock:
+            cls._entries.clear()
+
+
+class CostSingleFlight:
+    """
+    Coalesces concurrent identical computations.
+    The first caller for a key runs the computation; callers arriving while
+    it runs wait for and share its result (or exception). Threads block on
+    the shared future (run); coroutines await it (run_async), so waiting
+    async requests do not hold a database executor thread.
+    """
+    _lock = threading.Lock()
+    _in_flight: Dict[Hashable, Future] = {}
+    _stats: Dict[str, int] = {"executions": 0, "coalesced": 0}
+    
+    @classmethod
+    def run(cls, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """Run `compute` once per key among concurrent callers."""
+        future, leader = cls._join(key)
+        if not leader:
+            return future.result()
+        
+        try:
+            result = compute()
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            cls._leave(key)
+    
+    @classmethod
+    async def run_async(cls, key: Hashable, compute: Callable[[], Awaitable[Any]]) -> Any:
+        """Await `compute()` once per key among concurrent callers, threads included."""
+        future, leader = cls._join(key)
+        if not leader:
+            return await asyncio.wrap_future(future)
+        
+        try:
+            result = await compute()
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            cls._leave(key)
+    
+    @classmethod
+    def _join(cls, key: Hashable) -> Tuple[Future, bool]:
+        """The in-flight future for a key and whether the caller must compute it."""
+        with cls._lock:
+            future = cls._in_flight.get(key)
+            if future is not None:
+                cls._stats["coalesced"] += 1
+                return future, False
+            future = Future()
+            cls._in_flight[key] = future
+            cls._stats["executions"] += 1
+            return future, True
+    
+    @classmethod
+    def _leave(cls, key: Hashable) -> None:
+        """Stop coalescing callers into a finished computation."""
+        with cls._lock:
+            del cls._in_flight[key]
+    
+    @classmethod
+    def stats(cls) -> Dict[str, int]:
+        """Executions, coalesced callers and computations currently running."""
+        with cls._lock:
+            return {**cls._stats, "in_flight": len(cls._in_flight)}
@@ -1,167 +1,294 @@
 """
 Cost calculator service - business logic for cost calculations.
 """
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
 
-from ..models import CostCalculationRequest, CostBreakdown
-from ..database import get_db
+import numpy as np
+
+from ..database import run_db
+from ..models import CostCalculationRequest, CostBreakdown, ConfigurationCost, RevisionCost
+from ..repositories import (
+    CatalogCache,
+    WashingMachineRepository,
+    DryingMachineRepository,
+    IroningMachineRepository,
+    ChemicalRepository,
+    ConfigurationRepository,
+    ConfigurationRevisionRepository,
+)
+from .cost_cache import CostResultCache, CostSingleFlight, canonical_request_key
+from .cost_kernel import (
+    FLEET_PRICE_INPUTS, FLEET_STAGES, KERNEL_INPUTS,
+    compute_costs, fleet_spec_inputs, round_breakdowns, spec_inputs,
+)
+
+# Numeric request fields passed to the kernel unchanged
+REQUEST_KERNEL_FIELDS = (
+    "electricity_rate", "water_rate", "labor_rate",
+    "electricity_tariff_price", "water_tariff_price",
+    "cycles_per_month", "washing_load_percentage", "drying_load_percentage",
+    "ironing_labor_hours", "operational_volume",
+    "transport_fixed_cost", "transport_distance_km", "transport_time_hours",
+    "transport_labor_rate", "transport_fuel_rate",
+)
+
+# Fleet machine kind -> repository of its machine models and energy column
+FLEET_KINDS = {
+    "washing": (WashingMachineRepository, "energy_consumption_kwh"),
+    "drying": (DryingMachineRepository, "energy_consumption_kwh_per_cycle"),
+    "ironing": (IroningMachineRepository, "energy_consumption_kwh_per_hour"),
+}
 
 
 class CostCalculatorService:
     """
     Service for calculating laundry operation costs.
-    Contains all business logic for cost calculations.
+    Loads machine and chemical specs from the database and prices them with
+    the pure cost kernel (see cost_kernel.py).
     """
     
     @classmethod
     def calculate(cls, data: CostCalculationRequest) -> CostBreakdown:
         """
         Calculate comprehensive cost breakdown based on configuration.
+        Results are memoized per canonical request and the versions of the
+        machines and chemicals it references; concurrent identical requests
+        share a single computation.
         """
-        # Get machine data from database
-        washing_machine = cls._get_washing_machine(data.washing_machine_id)
-        drying_machine = cls._get_drying_machine(data.drying_machine_id)
-        ironing_machine = cls._get_ironing_machine(data.ironing_machine_id)
-        chemicals = cls._get_chemicals(data.chemical_ids)
-        
-        # Apply season multiplier (affects both utilities)
-        season_multiplier = cls._get_season_multiplier(data.season)
-        
-        # Apply custom tariff price multipliers for electricity and water
-        electricity_tariff_multiplier = data.electricity_tariff_price or 1.0
-        water_tariff_multiplier = data.water_tariff_price or 1.0
-        
-        # Calculate monthly totals
-        cycles = data.cycles_per_month
-        
-        # Washing calculations using actual machine specs
-        monthly_water_m3 = 0.0
-        monthly_washing_kwh = 0.0
-        total_kg_processed = 0.0
-        
-        if washing_machine:
-            water_per_cycle_m3 = washing_machine['water_consumption_l'] / 1000
-            energy_per_cycle_kwh = washing_machine['energy_consumption_kwh']
-            effective_capacity = washing_machine['capacity_kg'] * (data.washing_load_percentage / 100)
-            
-            monthly_water_m3 = water_per_cycle_m3 * cycles
-            monthly_washing_kwh = energy_per_cycle_kwh * cycles
-        
-        # Use operational_volume if provided, otherwise calculate from machine capacity
-        if data.operational_volume > 0:
-            total_kg_processed = data.operational_volume
-        elif washing_machine:
-            effective_capacity = washing_machine['capacity_kg'] * (data.washing_load_percentage / 100)
-            total_kg_processed = effective_capacity * cycles
-        else:
-            total_kg_processed = 0.0
-        
-        # Drying calculations
-        monthly_drying_kwh = 0.0
-        if drying_machine:
-            energy_per_drying_cycle = drying_machine['energy_consumption_kwh_per_cycle']
-            # Calculate drying cycles based on volume
-            effective_drying_capacity = drying_machine['capacity_kg'] * (data.drying_load_percentage / 100)
-            if effective_drying_capacity > 0:
-                drying_cycles = total_kg_processed / effective_drying_capacity
-            else:
-                drying_cycles = 0
-            monthly_drying_kwh = energy_per_drying_cycle * drying_cycles
-        
-        # Ironing calculations
-        monthly_ironing_kwh = 0.0
-        ironing_hours = data.ironing_labor_hours
-        if ironing_machine:
-            energy_per_hour = ironing_machine['energy_consumption_kwh_per_hour']
-            monthly_ironing_kwh = energy_per_hour * ironing_hours
-        
-        # Total electricity
-        monthly_electricity_kwh = monthly_washing_kwh + monthly_drying_kwh + monthly_ironing_kwh
-        
-        # Apply multipliers to costs
-        monthly_water_cost = (
-            monthly_water_m3 * data.water_rate * 
-            season_multiplier * water_tariff_multiplier
-        )
-        monthly_electricity_cost = (
-            monthly_electricity_kwh * data.electricity_rate * 
-            season_multiplier * electricity_tariff_multiplier
-        )
-        
-        # Chemical costs
-        monthly_chemical_cost = 0.0
-        for chem in chemicals:
-            cost_per_cycle = (chem['package_price'] / chem['package_amount']) * chem['usage_per_cycle']
-            monthly_chemical_cost += cost_per_cycle * cycles
-        
-        # Labor costs - actual manual work only (not machine running time)
-        # Washing: 2.5 min loading + 2.5 min unloading = 5 min per cycle
-        # Drying: 2.5 min loading + 2.5 min unloading = 5 min per cycle
-        MANUAL_TIME_PER_WASHING_CYCLE = 5.0  # minutes
-        MANUAL_TIME_PER_DRYING_CYCLE = 5.0   # minutes
-        
-        washing_labor_hours = (cycles * MANUAL_TIME_PER_WASHING_CYCLE) / 60
-        
-        # Calculate drying cycles for labor (same as energy calculation)
-        drying_labor_hours = 0.0
-        if drying_machine and total_kg_processed > 0:
-            effective_drying_capacity = drying_machine['capacity_kg'] * (data.drying_load_percentage / 100)
-            if effective_drying_capacity > 0:
-                drying_cycles = total_kg_processed / effective_drying_capacity
-                drying_labor_hours = (drying_cycles * MANUAL_TIME_PER_DRYING_CYCLE) / 60
+        key, versions, result = cls._lookup(data)
+        if result is None:
+            # Callers that saw other catalog versions must not share a result
+            result = CostSingleFlight.run(
+                (key, versions), lambda: cls._calculate_and_store(data, key, versions)
+            )
+        return result
+    
+    @classmethod
+    async def calculate_async(cls, data: CostCalculationRequest) -> CostBreakdown:
+        """
+        Non-blocking variant of calculate() for async routes.
+        The cache lookup and, on a miss, the spec lookups plus the math each
+        run as one hop on the database threads. Requests coalesced into an
+        in-flight computation await it on the event loop without holding a
+        database thread.
+        """
+        key, versions, result = await run_db(cls._lookup, data)
+        if result is None:
+            result = await CostSingleFlight.run_async(
+                (key, versions), lambda: run_db(cls._calculate_and_store, data, key, versions)
+            )
+        return result
+    
+    @classmethod
+    def _lookup(
+        cls, data: CostCalculationRequest
+    ) -> Tuple[str, Tuple[Any, ...], Optional[CostBreakdown]]:
+        """The cache key and catalog versions for a request, with any memoized result."""
+        key = canonical_request_key(data)
+        versions = cls._catalog_versions(data)
+        return key, versions, CostResultCache.get(key, versions)
+    
+    @classmethod
+    def _calculate_and_store(
+        cls, data: CostCalculationRequest, key: str, versions: Tuple[Any, ...]
+    ) -> CostBreakdown:
+        """Calculate a cost breakdown and memoize it."""
+        result = cls._calculate_uncached(data)
+        CostResultCache.put(key, versions, result)
+        return result
+    
+    @classmethod
+    def _calculate_uncached(cls, data: CostCalculationRequest) -> CostBreakdown:
+        """Calculate a cost breakdown without consulting the result cache."""
+        return cls.to_breakdowns(compute_costs(cls.build_kernel_inputs([data])))[0]
+    
+    @classmethod
+    def calculate_batch(cls, requests: List[CostCalculationRequest]) -> List[CostBreakdown]:
+        """Calculate cost breakdowns for many requests in one vectorized pass."""
+        if not requests:
+            return []
+        return cls.to_breakdowns(compute_costs(cls.build_kernel_inputs(requests)))
+    
+    @classmethod
+    def calculate_for_chemical(cls, chemical_id: str) -> List[ConfigurationCost]:
+        """
+        Recalculate only the saved configurations that use a chemical,
+        e.g. after its price changed.
+        """
+        configs = ConfigurationRepository.get_using_chemical(chemical_id)
+        requests = [CostCalculationRequest.model_validate(config) for config in configs]
+        return [
+            ConfigurationCost(
+                configuration_id=config['id'],
+                configuration_name=config['name'],
+                breakdown=breakdown,
+            )
+            for config, breakdown in zip(configs, cls.calculate_batch(requests))
+        ]
+    
+    @classmethod
+    def calculate_history(cls, config_id: Optional[str] = None) -> List[RevisionCost]:
+        """
+        Cost breakdown of every revision of one (or every) configuration,
+        priced in one vectorized pass with the current machine and chemical
+        specs.
+        """
+        states = ConfigurationRevisionRepository.get_states(config_id)
+        requests = [CostCalculationRequest.model_validate(state) for _, _, _, state in states]
+        return [
+            RevisionCost(
+                configuration_id=state_id,
+                revision=revision,
+                created_at=created_at,
+                breakdown=breakdown,
+            )
+            for (state_id, revision, created_at, _), breakdown
+            in zip(states, cls.calculate_batch(requests))
+        ]
+    
+    @classmethod
+    def build_kernel_inputs(cls, requests: List[CostCalculationRequest]) -> Dict[str, List[float]]:
+        """
+        Build kernel input columns (one entry per request) for the cost kernel.
+        Each referenced machine and chemical is looked up once (from CatalogCache),
+        with one lookup per table for the single machine IDs and fleets together.
+        Mixed fleets are collapsed to their equivalent specs in one vectorized pass.
+        """
+        machines = cls._get_machines(requests)
+        chemicals = cls._index_by_id(ChemicalRepository.get_by_ids(
+            [cid for r in requests for cid in r.chemical_ids]
+        ))
         
-        monthly_labor_hours = washing_labor_hours + drying_labor_hours + ironing_hours
-        monthly_labor_cost = monthly_labor_hours * data.labor_rate
+        rows = [
+            {
+                **cls._request_inputs(r),
+                **spec_inputs(
+                    *(machines[kind].get(machine_id) for kind, machine_id in cls._single_machines(r)),
+                    [chemicals[cid] for cid in dict.fromkeys(r.chemical_ids) if cid in chemicals],
+                ),
+            }
+            for r in requests
+        ]
+        columns = {name: [row[name] for row in rows] for name in KERNEL_INPUTS}
         
-        # Transport costs
-        monthly_transport_cost = 0.0
-        if data.transport_enabled:
-            if data.transport_mode == "fixed":
-                monthly_transport_cost = data.transport_fixed_cost
-            else:  # calculated
-                fuel_cost = data.transport_distance_km * data.transport_fuel_rate
-                labor_cost = data.transport_time_hours * data.transport_labor_rate
-                monthly_transport_cost = fuel_cost + labor_cost
+        fleet = cls._fleet_entries(requests, machines)
+        if fleet["scenario"]:
+            by_efficiency = [r.fleet_allocation == "efficiency" for r in requests]
+            for name, column in fleet_spec_inputs(columns, fleet, by_efficiency).items():
+                columns[name] = column.tolist()
+        return columns
+    
+    @classmethod
+    def collapse_varied_fleet(cls, data: CostCalculationRequest, inputs: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Kernel inputs of one request whose fields have been replaced by
+        arrays (sweeps, simulations, sensitivities, projections), with its
+        fleet collapsed again for every combination of the varied prices.
+        Capacity shares do not depend on prices or loads, but efficiency
+        shares do, so only fleets allocated by efficiency are redone.
+        """
+        varied = {
+            name: np.asarray(inputs[name], dtype=float)
+            for name in FLEET_PRICE_INPUTS if np.ndim(inputs[name]) > 0
+        }
+        if not data.machines or data.fleet_allocation != "efficiency" or not varied:
+            return inputs
         
-        # Totals
-        total_monthly_cost = (
-            monthly_electricity_cost + 
-            monthly_water_cost + 
-            monthly_chemical_cost + 
-            monthly_labor_cost + 
-            monthly_transport_cost
+        shape = np.broadcast_shapes(*(values.shape for values in varied.values()))
+        points = int(np.prod(shape))
+        fleet = {
+            name: np.tile(column, points)
+            for name, column in cls._fleet_entries([data], cls._get_machines([data])).items()
+        }
+        fleet["scenario"] = np.repeat(np.arange(points), len(data.machines))
+        flat = {name: np.broadcast_to(values, shape).ravel() for name, values in varied.items()}
+        specs = fleet_spec_inputs({**inputs, **flat}, fleet, np.ones(points, dtype=bool))
+        return {**inputs, **{name: column.reshape(shape) for name, column in specs.items()}}
+    
+    @staticmethod
+    def to_breakdowns(results: Dict[str, Any]) -> List[CostBreakdown]:
+        """Round kernel output arrays and convert them to CostBreakdown objects."""
+        return [CostBreakdown(**row) for row in round_breakdowns(results)]
+    
+    @classmethod
+    def _request_inputs(cls, data: CostCalculationRequest) -> Dict[str, float]:
+        """Kernel inputs taken from the request itself (rates, volumes, flags)."""
+        inputs = {field: getattr(data, field) for field in REQUEST_KERNEL_FIELDS}
+        # Apply season multiplier (affects both utilities)
+        inputs["season_multiplier"] = cls._get_season_multiplier(data.season)
+        inputs["transport_enabled"] = data.transport_enabled
+        inputs["transport_fixed"] = data.transport_mode == "fixed"
+        return inputs
+    
+    @staticmethod
+    def _catalog_versions(data: CostCalculationRequest) -> Tuple[Any, ...]:
+        """Entry versions of every machine and chemical the request references."""
+        return (
+            CatalogCache.entry_version("washing_machines", data.washing_machine_id),
+            CatalogCache.entry_version("drying_machines", data.drying_machine_id),
+            CatalogCache.entry_version("ironing_machines", data.ironing_machine_id),
+            tuple(
+                CatalogCache.entry_version("chemicals", cid)
+                for cid in dict.fromkeys(data.chemical_ids)
+            ),
+            tuple(
+                CatalogCache.entry_version(FLEET_KINDS[machine.kind][0].table_name, machine.machine_id)
+                for machine in data.machines
+            ),
         )
-        
-        # Per-unit calculations
-        cost_per_kg = total_monthly_cost / total_kg_processed if total_kg_processed > 0 else 0
-        electricity_cost_per_kg = monthly_electricity_cost / total_kg_processed if total_kg_processed > 0 else 0
-        water_cost_per_kg = monthly_water_cost / total_kg_processed if total_kg_processed > 0 else 0
-        chemical_cost_per_kg = monthly_chemical_cost / total_kg_processed if total_kg_processed > 0 else 0
-        labor_cost_per_kg = monthly_labor_cost / total_kg_processed if total_kg_processed > 0 else 0
-        transport_cost_per_kg = monthly_transport_cost / total_kg_processed if total_kg_processed > 0 else 0
-        cost_per_cycle = total_monthly_cost / cycles if cycles > 0 else 0
-        
-        return CostBreakdown(
-            cost_per_kg=round(cost_per_kg, 4),
-            electricity_cost_per_kg=round(electricity_cost_per_kg, 4),
-            water_cost_per_kg=round(water_cost_per_kg, 4),
-            chemical_cost_per_kg=round(chemical_cost_per_kg, 4),
-            labor_cost_per_kg=round(labor_cost_per_kg, 4),
-            transport_cost_per_kg=round(transport_cost_per_kg, 4),
-            monthly_electricity_kwh=round(monthly_electricity_kwh, 2),
-            monthly_electricity_cost=round(monthly_electricity_cost, 2),
-            monthly_water_m3=round(monthly_water_m3, 2),
-            monthly_water_cost=round(monthly_water_cost, 2),
-            monthly_chemical_cost=round(monthly_chemical_cost, 2),
-            monthly_labor_hours=round(monthly_labor_hours, 2),
-            monthly_labor_cost=round(monthly_labor_cost, 2),
-            monthly_ironing_hours=round(ironing_hours, 2),
-            monthly_transport_cost=round(monthly_transport_cost, 2),
-            total_monthly_cost=round(total_monthly_cost, 2),
-            total_kg_processed=round(total_kg_processed, 2),
-            cost_per_cycle=round(cost_per_cycle, 2),
+    
+    @staticmethod
+    def _single_machines(data: CostCalculationRequest) -> Tuple[Tuple[str, Optional[str]], ...]:
+        """(kind, machine ID) of the request's single machine per stage, in FLEET_STAGES order."""
+        return (
+            ("washing", data.washing_machine_id),
+            ("drying", data.drying_machine_id),
+            ("ironing", data.ironing_machine_id),
         )
     
+    @classmethod
+    def _get_machines(cls, requests: List[CostCalculationRequest]) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """Machines per kind and ID referenced by the requests, singly or in fleets."""
+        machine_ids: Dict[str, List[str]] = {kind: [] for kind in FLEET_KINDS}
+        for r in requests:
+            for kind, machine_id in cls._single_machines(r):
+                if machine_id:
+                    machine_ids[kind].append(machine_id)
+            for machine in r.machines:
+                machine_ids[machine.kind].append(machine.machine_id)
+        return {
+            kind: cls._index_by_id(repository.get_by_ids(machine_ids[kind]))
+            for kind, (repository, _) in FLEET_KINDS.items()
+        }
+    
+    @staticmethod
+    def _fleet_entries(
+        requests: List[CostCalculationRequest], machines: Dict[str, Dict[str, Dict[str, Any]]]
+    ) -> Dict[str, List[float]]:
+        """
+        Flat fleet entry columns of the requests for fleet_spec_inputs.
+        Unknown machines stay in their fleet without capacity, as if missing.
+        """
+        fleet: Dict[str, List[float]] = {
+            "scenario": [], "stage": [], "quantity": [],
+            "capacity_kg": [], "water_consumption_l": [], "energy_kwh": [],
+        }
+        for index, r in enumerate(requests):
+            for machine in r.machines:
+                spec = machines[machine.kind].get(machine.machine_id, {})
+                fleet["scenario"].append(index)
+                fleet["stage"].append(FLEET_STAGES.index(machine.kind))
+                fleet["quantity"].append(machine.quantity)
+                fleet["capacity_kg"].append(spec.get('capacity_kg', 0.0))
+                fleet["water_consumption_l"].append(spec.get('water_consumption_l', 0.0))
+                fleet["energy_kwh"].append(spec.get(FLEET_KINDS[machine.kind][1], 0.0))
+        return fleet
+    
+    @staticmethod
+    def _index_by_id(records: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """Index database records by their ID."""
+        return {record['id']: record for record in records}
+    
     @staticmethod
     def _get_season_multiplier(season: str) -> float:
         """Get cost multiplier based on season."""
@@ -170,50 +297,3 @@ class CostCalculatorService:
         elif season == "summer":
             return 1  # 5% lower in summer
         return 1.0
-    
-    @staticmethod
-    def _get_washing_machine(machine_id: Optional[str]) -> Optional[Dict[str, Any]]:
-        """Get washing machine by ID."""
-        if not machine_id:
-            return None
-        with get_db() as conn:
-            cursor = conn.cursor()
-            cursor.execute("SELECT * FROM washing_machines WHERE id = ?", (machine_id,))
-            row = cursor.fetchone()
-            return dict(row) if row else None
-    
-    @staticmethod
-    def _get_drying_machine(machine_id: Optional[str]) -> Optional[Dict[str, Any]]:
-        """Get drying machine by ID."""
-        if not machine_id:
-            return None
-        with get_db() as conn:
-            cursor = conn.cursor()
-            cursor.execute("SELECT * FROM drying_machines WHERE id = ?", (machine_id,))
-            row = cursor.fetchone()
-            return dict(row) if row else None
-    
-    @staticmethod
-    def _get_ironing_machine(machine_id: Optional[str]) -> Optional[Dict[str, Any]]:
-        """Get ironing machine by ID."""
-        if not machine_id:
-            return None
-        with get_db() as conn:
-            cursor = conn.cursor()
-            cursor.execute("SELECT * FROM ironing_machines WHERE id = ?", (machine_id,))
-            row = cursor.fetchone()
-            return dict(row) if row else None
-    
-    @staticmethod
-    def _get_chemicals(chemical_ids: List[str]) -> List[Dict[str, Any]]:
-        """Get chemicals by IDs."""
-        if not chemical_ids:
-            return []
-        with get_db() as conn:
-            cursor = conn.cursor()
-            placeholders = ','.join('?' * len(chemical_ids))
-            cursor.execute(
-                f"SELECT * FROM chemicals WHERE id IN ({placeholders})",
-                chemical_ids
-            )
-            return [dict(row) for row in cursor.fetchall()]
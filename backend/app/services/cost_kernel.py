@@ -0,0 +1,344 @@
+"""
+Cost kernel - the pure cost formulas, free of database and HTTP concerns.
+
+Every input is a scalar or a NumPy array (or anything broadcastable to one),
+so the same formulas price a single scenario or thousands of them in one pass.
+Machine and chemical specs are plain dicts shaped like the database rows.
+"""
+from typing import Any, Dict, Iterable, List, Mapping, Optional
+
+import numpy as np
+
+
+# Labor costs - actual manual work only (not machine running time)
+# Washing: 2.5 min loading + 2.5 min unloading = 5 min per cycle
+# Drying: 2.5 min loading + 2.5 min unloading = 5 min per cycle
+MANUAL_TIME_PER_WASHING_CYCLE = 5.0  # minutes
+MANUAL_TIME_PER_DRYING_CYCLE = 5.0   # minutes
+
+# Stages of a mixed fleet (the kinds of FleetMachine)
+FLEET_STAGES = ("washing", "drying", "ironing")
+
+# Inputs fleet_spec_inputs prices fleet models with (efficiency allocation)
+FLEET_PRICE_INPUTS = (
+    "electricity_rate", "water_rate", "labor_rate",
+    "electricity_tariff_price", "water_tariff_price", "season_multiplier",
+    "chemical_cost_per_cycle", "washing_load_percentage", "drying_load_percentage",
+)
+
+# Kernel inputs and their defaults. Machine/chemical specs default to zero,
+# which prices exactly like a scenario without that machine or chemical.
+KERNEL_INPUTS: Dict[str, float] = {
+    # Request fields
+    "electricity_rate": 0.0,
+    "water_rate": 0.0,
+    "labor_rate": 0.0,
+    "electricity_tariff_price": 1.0,
+    "water_tariff_price": 1.0,
+    "cycles_per_month": 0.0,
+    "washing_load_percentage": 80.0,
+    "drying_load_percentage": 80.0,
+    "ironing_labor_hours": 10.0,
+    "operational_volume": 0.0,
+    "transport_enabled": 0.0,
+    "transport_fixed": 1.0,
+    "transport_fixed_cost": 0.0,
+    "transport_distance_km": 0.0,
+    "transport_time_hours": 0.0,
+    "transport_labor_rate": 0.0,
+    "transport_fuel_rate": 0.0,
+    "season_multiplier": 1.0,
+    # Machine and chemical specs
+    "washing_capacity_kg": 0.0,
+    "washing_water_consumption_l": 0.0,
+    "washing_energy_consumption_kwh": 0.0,
+    "drying_capacity_kg": 0.0,
+    "drying_energy_consumption_kwh_per_cycle": 0.0,
+    "ironing_energy_consumption_kwh_per_hour": 0.0,
+    "chemical_cost_per_cycle": 0.0,
+}
+
+# CostBreakdown fields produced by the kernel, with their rounding precision.
+BREAKDOWN_DECIMALS: Dict[str, int] = {
+    "cost_per_kg": 4,
+    "electricity_cost_per_kg": 4,
+    "water_cost_per_kg": 4,
+    "chemical_cost_per_kg": 4,
+    "labor_cost_per_kg": 4,
+    "transport_cost_per_kg": 4,
+    "monthly_electricity_kwh": 2,
+    "monthly_electricity_cost": 2,
+    "monthly_water_m3": 2,
+    "monthly_water_cost": 2,
+    "monthly_chemical_cost": 2,
+    "monthly_labor_hours": 2,
+    "monthly_labor_cost": 2,
+    "monthly_ironing_hours": 2,
+    "monthly_transport_cost": 2,
+    "total_monthly_cost": 2,
+    "total_kg_processed": 2,
+    "cost_per_cycle": 2,
+}
+
+
+def chemical_cost_per_cycle(chemical: Mapping[str, Any]) -> float:
+    """Cost of one chemical per wash cycle."""
+    return (chemical['package_price'] / chemical['package_amount']) * chemical['usage_per_cycle']
+
+
+def spec_inputs(
+    washing_machine: Optional[Mapping[str, Any]] = None,
+    drying_machine: Optional[Mapping[str, Any]] = None,
+    ironing_machine: Optional[Mapping[str, Any]] = None,
+    chemicals: Iterable[Mapping[str, Any]] = (),
+) -> Dict[str, float]:
+    """
+    Kernel inputs for one set of machine and chemical specs.
+    A missing machine contributes zeros, i.e. no consumption and no capacity.
+    """
+    washing_machine = washing_machine or {}
+    drying_machine = drying_machine or {}
+    ironing_machine = ironing_machine or {}
+    return {
+        "washing_capacity_kg": washing_machine.get('capacity_kg', 0.0),
+        "washing_water_consumption_l": washing_machine.get('water_consumption_l', 0.0),
+        "washing_energy_consumption_kwh": washing_machine.get('energy_consumption_kwh', 0.0),
+        "drying_capacity_kg": drying_machine.get('capacity_kg', 0.0),
+        "drying_energy_consumption_kwh_per_cycle": drying_machine.get(
+            'energy_consumption_kwh_per_cycle', 0.0
+        ),
+        "ironing_energy_consumption_kwh_per_hour": ironing_machine.get(
+            'energy_consumption_kwh_per_hour', 0.0
+        ),
+        "chemical_cost_per_cycle": sum(chemical_cost_per_cycle(chem) for chem in chemicals),
+    }
+
+
+def fleet_spec_inputs(
+    inputs: Mapping[str, object],
+    fleet: Mapping[str, np.ndarray],
+    by_efficiency: np.ndarray,
+) -> Dict[str, np.ndarray]:
+    """
+    Machine spec inputs of mixed fleets, one value per scenario.
+    
+    ``inputs`` holds 1-d kernel input columns, ``by_efficiency`` one flag
+    per scenario. ``fleet`` holds one entry per machine model in a fleet:
+    its scenario index, stage (FLEET_STAGES index), quantity, capacity_kg,
+    water_consumption_l and energy_kwh (per cycle, per hour for ironers).
+    
+    Each stage's volume is shared in proportion to quantity x effective
+    capacity, so every unit runs the same number of cycles; by efficiency
+    that share is also weighted by the cheapest variable cost per kg in
+    the stage over the model's own (energy, water, chemicals and handling
+    labor at the scenario's rates). Ironing hours are shared per ironer.
+    The fleet then collapses to the cycle-weighted average machine, which
+    prices exactly like the fleet. Stages without entries keep their specs
+    from ``inputs``; a stage whose models have no capacity prices like a
+    stage without a machine.
+    """
+    x = {name: np.asarray(inputs.get(name, KERNEL_INPUTS[name]), dtype=float) for name in KERNEL_INPUTS}
+    scenarios = len(by_efficiency)
+    scenario = np.asarray(fleet["scenario"], dtype=np.intp)
+    stage = np.asarray(fleet["stage"], dtype=np.intp)
+    group = scenario * len(FLEET_STAGES) + stage
+    groups = scenarios * len(FLEET_STAGES)
+    
+    def column(name: str) -> np.ndarray:
+        """Scenario input broadcast to the fleet entries."""
+        return np.broadcast_to(x[name], (scenarios,))[scenario]
+    
+    def per_group(values: np.ndarray) -> np.ndarray:
+        """Sum of entry values per scenario and stage."""
+        return np.bincount(group, weights=values, minlength=groups)
+    
+    capacity = np.asarray(fleet["capacity_kg"], dtype=float)
+    water_l = np.asarray(fleet["water_consumption_l"], dtype=float)
+    energy = np.asarray(fleet["energy_kwh"], dtype=float)
+    washing = stage == FLEET_STAGES.index("washing")
+    ironing = stage == FLEET_STAGES.index("ironing")
+    load = np.where(washing, column("washing_load_percentage"), column("drying_load_percentage")) / 100
+    effective_capacity = np.where(ironing, 1.0, capacity * load)
+    
+    # Variable cost of one cycle (one hour for ironers)
+    season = column("season_multiplier")
+    electricity_price = column("electricity_rate") * season * np.where(
+        column("electricity_tariff_price") != 0, column("electricity_tariff_price"), 1.0
+    )
+    water_price = column("water_rate") * season * np.where(
+        column("water_tariff_price") != 0, column("water_tariff_price"), 1.0
+    )
+    handling = column("labor_rate") * np.where(
+        washing, MANUAL_TIME_PER_WASHING_CYCLE, MANUAL_TIME_PER_DRYING_CYCLE
+    ) / 60
+    cycle_cost = (
+        energy * electricity_price + water_l / 1000 * water_price +
+        np.where(ironing, 0.0, handling) + np.where(washing, column("chemical_cost_per_cycle"), 0.0)
+    )
+    cost_per_kg = _safe_divide(cycle_cost, effective_capacity)
+    cheapest = np.full(groups, np.inf)
+    priced = cost_per_kg > 0
+    np.minimum.at(cheapest, group[priced], cost_per_kg[priced])
+    efficiency = np.where(priced, _safe_divide(cheapest[group], cost_per_kg), 1.0)
+    
+    weight = np.asarray(fleet["quantity"], dtype=float) * effective_capacity * np.where(
+        np.asarray(by_efficiency, dtype=bool)[scenario], efficiency, 1.0
+    )
+    kg_share = _safe_divide(weight, per_group(weight)[group])
+    cycles_per_kg = _safe_divide(kg_share, effective_capacity)
+    cycle_share = _safe_divide(cycles_per_kg, per_group(cycles_per_kg)[group])
+    
+    def average(values: np.ndarray) -> np.ndarray:
+        """Cycle-weighted average per scenario (rows) and stage (columns)."""
+        return per_group(cycle_share * values).reshape(scenarios, len(FLEET_STAGES))
+    
+    present = np.bincount(group, minlength=groups).reshape(scenarios, len(FLEET_STAGES)) > 0
+    capacity_kg, water, energy_kwh = average(capacity), average(water_l), average(energy)
+    specs = {
+        "washing_capacity_kg": (0, capacity_kg),
+        "washing_water_consumption_l": (0, water),
+        "washing_energy_consumption_kwh": (0, energy_kwh),
+        "drying_capacity_kg": (1, capacity_kg),
+        "drying_energy_consumption_kwh_per_cycle": (1, energy_kwh),
+        "ironing_energy_consumption_kwh_per_hour": (2, energy_kwh),
+    }
+    return {
+        name: np.where(present[:, index], values[:, index], np.broadcast_to(x[name], (scenarios,)))
+        for name, (index, values) in specs.items()
+    }
+
+
+def _safe_divide(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    """Element-wise division returning 0 where the denominator is not positive."""
+    numerator, denominator = np.broadcast_arrays(numerator, denominator)
+    out = np.zeros(numerator.shape, dtype=float)
+    np.divide(numerator, denominator, out=out, where=denominator > 0)
+    return out
+
+
+def compute_costs(inputs: Mapping[str, object]) -> Dict[str, np.ndarray]:
+    """
+    Evaluate the cost model for every scenario in ``inputs``.
+    
+    ``inputs`` maps names from KERNEL_INPUTS to scalars or arrays; missing
+    names take their default. Arrays are broadcast against each other and
+    every returned array (keyed like CostBreakdown, unrounded) has the
+    broadcast shape - a 0-d array when all inputs are scalars.
+    """
+    x = {
+        name: np.asarray(inputs.get(name, default), dtype=float)
+        for name, default in KERNEL_INPUTS.items()
+    }
+    cycles = x["cycles_per_month"]
+    season_multiplier = x["season_multiplier"]
+    
+    # Custom tariff price multipliers; 0 means "not set" (same as `or 1.0`)
+    electricity_tariff_multiplier = np.where(
+        x["electricity_tariff_price"] != 0, x["electricity_tariff_price"], 1.0
+    )
+    water_tariff_multiplier = np.where(
+        x["water_tariff_price"] != 0, x["water_tariff_price"], 1.0
+    )
+    
+    # Washing
+    monthly_water_m3 = x["washing_water_consumption_l"] / 1000 * cycles
+    monthly_washing_kwh = x["washing_energy_consumption_kwh"] * cycles
+    effective_capacity = x["washing_capacity_kg"] * (x["washing_load_percentage"] / 100)
+    total_kg_processed = np.where(
+        x["operational_volume"] > 0,
+        x["operational_volume"],
+        effective_capacity * cycles,
+    )
+    
+    # Drying
+    effective_drying_capacity = (
+        x["drying_capacity_kg"] * (x["drying_load_percentage"] / 100)
+    )
+    drying_cycles = _safe_divide(total_kg_processed, effective_drying_capacity)
+    monthly_drying_kwh = x["drying_energy_consumption_kwh_per_cycle"] * drying_cycles
+    
+    # Ironing
+    ironing_hours = x["ironing_labor_hours"]
+    monthly_ironing_kwh = x["ironing_energy_consumption_kwh_per_hour"] * ironing_hours
+    
+    monthly_electricity_kwh = monthly_washing_kwh + monthly_drying_kwh + monthly_ironing_kwh
+    
+    monthly_water_cost = (
+        monthly_water_m3 * x["water_rate"] *
+        season_multiplier * water_tariff_multiplier
+    )
+    monthly_electricity_cost = (
+        monthly_electricity_kwh * x["electricity_rate"] *
+        season_multiplier * electricity_tariff_multiplier
+    )
+    monthly_chemical_cost = x["chemical_cost_per_cycle"] * cycles
+    
+    # Labor
+    washing_labor_hours = (cycles * MANUAL_TIME_PER_WASHING_CYCLE) / 60
+    drying_labor_hours = np.where(
+        total_kg_processed > 0,
+        (drying_cycles * MANUAL_TIME_PER_DRYING_CYCLE) / 60,
+        0.0,
+    )
+    monthly_labor_hours = washing_labor_hours + drying_labor_hours + ironing_hours
+    monthly_labor_cost = monthly_labor_hours * x["labor_rate"]
+    
+    # Transport
+    calculated_transport_cost = (
+        x["transport_distance_km"] * x["transport_fuel_rate"] +
+        x["transport_time_hours"] * x["transport_labor_rate"]
+    )
+    monthly_transport_cost = np.where(
+        x["transport_enabled"] != 0,
+        np.where(x["transport_fixed"] != 0, x["transport_fixed_cost"], calculated_transport_cost),
+        0.0,
+    )
+    
+    total_monthly_cost = (
+        monthly_electricity_cost +
+        monthly_water_cost +
+        monthly_chemical_cost +
+        monthly_labor_cost +
+        monthly_transport_cost
+    )
+    
+    results = {
+        "cost_per_kg": _safe_divide(total_monthly_cost, total_kg_processed),
+        "electricity_cost_per_kg": _safe_divide(monthly_electricity_cost, total_kg_processed),
+        "water_cost_per_kg": _safe_divide(monthly_water_cost, total_kg_processed),
+        "chemical_cost_per_kg": _safe_divide(monthly_chemical_cost, total_kg_processed),
+        "labor_cost_per_kg": _safe_divide(monthly_labor_cost, total_kg_processed),
+        "transport_cost_per_kg": _safe_divide(monthly_transport_cost, total_kg_processed),
+        "monthly_electricity_kwh": monthly_electricity_kwh,
+        "monthly_electricity_cost": monthly_electricity_cost,
+        "monthly_water_m3": monthly_water_m3,
+        "monthly_water_cost": monthly_water_cost,
+        "monthly_chemical_cost": monthly_chemical_cost,
+        "monthly_labor_hours": monthly_labor_hours,
+        "monthly_labor_cost": monthly_labor_cost,
+        "monthly_ironing_hours": ironing_hours,
+        "monthly_transport_cost": monthly_transport_cost,
+        "total_monthly_cost": total_monthly_cost,
+        "total_kg_processed": total_kg_processed,
+        "cost_per_cycle": _safe_divide(total_monthly_cost, cycles),
+    }
+    shape = np.broadcast_shapes(*(value.shape for value in results.values()))
+    return {name: np.broadcast_to(value, shape) for name, value in results.items()}
+
+
+def round_columns(results: Mapping[str, np.ndarray]) -> Dict[str, List[float]]:
+    """
+    Round kernel results like CostBreakdown, one flat list per field.
+    Uses Python's round() so scalar and array callers get identical values.
+    """
+    return {
+        name: [round(value, decimals) for value in np.ravel(results[name]).tolist()]
+        for name, decimals in BREAKDOWN_DECIMALS.items()
+    }
+
+
+def round_breakdowns(results: Mapping[str, np.ndarray]) -> Iterable[Dict[str, float]]:
+    """Round kernel results like CostBreakdown and yield one dict per scenario."""
+    columns = round_columns(results)
+    for row in zip(*columns.values()):
+        yield dict(zip(columns, row))
@@ -0,0 +1,109 @@
+"""
+Cost projection service - prices a configuration month by month over a horizon.
+"""
+from typing import Dict, List
+
+import numpy as np
+
+from ..config import settings
+from ..models import CostProjectionRequest, CostProjectionResult, ProjectionMonth, ProjectionTotals
+from .cost_calculator import CostCalculatorService, REQUEST_KERNEL_FIELDS
+from .cost_kernel import compute_costs
+
+# Season of each calendar month, January first
+SEASON_BY_MONTH = (
+    "winter", "winter", "spring", "spring", "spring", "summer",
+    "summer", "summer", "autumn", "autumn", "autumn", "winter",
+)
+
+# ProjectionTotals fields and the kernel output summed into each
+TOTAL_FIELDS = {
+    "electricity_kwh": "monthly_electricity_kwh",
+    "electricity_cost": "monthly_electricity_cost",
+    "water_m3": "monthly_water_m3",
+    "water_cost": "monthly_water_cost",
+    "chemical_cost": "monthly_chemical_cost",
+    "labor_hours": "monthly_labor_hours",
+    "labor_cost": "monthly_labor_cost",
+    "ironing_hours": "monthly_ironing_hours",
+    "transport_cost": "monthly_transport_cost",
+    "total_cost": "total_monthly_cost",
+    "total_kg_processed": "total_kg_processed",
+}
+
+
+class CostProjectionService:
+    """
+    Service for multi-month cost projections.
+    Every profiled field and the season multiplier become arrays over the
+    horizon, so all months are priced in a single pass of the cost kernel.
+    """
+    
+    @classmethod
+    def run(cls, data: CostProjectionRequest) -> CostProjectionResult:
+        """
+        Price every month of the horizon and sum the totals.
+        Raises ValueError for bad start months, horizons or profiles.
+        """
+        if not 1 <= data.months <= settings.PROJECTION_MAX_MONTHS:
+            raise ValueError(f"months must be between 1 and {settings.PROJECTION_MAX_MONTHS}")
+        try:
+            first = np.datetime64(data.start[:7], "M")
+        except ValueError:
+            raise ValueError(f"Invalid start month: {data.start}")
+        months = first + np.arange(data.months)
+        calendar_months = months.astype(int) % 12
+        
+        inputs = {
+            name: column[0]
+            for name, column in CostCalculatorService.build_kernel_inputs([data.base]).items()
+        }
+        inputs.update(cls._profile_inputs(data.profiles, data.months, calendar_months))
+        seasons = [SEASON_BY_MONTH[month] for month in calendar_months]
+        multipliers = np.array([data.season_multipliers.get(season, 1.0) for season in seasons])
+        inputs["season_multiplier"] = multipliers
+        
+        results = compute_costs(CostCalculatorService.collapse_varied_fleet(data.base, inputs))
+        breakdowns = CostCalculatorService.to_breakdowns(results)
+        
+        totals = {name: float(results[output].sum()) for name, output in TOTAL_FIELDS.items()}
+        cost_per_kg = (
+            totals["total_cost"] / totals["total_kg_processed"]
+            if totals["total_kg_processed"] > 0 else 0.0
+        )
+        return CostProjectionResult(
+            months=[
+                ProjectionMonth(
+                    month=str(month),
+                    season=season,
+                    season_multiplier=float(multiplier),
+                    breakdown=breakdown,
+                )
+                for month, season, multiplier, breakdown
+                in zip(months, seasons, multipliers, breakdowns)
+            ],
+            totals=ProjectionTotals(
+                **{name: round(value, 2) for name, value in totals.items()},
+                cost_per_kg=round(cost_per_kg, 4),
+            ),
+        )
+    
+    @staticmethod
+    def _profile_inputs(
+        profiles: Dict[str, List[float]], months: int, calendar_months: np.ndarray
+    ) -> Dict[str, np.ndarray]:
+        """Per-month kernel input arrays of the profiled fields."""
+        inputs = {}
+        for field, values in profiles.items():
+            if field not in REQUEST_KERNEL_FIELDS:
+                raise ValueError(f"Field '{field}' cannot be profiled")
+            values = np.asarray(values, dtype=float)
+            if values.size == months:
+                inputs[field] = values
+            elif values.size == 12:
+                inputs[field] = values[calendar_months]
+            else:
+                raise ValueError(
+                    f"Profile for '{field}' needs {months} monthly or 12 calendar-month values"
+                )
+        return inputs
@@ -0,0 +1,94 @@
+"""
+Cost sensitivity service - elasticities of cost per kg for tornado charts.
+"""
+import numpy as np
+
+from ..models import CostSensitivityRequest, CostSensitivityResult, SensitivityEntry
+from .cost_calculator import CostCalculatorService, REQUEST_KERNEL_FIELDS
+from .cost_kernel import compute_costs
+
+# Outputs whose elasticities are reported
+SENSITIVITY_OUTPUTS = (
+    "cost_per_kg",
+    "electricity_cost_per_kg",
+    "water_cost_per_kg",
+    "chemical_cost_per_kg",
+    "labor_cost_per_kg",
+    "transport_cost_per_kg",
+)
+
+
+class CostSensitivityService:
+    """
+    Service for one-at-a-time sensitivity analysis.
+    The baseline and every low/high perturbation are stacked into a single
+    array of 1 + 2 * len(fields) scenarios and priced in one kernel pass.
+    """
+    
+    @classmethod
+    def run(cls, data: CostSensitivityRequest) -> CostSensitivityResult:
+        """
+        Perturb each field by +/- perturbation_percentage and report elasticities.
+        Raises ValueError for unknown fields or an out-of-range perturbation.
+        """
+        fields = data.fields if data.fields is not None else list(REQUEST_KERNEL_FIELDS)
+        for field in fields:
+            if field not in REQUEST_KERNEL_FIELDS:
+                raise ValueError(f"Field '{field}' cannot be perturbed")
+        if len(set(fields)) != len(fields):
+            raise ValueError("Fields must not repeat")
+        if not 0 < data.perturbation_percentage < 100:
+            raise ValueError("perturbation_percentage must be between 0 and 100 (exclusive)")
+        
+        step = data.perturbation_percentage / 100
+        inputs = {
+            name: column[0]
+            for name, column in CostCalculatorService.build_kernel_inputs([data.base]).items()
+        }
+        base_values = {field: float(inputs[field]) for field in fields}
+        
+        # Row 0 is the baseline, rows 2i+1 / 2i+2 move field i down / up
+        scenarios = 1 + 2 * len(fields)
+        for i, field in enumerate(fields):
+            column = np.full(scenarios, base_values[field])
+            column[2 * i + 1] = base_values[field] * (1 - step)
+            column[2 * i + 2] = base_values[field] * (1 + step)
+            inputs[field] = column
+        
+        results = compute_costs(CostCalculatorService.collapse_varied_fleet(data.base, inputs))
+        base = CostCalculatorService.to_breakdowns(
+            {name: values[:1] for name, values in results.items()}
+        )[0]
+        
+        elasticities = {}
+        for output in SENSITIVITY_OUTPUTS:
+            values = np.broadcast_to(results[output], (scenarios,))
+            baseline, low, high = values[0], values[1::2], values[2::2]
+            if baseline != 0:
+                elasticities[output] = (high - low) / (2 * step * baseline)
+            else:
+                elasticities[output] = np.zeros(len(fields))
+        
+        cost_per_kg = np.broadcast_to(results["cost_per_kg"], (scenarios,))
+        entries = [
+            SensitivityEntry(
+                field=field,
+                base_value=base_values[field],
+                low_value=base_values[field] * (1 - step),
+                high_value=base_values[field] * (1 + step),
+                low_cost_per_kg=round(float(cost_per_kg[2 * i + 1]), 4),
+                high_cost_per_kg=round(float(cost_per_kg[2 * i + 2]), 4),
+                elasticities={
+                    output: round(float(elasticities[output][i]), 4)
+                    for output in SENSITIVITY_OUTPUTS
+                },
+            )
+            for i, field in enumerate(fields)
+        ]
+        entries.sort(key=lambda entry: abs(entry.elasticities["cost_per_kg"]), reverse=True)
+        
+        return CostSensitivityResult(
+            perturbation_percentage=data.perturbation_percentage,
+            base=base,
+            entries=entries,
+        )
@@ -0,0 +1,99 @@
+"""
+Cost simulation service - Monte Carlo uncertainty analysis of monthly cost.
+"""
+from typing import Dict, List
+
+import numpy as np
+
+from ..config import settings
+from ..models import (
+    CostSimulationRequest, CostSimulationResult, InputDistribution, SimulationSummary,
+)
+from .cost_calculator import CostCalculatorService, REQUEST_KERNEL_FIELDS
+from .cost_kernel import compute_costs
+
+
+class CostSimulationService:
+    """
+    Service for Monte Carlo cost simulations.
+    All samples are drawn and priced as arrays in one kernel pass.
+    """
+    
+    @classmethod
+    def run(cls, data: CostSimulationRequest) -> CostSimulationResult:
+        """
+        Sample the uncertain inputs and summarize the resulting cost distribution.
+        Raises ValueError for invalid distributions or sample counts.
+        """
+        if not 1 <= data.samples <= settings.SIMULATION_MAX_SAMPLES:
+            raise ValueError(
+                f"samples must be between 1 and {settings.SIMULATION_MAX_SAMPLES}"
+            )
+        if any(not 0 <= p <= 100 for p in data.percentiles):
+            raise ValueError("percentiles must be between 0 and 100")
+        
+        seed = data.seed if data.seed is not None else int(np.random.SeedSequence().entropy % 2**63)
+        rng = np.random.default_rng(seed)
+        
+        inputs = {
+            name: column[0]
+            for name, column in CostCalculatorService.build_kernel_inputs([data.base]).items()
+        }
+        seen = set()
+        for distribution in data.distributions:
+            if distribution.field in seen:
+                raise ValueError(f"Field '{distribution.field}' has more than one distribution")
+            seen.add(distribution.field)
+            inputs[distribution.field] = cls._sample(rng, distribution, data.samples)
+        
+        results = compute_costs(CostCalculatorService.collapse_varied_fleet(data.base, inputs))
+        return CostSimulationResult(
+            samples=data.samples,
+            seed=seed,
+            total_monthly_cost=cls._summarize(results["total_monthly_cost"], data.percentiles),
+            cost_per_kg=cls._summarize(results["cost_per_kg"], data.percentiles),
+        )
+    
+    @staticmethod
+    def _sample(rng: np.random.Generator, distribution: InputDistribution, size: int) -> np.ndarray:
+        """Draw samples for one input field."""
+        field = distribution.field
+        if field not in REQUEST_KERNEL_FIELDS:
+            raise ValueError(f"Field '{field}' cannot be simulated")
+        
+        kind = distribution.distribution
+        if kind == "normal":
+            if distribution.mean is None or distribution.std is None or distribution.std < 0:
+                raise ValueError(f"Normal distribution for '{field}' needs mean and std >= 0")
+            samples = rng.normal(distribution.mean, distribution.std, size)
+        elif kind == "uniform":
+            if distribution.low is None or distribution.high is None or distribution.low > distribution.high:
+                raise ValueError(f"Uniform distribution for '{field}' needs low <= high")
+            samples = rng.uniform(distribution.low, distribution.high, size)
+        elif kind == "triangular":
+            low, mode, high = distribution.low, distribution.mode, distribution.high
+            if low is None or mode is None or high is None:
+                raise ValueError(f"Triangular distribution for '{field}' needs low, mode and high")
+            if not low <= mode <= high or low == high:
+                raise ValueError(f"Triangular distribution for '{field}' needs low <= mode <= high, low < high")
+            samples = rng.triangular(low, mode, high, size)
+        else:
+            raise ValueError(f"Unknown distribution '{kind}' for '{field}'")
+        
+        # Rates, volumes, hours and load percentages are never negative
+        return np.maximum(samples, 0.0)
+    
+    @staticmethod
+    def _summarize(values: np.ndarray, percentiles: List[float]) -> SimulationSummary:
+        """Summary statistics for one simulated output."""
+        points = np.percentile(values, percentiles) if percentiles else []
+        labels: Dict[str, float] = {
+            f"p{p:g}": round(float(value), 4) for p, value in zip(percentiles, points)
+        }
+        return SimulationSummary(
+            mean=round(float(values.mean()), 4),
+            std=round(float(values.std()), 4),
+            min=round(float(values.min()), 4),
+            max=round(float(values.max()), 4),
+            percentiles=labels,
+        )
@@ -0,0 +1,90 @@
+"""
+Cost sweep service - evaluates the cost model over a Cartesian parameter grid.
+"""
+import math
+from typing import Dict, List
+
+import numpy as np
+
+from ..config import settings
+from ..models import CostSweepRequest, CostSweepResult, SweepRange
+from .cost_calculator import CostCalculatorService, REQUEST_KERNEL_FIELDS
+from .cost_kernel import compute_costs, round_columns
+
+
+class CostSweepService:
+    """
+    Service for parameter sweeps.
+    Each swept field becomes one broadcast axis of the cost kernel, so the
+    full grid is evaluated in a single array pass.
+    """
+    
+    @classmethod
+    def run(cls, data: CostSweepRequest) -> CostSweepResult:
+        """
+        Evaluate the cost model for every combination of the requested ranges.
+        Raises ValueError for unknown fields, empty ranges or oversized grids.
+        """
+        axes = cls._resolve_axes(data.ranges)
+        shape = [len(values) for values in axes.values()]
+        
+        inputs = {
+            name: column[0]
+            for name, column in CostCalculatorService.build_kernel_inputs([data.base]).items()
+        }
+        for axis, (field, values) in enumerate(axes.items()):
+            axis_shape = [1] * len(axes)
+            axis_shape[axis] = len(values)
+            inputs[field] = np.asarray(values, dtype=float).reshape(axis_shape)
+        
+        results = compute_costs(CostCalculatorService.collapse_varied_fleet(data.base, inputs))
+        return CostSweepResult(
+            fields=list(axes),
+            shape=shape,
+            axes={field: values.tolist() for field, values in axes.items()},
+            results=round_columns(results),
+        )
+    
+    @staticmethod
+    def _resolve_axes(ranges: List[SweepRange]) -> Dict[str, np.ndarray]:
+        """
+        Turn sweep ranges into value arrays keyed by field, in request order.
+        The grid size is checked against SWEEP_MAX_POINTS before any axis
+        is built.
+        """
+        sizes: Dict[str, int] = {}
+        for sweep_range in ranges:
+            field = sweep_range.field
+            if field not in REQUEST_KERNEL_FIELDS:
+                raise ValueError(f"Field '{field}' cannot be swept")
+            if field in sizes:
+                raise ValueError(f"Field '{field}' is swept more than once")
+            
+            if sweep_range.values is not None:
+                size = len(sweep_range.values)
+            elif sweep_range.start is not None and sweep_range.stop is not None:
+                size = sweep_range.steps
+                if not 1 <= size <= settings.SWEEP_MAX_POINTS:
+                    raise ValueError(
+                        f"Steps for '{field}' must be between 1 and {settings.SWEEP_MAX_POINTS}"
+                    )
+            else:
+                raise ValueError(f"Range for '{field}' needs either values or start/stop")
+            
+            if size == 0:
+                raise ValueError(f"Range for '{field}' is empty")
+            sizes[field] = size
+        
+        total_points = math.prod(sizes.values())
+        if total_points > settings.SWEEP_MAX_POINTS:
+            raise ValueError(
+                f"Sweep has {total_points} points, the limit is {settings.SWEEP_MAX_POINTS}"
+            )
+        
+        return {
+            sweep_range.field: (
+                np.asarray(sweep_range.values, dtype=float) if sweep_range.values is not None
+                else np.linspace(sweep_range.start, sweep_range.stop, sweep_range.steps)
+            )
+            for sweep_range in ranges
+        }
@@ -0,0 +1,205 @@
+"""
+Cycle scheduler service - time-of-use tariffs and cost-minimizing placement
+of wash and dry cycles.
+"""
+import math
+from datetime import date
+from typing import Any, Dict, Tuple
+
+import numpy as np
+
+from ..config import settings
+from ..models import (
+    CycleScheduleRequest, CycleScheduleResult, FleetGroup, ScheduledGroup, ScheduledStart,
+    TariffSchedule,
+)
+from ..repositories import CatalogCache, ElectricityTariffRepository
+
+HOURS_PER_WEEK = 168
+
+# Fleet kind -> (catalog table, energy per cycle column)
+MACHINE_KINDS = {
+    "washing": ("washing_machines", "energy_consumption_kwh"),
+    "drying": ("drying_machines", "energy_consumption_kwh_per_cycle"),
+}
+
+
+def tariff_prices(schedule: TariffSchedule) -> np.ndarray:
+    """
+    Price of every hour of the week (168 values, Monday 00:00 first).
+    Raises ValueError for schedules that do not define every hour.
+    """
+    if schedule.hourly_prices is not None:
+        prices = np.asarray(schedule.hourly_prices, dtype=float)
+        if prices.size == 24:
+            return np.tile(prices, 7)
+        if prices.size == HOURS_PER_WEEK:
+            return prices
+        raise ValueError("hourly_prices needs 24 or 168 values")
+    if schedule.base_price is None:
+        raise ValueError("A tariff needs hourly_prices or a base_price")
+    
+    prices = np.full((7, 24), float(schedule.base_price))
+    hours = np.arange(24)
+    for period in schedule.periods:
+        if not (0 <= period.start_hour < 24 and 0 < period.end_hour <= 24):
+            raise ValueError("Period hours must be within 0..24")
+        if any(not 0 <= day <= 6 for day in period.days):
+            raise ValueError("Period days must be 0 (Monday) to 6 (Sunday)")
+        if period.start_hour < period.end_hour:
+            covered = (hours >= period.start_hour) & (hours < period.end_hour)
+        else:
+            covered = (hours >= period.start_hour) | (hours < period.end_hour)
+        prices[np.ix_(period.days, np.flatnonzero(covered))] = period.price
+    return prices.ravel()
+
+
+class CycleSchedulerService:
+    """
+    Service for placing machine cycles into the cheapest operating hours.
+    
+    The horizon is cut into slots of slot_minutes. A cycle covers
+    ceil(duration / slot) slots and draws its energy evenly over its
+    duration, so the cost of every possible start is one sliding-window
+    product over the slot prices. Each fleet group then takes starts
+    greedily from cheapest to dearest, as many at a time as its units
+    allow, without exceeding the units running in any slot.
+    """
+    
+    @classmethod
+    def run(cls, data: CycleScheduleRequest) -> CycleScheduleResult:
+        """
+        Schedule every fleet group over the horizon.
+        Raises ValueError for bad horizons, slots, tariffs or machines.
+        """
+        if not 1 <= data.days <= settings.SCHEDULE_MAX_DAYS:
+            raise ValueError(f"days must be between 1 and {settings.SCHEDULE_MAX_DAYS}")
+        if data.slot_minutes <= 0 or 60 % data.slot_minutes:
+            raise ValueError("slot_minutes must divide 60")
+        if not (0 <= data.open_hour < 24 and 0 < data.close_hour <= 24):
+            raise ValueError("Operating hours must be within 0..24")
+        start = date.fromisoformat(data.start)
+        
+        prices, open_slots = cls._slots(data, start, cls._tariff(data))
+        if not open_slots.any():
+            raise ValueError("No operating hours in the horizon")
+        flat_price = float(prices[open_slots].mean())
+        
+        groups = [cls._schedule_group(group, data, start, prices, open_slots, flat_price) for group in data.fleet]
+        energy = sum(group.energy_kwh for group in groups)
+        cost = sum(group.cost for group in groups)
+        flat_cost = sum(group.flat_cost for group in groups)
+        return CycleScheduleResult(
+            start=start.isoformat(),
+            days=data.days,
+            slot_minutes=data.slot_minutes,
+            groups=groups,
+            energy_kwh=round(energy, 2),
+            cost=round(cost, 2),
+            flat_cost=round(flat_cost, 2),
+            savings=round(flat_cost - cost, 2),
+            average_price=round(cost / energy, 4) if energy > 0 else 0.0,
+        )
+    
+    @staticmethod
+    def _tariff(data: CycleScheduleRequest) -> TariffSchedule:
+        """The request's own tariff, or its location's."""
+        if data.tariff is not None:
+            return data.tariff
+        if data.location_id is None:
+            raise ValueError("Give a tariff or a location_id with a stored tariff")
+        stored = ElectricityTariffRepository.get(data.location_id)
+        if stored is None:
+            raise ValueError("Location has no electricity tariff")
+        return TariffSchedule.model_validate(stored)
+    
+    @staticmethod
+    def _slots(data: CycleScheduleRequest, start: date, tariff: TariffSchedule) -> Tuple[np.ndarray, np.ndarray]:
+        """Price and open flag of every slot of the horizon."""
+        slots_per_hour = 60 // data.slot_minutes
+        hours = start.weekday() * 24 + np.arange(data.days * 24)
+        hour_of_day = hours % 24
+        weekday = (hours // 24) % 7
+        
+        if data.open_hour < data.close_hour:
+            open_hours = (hour_of_day >= data.open_hour) & (hour_of_day < data.close_hour)
+        else:
+            open_hours = (hour_of_day >= data.open_hour) | (hour_of_day < data.close_hour)
+        open_hours &= np.isin(weekday, data.operating_days)
+        
+        prices = tariff_prices(tariff)[hours % HOURS_PER_WEEK]
+        return np.repeat(prices, slots_per_hour), np.repeat(open_hours, slots_per_hour)
+    
+    @classmethod
+    def _schedule_group(
+        cls,
+        group: FleetGroup,
+        data: CycleScheduleRequest,
+        start: date,
+        prices: np.ndarray,
+        open_slots: np.ndarray,
+        flat_price: float,
+    ) -> ScheduledGroup:
+        """Place one group's cycles greedily into its cheapest feasible starts."""
+        machine = cls._machine(group)
+        duration = machine["cycle_duration_min"]
+        energy = machine[MACHINE_KINDS[group.kind][1]]
+        if group.units < 1 or group.cycles < 0:
+            raise ValueError("units must be at least 1 and cycles not negative")
+        
+        length = math.ceil(duration / data.slot_minutes)
+        # Minutes of the cycle in each slot it covers; the last may be partial
+        weights = np.full(length, float(data.slot_minutes))
+        weights[-1] = duration - (length - 1) * data.slot_minutes
+        placed: Dict[int, int] = {}
+        if length <= len(prices):
+            windows = np.lib.stride_tricks.sliding_window_view(prices, length)
+            start_costs = energy / duration * (windows @ weights)
+            feasible = np.lib.stride_tricks.sliding_window_view(open_slots, length).all(axis=1)
+            candidates = np.flatnonzero(feasible)
+            order = candidates[np.argsort(start_costs[candidates], kind="stable")]
+            
+            running = np.zeros(len(prices), dtype=int)
+            remaining = group.cycles
+            for slot in order.tolist():
+                if remaining == 0:
+                    break
+                free = group.units - int(running[slot:slot + length].max())
+                if free > 0:
+                    count = min(free, remaining)
+                    running[slot:slot + length] += count
+                    placed[slot] = count
+                    remaining -= count
+            cost = float(sum(start_costs[slot] * count for slot, count in placed.items()))
+        else:
+            cost = 0.0
+        
+        scheduled = sum(placed.values())
+        first = np.datetime64(start, "m")
+        return ScheduledGroup(
+            kind=group.kind,
+            machine_id=group.machine_id,
+            model=machine["model"],
+            units=group.units,
+            cycles_requested=group.cycles,
+            cycles_scheduled=scheduled,
+            energy_kwh=round(scheduled * energy, 2),
+            cost=round(cost, 2),
+            flat_cost=round(scheduled * energy * flat_price, 2),
+            starts=[
+                ScheduledStart(start=str(first + slot * data.slot_minutes), cycles=count)
+                for slot, count in sorted(placed.items())
+            ],
+        )
+    
+    @staticmethod
+    def _machine(group: FleetGroup) -> Dict[str, Any]:
+        """Catalog record of a fleet group's machine."""
+        if group.kind not in MACHINE_KINDS:
+            raise ValueError(f"Unknown machine kind: {group.kind}")
+        machine = CatalogCache.get(MACHINE_KINDS[group.kind][0], group.machine_id)
+        if machine is None:
+            raise ValueError(f"{group.kind.capitalize()} machine not found: {group.machine_id}")
+        if machine["cycle_duration_min"] <= 0:
+            raise ValueError(f"Machine {machine['model']} has no cycle duration")
+        return machine
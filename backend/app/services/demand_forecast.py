@@ -0,0 +1,258 @@
+"""
+Demand forecast service - fits laundry volume (kg, sets) to occupancy
+drivers per location and projects it forward.
+"""
+import math
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from ..config import settings
+from ..models import (
+    DemandForecastRequest, DemandForecastResult,
+    DemandFit, DemandPeriod, ForecastCostRequestsRequest, ForecastCostRequest,
+)
+from ..repositories import CatalogCache, MeterRollupRepository
+
+
+class DemandForecastService:
+    """
+    Service for occupancy-driven demand forecasts.
+    
+    Every location gets its own ridge regression of each volume metric on
+    the standardized driver metrics. At monthly resolution, volumes are
+    fitted per day of the month (a month with a single reading is taken as
+    a monthly figure, several readings as daily ones) so months of
+    different length compare fairly. Future drivers are each location's
+    average per calendar month.
+    
+    All locations and periods are fitted at once: readings are loaded into
+    a (location, period, metric) array and the normal equations of every
+    location are built and solved as one batch.
+    """
+    
+    @classmethod
+    def run(cls, data: DemandForecastRequest) -> DemandForecastResult:
+        """
+        Fit and project the requested metrics.
+        Raises ValueError for unknown resolutions, bad dates or period counts.
+        """
+        fits, periods = cls._forecast(data)
+        return DemandForecastResult(resolution=data.resolution, fits=fits, periods=periods)
+    
+    @classmethod
+    def cost_requests(cls, data: ForecastCostRequestsRequest) -> List[ForecastCostRequest]:
+        """
+        One cost request per location and forecast month: the base request
+        with operational_volume set to the forecast kg and cycles_per_month
+        to the washes that volume needs at the base machine's effective
+        capacity (the base cycles if no machine is set).
+        """
+        if data.forecast.resolution != "month":
+            raise ValueError("Cost requests need a monthly forecast")
+        _, periods = cls._forecast(data.forecast)
+        
+        base = data.base
+        machine = CatalogCache.get("washing_machines", base.washing_machine_id) or {}
+        capacity = machine.get("capacity_kg", 0.0) * base.washing_load_percentage / 100
+        requests = []
+        for period in periods:
+            if period.kg is None:
+                continue
+            cycles = math.ceil(period.kg / capacity) if capacity > 0 else base.cycles_per_month
+            requests.append(ForecastCostRequest(
+                location_id=period.location_id,
+                period_start=period.period_start,
+                request=base.model_copy(update={
+                    "operational_volume": round(period.kg, 1),
+                    "cycles_per_month": cycles,
+                }),
+            ))
+        return requests
+    
+    @classmethod
+    def _forecast(cls, data: DemandForecastRequest) -> Tuple[List[DemandFit], List[DemandPeriod]]:
+        """Fitted models and projected periods of every location with data."""
+        if data.resolution not in ("month", "day"):
+            raise ValueError(f"Unknown resolution: {data.resolution}")
+        if not 1 <= data.periods <= settings.FORECAST_MAX_PERIODS:
+            raise ValueError(f"periods must be between 1 and {settings.FORECAST_MAX_PERIODS}")
+        if not data.drivers:
+            raise ValueError("At least one driver metric is required")
+        start = date.fromisoformat(data.start)
+        
+        targets = {"kg": data.kg_metric}
+        if data.sets_metric:
+            targets["sets"] = data.sets_metric
+        metrics = list(dict.fromkeys([*data.drivers, *targets.values()]))
+        location_ids, period_starts, values, counts = cls._load(metrics, data.resolution, data.location_ids)
+        
+        drivers = values[:, :, [metrics.index(name) for name in data.drivers]]
+        days = cls._days_in_period(period_starts, data.resolution)
+        
+        future = cls._future_periods(start, data.periods, data.resolution)
+        future_drivers = cls._seasonal_profile(drivers, period_starts, future)
+        future_days = cls._days_in_period(future, data.resolution)
+        
+        fits: List[DemandFit] = []
+        predictions: Dict[str, np.ndarray] = {}
+        for role, metric in targets.items():
+            column = metrics.index(metric)
+            target = values[:, :, column]
+            if data.resolution == "month":
+                # Volume per day: a single reading is the month's figure,
+                # several readings are already a daily average
+                target = target / np.where(counts[:, :, column] > 1, 1.0, days)
+            coefficients, mean, scale, observations, r2 = cls._fit(drivers, target, data.ridge)
+            
+            design = np.concatenate(
+                [np.ones(future_drivers.shape[:2] + (1,)), (future_drivers - mean[:, None, :]) / scale[:, None, :]],
+                axis=2,
+            )
+            forecast = np.maximum(np.einsum("lpk,lk->lp", design, coefficients), 0.0)
+            if data.resolution == "month":
+                forecast = forecast * future_days
+            predictions[role] = forecast
+            
+            slopes = coefficients[:, 1:] / scale
+            intercepts = coefficients[:, 0] - (slopes * mean).sum(axis=1)
+            for index, location_id in enumerate(location_ids):
+                fitted = bool(np.isfinite(coefficients[index]).all())
+                fits.append(DemandFit(
+                    location_id=location_id,
+                    metric=metric,
+                    observations=int(observations[index]),
+                    intercept=float(intercepts[index]) if fitted else None,
+                    coefficients=(
+                        {name: float(slope) for name, slope in zip(data.drivers, slopes[index])}
+                        if fitted else {}
+                    ),
+                    r2=float(r2[index]) if np.isfinite(r2[index]) else None,
+                ))
+        
+        # Rounded once per array; NaN (unfitted or no driver history) becomes None
+        projected = {role: _optional(forecast, 1) for role, forecast in predictions.items()}
+        driver_values = _optional(future_drivers, 4)
+        starts = [str(period_start) for period_start in future]
+        periods = [
+            DemandPeriod(
+                location_id=location_id,
+                period_start=period_start,
+                drivers=dict(zip(data.drivers, driver_values[index][position])),
+                **{role: values[index][position] for role, values in projected.items()},
+            )
+            for index, location_id in enumerate(location_ids)
+            for position, period_start in enumerate(starts)
+        ]
+        return fits, periods
+    
+    @staticmethod
+    def _load(
+        metrics: List[str], resolution: str, location_ids: Optional[List[str]]
+    ) -> Tuple[List[str], np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Readings of the metrics as a (location, period, metric) array of
+        period averages (NaN where missing), plus the number of readings
+        behind each cell.
+        """
+        rows = MeterRollupRepository.get_values(metrics, resolution, location_ids)
+        if not rows:
+            empty = np.empty((0, 0, len(metrics)))
+            return [], np.array([], dtype="datetime64[D]"), empty, empty
+        
+        location_column, metric_column, period_column, totals, counts = zip(*rows)
+        locations, location_index = np.unique(np.array(location_column), return_inverse=True)
+        periods, period_index = np.unique(np.array(period_column, dtype="datetime64[D]"), return_inverse=True)
+        metric_positions = {name: position for position, name in enumerate(metrics)}
+        metric_index = np.array([metric_positions[name] for name in metric_column])
+        
+        shape = (len(locations), len(periods), len(metrics))
+        values = np.full(shape, np.nan)
+        reading_counts = np.zeros(shape)
+        counts = np.asarray(counts, dtype=float)
+        values[location_index, period_index, metric_index] = np.asarray(totals, dtype=float) / counts
+        reading_counts[location_index, period_index, metric_index] = counts
+        return locations.tolist(), periods, values, reading_counts
+    
+    @staticmethod
+    def _fit(
+        drivers: np.ndarray, target: np.ndarray, ridge: float
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Ridge regression of target (location, period) on drivers (location,
+        period, driver), one model per location, solved as a batch.
+        Returns standardized coefficients (intercept first), the driver
+        means and scales, observation counts and R². Locations with fewer
+        than two observations get NaN coefficients.
+        """
+        k = drivers.shape[2]
+        mask = np.isfinite(target) & np.isfinite(drivers).all(axis=2)
+        weights = mask.astype(float)
+        observations = weights.sum(axis=1)
+        n = np.maximum(observations, 1)[:, None]
+        
+        x = np.where(mask[:, :, None], drivers, 0.0)
+        y = np.where(mask, target, 0.0)
+        mean = x.sum(axis=1) / n
+        variance = (weights[:, :, None] * (x - mean[:, None, :]) ** 2).sum(axis=1) / n
+        scale = np.where(variance > 0, np.sqrt(variance), 1.0)
+        z = np.where(mask[:, :, None], (x - mean[:, None, :]) / scale[:, None, :], 0.0)
+        design = np.concatenate([weights[:, :, None], z], axis=2)
+        
+        penalty = np.diag([0.0] + [ridge] * k)
+        normal = design.transpose(0, 2, 1) @ design + penalty
+        rhs = (design.transpose(0, 2, 1) @ y[:, :, None])[:, :, 0]
+        usable = observations >= 2
+        normal[~usable] = np.eye(k + 1)
+        coefficients = np.linalg.solve(normal, rhs[:, :, None])[:, :, 0]
+        coefficients[~usable] = np.nan
+        
+        fitted = (design @ np.nan_to_num(coefficients)[:, :, None])[:, :, 0]
+        residual = (weights * (y - fitted) ** 2).sum(axis=1)
+        y_mean = y.sum(axis=1) / n[:, 0]
+        total = (weights * (y - y_mean[:, None]) ** 2).sum(axis=1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            r2 = np.where(usable & (total > 0), 1 - residual / total, np.nan)
+        return coefficients, mean, scale, observations, r2
+    
+    @staticmethod
+    def _seasonal_profile(drivers: np.ndarray, periods: np.ndarray, future: np.ndarray) -> np.ndarray:
+        """
+        Drivers of the future periods: each location's mean per calendar
+        month, or its overall mean for months without history.
+        """
+        history_months = periods.astype("datetime64[M]").astype(int) % 12
+        future_months = future.astype("datetime64[M]").astype(int) % 12
+        one_hot = (history_months[:, None] == np.arange(12)[None, :]).astype(float)
+        present = np.isfinite(drivers)
+        sums = np.einsum("ltk,tm->lmk", np.where(present, drivers, 0.0), one_hot)
+        counts = np.einsum("ltk,tm->lmk", present.astype(float), one_hot)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            monthly = sums / counts
+            overall = sums.sum(axis=1) / counts.sum(axis=1)
+        profile = np.where(counts > 0, monthly, overall[:, None, :])
+        return profile[:, future_months, :]
+    
+    @staticmethod
+    def _future_periods(start: date, count: int, resolution: str) -> np.ndarray:
+        """Start dates of the forecast periods."""
+        if resolution == "month":
+            first = np.datetime64(start.replace(day=1), "M")
+            return (first + np.arange(count)).astype("datetime64[D]")
+        return np.datetime64(start, "D") + np.arange(count)
+    
+    @staticmethod
+    def _days_in_period(periods: np.ndarray, resolution: str) -> np.ndarray:
+        """Length of each period in days."""
+        if resolution == "day":
+            return np.ones(len(periods))
+        months = periods.astype("datetime64[M]")
+        return ((months + 1).astype("datetime64[D]") - months.astype("datetime64[D]")).astype(float)
+
+
+def _optional(values: np.ndarray, decimals: int) -> list:
+    """Rounded nested lists of an array, with None for NaN."""
+    rounded = np.round(values, decimals).astype(object)
+    rounded[~np.isfinite(values)] = None
+    return rounded.tolist()
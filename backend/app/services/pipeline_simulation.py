@@ -0,0 +1,263 @@
+"""
+Pipeline simulation service - discrete-event simulation of a site's wash,
+dry and iron stages, its queues and its operator shifts.
+"""
+import heapq
+from collections import deque
+from typing import Any, Deque, Dict, List, Tuple
+
+import numpy as np
+
+from ..config import settings
+from ..models import PipelineSimulationRequest, PipelineSimulationResult, StageStats
+from ..repositories import CatalogCache
+from .cost_kernel import MANUAL_TIME_PER_DRYING_CYCLE, MANUAL_TIME_PER_WASHING_CYCLE
+
+# Event kinds, in processing order at equal times
+SHIFT_START, ARRIVAL, MACHINE_DONE, TASK_DONE = range(4)
+# Operator tasks
+LOAD, UNLOAD, IRON = range(3)
+# Machine stages
+WASH, DRY = range(2)
+
+# Time-weighted levels: kg waiting per stage, units in use, kg in the laundry
+(WASH_QUEUE, DRY_QUEUE, IRON_QUEUE,
+ WASHERS_BUSY, DRYERS_BUSY, IRONERS_BUSY, OPERATORS_BUSY, WORK_IN_PROGRESS) = range(8)
+
+# Longest ironing stint before the operator looks for other work (minutes)
+IRON_BATCH_MINUTES = 30.0
+# Queues below this many kg count as empty
+MIN_KG = 1e-6
+
+
+class PipelineSimulationService:
+    """
+    Service for simulating whether a fleet and its staff keep up with a
+    site's volume.
+    
+    Loads of washing move wash -> dry -> iron. Machines run their
+    cycle_duration_min unattended, but an operator must load and unload
+    them (half the manual minutes per cycle each) and iron, and operators
+    only start work within shift hours. Free operators take the most
+    downstream work first, so finished machines are emptied before new
+    loads start.
+    
+    Events sit in a heap of plain tuples; the state is per-stage counters,
+    deques of finished loads' kg and one NumPy array of levels, integrated
+    over time for averages and utilizations.
+    """
+    
+    @classmethod
+    def run(cls, data: PipelineSimulationRequest) -> PipelineSimulationResult:
+        """
+        Simulate the requested days of operation.
+        Raises ValueError for bad horizons, shifts, staffing or machines.
+        """
+        cls._validate(data)
+        washer = cls._machine("washing_machines", data.washing_machine_id)
+        dryer = cls._machine("drying_machines", data.drying_machine_id)
+        load_kg = (
+            washer["capacity_kg"] * data.washing_load_percentage / 100,
+            dryer["capacity_kg"] * data.drying_load_percentage / 100,
+        )
+        if min(load_kg) <= 0:
+            raise ValueError("Machine loads must be above 0 kg")
+        cycle_minutes = (float(washer["cycle_duration_min"]), float(dryer["cycle_duration_min"]))
+        handling_minutes = (MANUAL_TIME_PER_WASHING_CYCLE / 2, MANUAL_TIME_PER_DRYING_CYCLE / 2)
+        iron_rate = data.ironing_kg_per_hour / 60
+        ironing = data.ironers > 0
+        
+        heap, shift_minutes = cls._calendar(data)
+        heapq.heapify(heap)
+        sequence = len(heap)
+        horizon = data.days * 1440.0
+        
+        queue = [0.0, 0.0, 0.0]
+        idle = [data.washers, data.dryers]
+        finished_loads: Tuple[Deque[float], Deque[float]] = (deque(), deque())
+        free_operators = data.operators
+        free_ironers = data.ironers
+        shift_end = -1.0
+        cycles = [0, 0, 0]
+        processed = [0.0, 0.0, 0.0]
+        tasks = 0
+        arrived = finished = 0.0
+        
+        level = np.zeros(8)
+        area = np.zeros(8)
+        peak = np.zeros(8)
+        last = 0.0
+        events = 0
+        
+        while heap:
+            now, kind, _, stage_task, value = heapq.heappop(heap)
+            if now > horizon:
+                break
+            events += 1
+            area += (now - last) * level
+            last = now
+            
+            if kind == SHIFT_START:
+                shift_end = value
+            elif kind == ARRIVAL:
+                queue[WASH] += value
+                arrived += value
+            elif kind == MACHINE_DONE:
+                finished_loads[stage_task].append(value)
+            else:
+                task, stage = divmod(stage_task, 2)
+                free_operators += 1
+                if task == LOAD:
+                    heapq.heappush(heap, (now + cycle_minutes[stage], MACHINE_DONE, sequence, stage, value))
+                    sequence += 1
+                elif task == UNLOAD:
+                    idle[stage] += 1
+                    if stage == WASH:
+                        queue[DRY] += value
+                    elif ironing:
+                        queue[2] += value
+                    else:
+                        finished += value
+                else:
+                    free_ironers += 1
+                    finished += value
+            
+            # Hand out work, most downstream first
+            while free_operators and now < shift_end:
+                if finished_loads[DRY]:
+                    task, stage, kg = UNLOAD, DRY, finished_loads[DRY].popleft()
+                    duration = handling_minutes[DRY]
+                elif finished_loads[WASH]:
+                    task, stage, kg = UNLOAD, WASH, finished_loads[WASH].popleft()
+                    duration = handling_minutes[WASH]
+                elif idle[DRY] and queue[DRY] > MIN_KG:
+                    task, stage = LOAD, DRY
+                elif idle[WASH] and queue[WASH] > MIN_KG:
+                    task, stage = LOAD, WASH
+                elif free_ironers and queue[2] > MIN_KG and shift_end - now > 1:
+                    task, stage = IRON, 0
+                    kg = min(queue[2], iron_rate * min(IRON_BATCH_MINUTES, shift_end - now))
+                    duration = kg / iron_rate
+                    queue[2] -= kg
+                    free_ironers -= 1
+                    cycles[2] += 1
+                    processed[2] += kg
+                else:
+                    break
+                if task == LOAD:
+                    kg = min(load_kg[stage], queue[stage])
+                    queue[stage] -= kg
+                    idle[stage] -= 1
+                    cycles[stage] += 1
+                    processed[stage] += kg
+                    duration = handling_minutes[stage]
+                free_operators -= 1
+                tasks += 1
+                heapq.heappush(heap, (now + duration, TASK_DONE, sequence, task * 2 + stage, kg))
+                sequence += 1
+            
+            level[:] = (
+                queue[WASH], queue[DRY], queue[2],
+                data.washers - idle[WASH], data.dryers - idle[DRY], data.ironers - free_ironers,
+                data.operators - free_operators, arrived - finished,
+            )
+            np.maximum(peak, level, out=peak)
+        area += (horizon - last) * level
+        
+        average = area / horizon
+        utilization = {
+            "washing": area[WASHERS_BUSY] / (data.washers * horizon),
+            "drying": area[DRYERS_BUSY] / (data.dryers * horizon),
+            "operators": area[OPERATORS_BUSY] / (data.operators * shift_minutes) if shift_minutes else 0.0,
+        }
+        stages = [
+            cls._stage("washing", data.washers, cycles[WASH], processed[WASH], utilization["washing"],
+                       average[WASH_QUEUE], peak[WASH_QUEUE]),
+            cls._stage("drying", data.dryers, cycles[DRY], processed[DRY], utilization["drying"],
+                       average[DRY_QUEUE], peak[DRY_QUEUE]),
+        ]
+        if ironing:
+            utilization["ironing"] = area[IRONERS_BUSY] / (data.ironers * shift_minutes) if shift_minutes else 0.0
+            stages.append(cls._stage("ironing", data.ironers, cycles[2], processed[2], utilization["ironing"],
+                                     average[IRON_QUEUE], peak[IRON_QUEUE]))
+        stages.append(cls._stage("operators", data.operators, tasks, 0.0, utilization["operators"], 0.0, 0.0))
+        
+        daily_kg = data.operational_volume * 12 / 365
+        backlog = arrived - finished
+        # Little's law: time in system = average work in progress / throughput
+        lead_time = average[WORK_IN_PROGRESS] / (finished / horizon) / 60 if finished > 0 else None
+        return PipelineSimulationResult(
+            days=data.days,
+            arrived_kg=round(arrived, 1),
+            finished_kg=round(finished, 1),
+            backlog_kg=round(backlog, 1),
+            throughput_kg_per_day=round(finished / data.days, 1),
+            lead_time_hours=round(lead_time, 2) if lead_time is not None else None,
+            keeps_up=backlog <= daily_kg,
+            bottleneck=max(utilization, key=utilization.get),
+            stages=stages,
+            events=events,
+        )
+    
+    @staticmethod
+    def _calendar(data: PipelineSimulationRequest) -> Tuple[List[Tuple[float, int, int, int, float]], float]:
+        """
+        Shift starts (carrying their end time) and deliveries of the
+        horizon as heap entries, plus the total shift minutes.
+        """
+        days = np.arange(data.days)
+        length = ((data.shift_end_hour - data.shift_start_hour) % 24 or 24) * 60
+        starts = days * 1440.0 + data.shift_start_hour * 60
+        working = np.isin(days % 7, data.operating_days)
+        
+        # Laundry arrives every day, spread over the shift hours
+        daily_kg = data.operational_volume * 12 / 365
+        offsets = length * np.arange(data.arrivals_per_day) / data.arrivals_per_day
+        arrivals = (starts[:, None] + offsets[None, :]).ravel()
+        delivery_kg = daily_kg / data.arrivals_per_day
+        
+        entries = [(start, SHIFT_START, 0, 0, start + length) for start in starts[working].tolist()]
+        entries += [(time, ARRIVAL, 0, 0, delivery_kg) for time in arrivals.tolist()]
+        entries = [(time, kind, index, stage, value) for index, (time, kind, _, stage, value) in enumerate(entries)]
+        return entries, float(working.sum() * length)
+    
+    @staticmethod
+    def _stage(
+        name: str, units: int, cycles: int, kg: float, utilization: float, average_queue: float, max_queue: float
+    ) -> StageStats:
+        """Rounded statistics of one stage."""
+        return StageStats(
+            name=name,
+            units=units,
+            cycles=cycles,
+            kg=round(kg, 1),
+            utilization=round(float(utilization), 4),
+            average_queue_kg=round(float(average_queue), 1),
+            max_queue_kg=round(float(max_queue), 1),
+        )
+    
+    @staticmethod
+    def _validate(data: PipelineSimulationRequest) -> None:
+        """Reject horizons, deliveries, shifts and staffing the simulation cannot run."""
+        if not 1 <= data.days <= settings.PIPELINE_MAX_DAYS:
+            raise ValueError(f"days must be between 1 and {settings.PIPELINE_MAX_DAYS}")
+        if min(data.washers, data.dryers, data.operators, data.arrivals_per_day) < 1:
+            raise ValueError("washers, dryers, operators and arrivals_per_day must be at least 1")
+        if data.arrivals_per_day > settings.PIPELINE_MAX_ARRIVALS_PER_DAY:
+            raise ValueError(f"arrivals_per_day must be at most {settings.PIPELINE_MAX_ARRIVALS_PER_DAY}")
+        if data.ironers < 0 or data.operational_volume < 0:
+            raise ValueError("ironers and operational_volume must not be negative")
+        if data.ironers and data.ironing_kg_per_hour <= 0:
+            raise ValueError("ironing_kg_per_hour must be above 0")
+        if not (0 <= data.shift_start_hour < 24 and 0 < data.shift_end_hour <= 24):
+            raise ValueError("Shift hours must be within 0..24")
+    
+    @staticmethod
+    def _machine(table: str, machine_id: str) -> Dict[str, Any]:
+        """Catalog record of a machine with a usable cycle duration."""
+        machine = CatalogCache.get(table, machine_id)
+        if machine is None:
+            raise ValueError(f"Machine not found: {machine_id}")
+        if machine["cycle_duration_min"] <= 0:
+            raise ValueError(f"Machine {machine['model']} has no cycle duration")
+        return machine
@@ -0,0 +1,402 @@
+"""
+Meter readings ingestion - streams wide, per-date-column utility sheets
+(CSV exports) into the long-format meter_readings table.
+"""
+import csv
+import itertools
+import os
+import re
+import sqlite3
+from datetime import date
+from typing import Any, Dict, IO, Iterator, List, Optional, Tuple
+
+from ..config import settings
+from ..database import get_db
+from ..repositories import CatalogCache, MeterReadingRepository, MeterRollupRepository
+
+_CURRENCY = re.compile(r"kč|kc|czk|eur|usd|rub|€|\$|£|₽", re.IGNORECASE)
+_SEPARATOR_SPACES = re.compile(r"[\s\u00a0\u202f'’]")
+_PLAIN_NUMBER = re.compile(r"\d*\.?\d+|\d+\.")
+_COMMA_GROUPS = re.compile(r"\d{1,3}(?:,\d{3})+")
+_DOT_GROUPS = re.compile(r"\d{1,3}(?:\.\d{3})+")
+_DAY_MONTH = re.compile(r"(\d{1,2})\.(\d{1,2})\.?(\d{4})?")
+_YEAR = re.compile(r"\d{4}")
+_YEAR_RANGE = re.compile(r"\d{4}\s*-\s*\d{4}")
+
+_WORD = re.compile(r"[^\W\d_]+")
+
+MONTHS: Dict[str, int] = {}
+_MONTH_ABBREVIATIONS = ("jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec")
+for _names in (
+    ("январь", "февраль", "март", "апрель", "май", "июнь",
+     "июль", "август", "сентябрь", "октябрь", "ноябрь", "декабрь"),
+    ("leden", "únor", "březen", "duben", "květen", "červen",
+     "červenec", "srpen", "září", "říjen", "listopad", "prosinec"),
+    ("january", "february", "march", "april", "may", "june",
+     "july", "august", "september", "october", "november", "december"),
+    _MONTH_ABBREVIATIONS,
+):
+    MONTHS.update({name: month for month, name in enumerate(_names, start=1)})
+
+
+def _month_in(text: str) -> Optional[int]:
+    """Month named by any word of a heading ("Total for April"; "Jule" counts as July)."""
+    for word in _WORD.findall(text.lower()):
+        if word in MONTHS:
+            return MONTHS[word]
+        if len(word) >= 3 and word[:3] in _MONTH_ABBREVIATIONS:
+            return MONTHS[word[:3]]
+    return None
+
+
+def parse_localized_number(text: str) -> Optional[float]:
+    """
+    Parse a number as typed into a spreadsheet: currency symbols and codes
+    ("65,088Kč", "€69.20"), thousands separators (",", ".", spaces), a
+    decimal comma ("1,5"), percentages ("46%" -> 0.46) and negatives
+    ("-12", "(12)"). Returns None for text, dashes and spreadsheet errors.
+    """
+    value = _SEPARATOR_SPACES.sub("", text)
+    negative = False
+    if value.startswith("(") and value.endswith(")"):
+        negative, value = True, value[1:-1]
+    if value[:1] in ("-", "−"):
+        negative, value = not negative, value[1:]
+    percent = value.endswith("%")
+    if percent:
+        value = value[:-1]
+    value = _CURRENCY.sub("", value)
+    if value[:1] in ("-", "−"):
+        negative, value = not negative, value[1:]
+    if not value:
+        return None
+    
+    if "," in value and "." in value:
+        # The right-most separator is the decimal one
+        if value.rfind(",") > value.rfind("."):
+            value = value.replace(".", "").replace(",", ".")
+        else:
+            value = value.replace(",", "")
+    elif "," in value:
+        if _COMMA_GROUPS.fullmatch(value):
+            value = value.replace(",", "")
+        elif value.count(",") == 1:
+            value = value.replace(",", ".")
+    elif value.count(".") > 1 and _DOT_GROUPS.fullmatch(value):
+        value = value.replace(".", "")
+    
+    if not _PLAIN_NUMBER.fullmatch(value):
+        return None
+    number = float(value)
+    if percent:
+        number /= 100
+    return -number if negative else number
+
+
+class ReadingsIngestService:
+    """
+    Loads sheets laid out as one row per metric and one column per date.
+    
+    Two header layouts are recognised, both in rows without a label in the
+    first column:
+    - day columns ("15.04", optionally "15.04.2024"); years missing from
+      the cells come from the `year` argument and roll over when the
+      month goes backwards;
+    - a row of years (each carried to the columns on its right) together
+      with a row of month names (Russian, Czech or English), giving the
+      first day of each month. Rows read before the header is complete
+      are held back (at most HEADER_SEARCH_ROWS rows).
+    
+    Labelled rows with all date cells empty start a section, which prefixes
+    the metric names below it ("Water / Consumption") until the next
+    unlabelled row; a metric repeated within a sheet gets a " #n" suffix.
+    Non-numeric cells are counted and skipped.
+    
+    Rows are read one at a time and written in batches of
+    READINGS_BATCH_SIZE through one prepared statement, each followed by a
+    refresh of the weekly/monthly/yearly rollups it touches, inside a
+    single transaction, so memory use does not depend on the file size and
+    a failed import leaves no partial data.
+    """
+    HEADER_SEARCH_ROWS = 50
+    NOTE_LABELS = ("comment",)
+    # Unit headings of site sheets stored under a clearer name
+    UNIT_NAMES = {"k-in comp.": "sets", "k-in comp": "sets"}
+    
+    @classmethod
+    def ingest(
+        cls,
+        stream: IO[str],
+        location_id: str,
+        year: Optional[int] = None,
+        source: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Import a CSV sheet from a text stream (opened with newline="") and
+        return counts and the covered date range. Raises ValueError if no
+        date header is found.
+        """
+        rows = (
+            (location_id, metric, values, skipped)
+            for metric, values, skipped in cls._metric_rows(csv.reader(stream), year)
+        )
+        return {"location_id": location_id, **cls._store(rows, source)}
+    
+    @classmethod
+    def ingest_sites(
+        cls,
+        stream: IO[str],
+        year: int,
+        source: Optional[str] = None,
+        prefix: str = "Laundry",
+    ) -> Dict[str, Any]:
+        """
+        Import a sheet with one row per site and columns per month and unit
+        ("Total for April" above "kg" and "K-in comp." columns), stored as
+        "<prefix> / <unit>" metrics. Sites are matched to locations by name,
+        ignoring case; rows of other sites are skipped and reported.
+        """
+        locations = {
+            location["name"].strip().lower(): location["id"]
+            for location in CatalogCache.all("locations")
+        }
+        unmatched: List[str] = []
+        
+        def site_rows() -> Iterator[Tuple[str, str, List[Tuple[str, float]], int]]:
+            for site, metric, values, skipped in cls._site_rows(csv.reader(stream), year, prefix):
+                location_id = locations.get(site.lower())
+                if location_id is None:
+                    if site not in unmatched:
+                        unmatched.append(site)
+                    continue
+                yield location_id, metric, values, skipped
+        
+        result = cls._store(site_rows(), source)
+        return {**result, "unmatched_sites": unmatched}
+    
+    @classmethod
+    def _store(
+        cls,
+        rows: Iterator[Tuple[str, str, List[Tuple[str, float]], int]],
+        source: Optional[str],
+    ) -> Dict[str, Any]:
+        """
+        Write (location_id, metric, [(date, value)], skipped cells) rows in
+        batches inside one transaction and return counts and the covered
+        date range.
+        """
+        result: Dict[str, Any] = {
+            "source": source,
+            "rows": 0,
+            "readings": 0,
+            "skipped_cells": 0,
+            "metrics": 0,
+            "first_date": None,
+            "last_date": None,
+        }
+        seen: Dict[Tuple[str, str], int] = {}
+        batch: List[Tuple[str, str, str, float, Optional[str]]] = []
+        batch_size = max(1, settings.READINGS_BATCH_SIZE)
+        
+        with get_db() as conn:
+            cursor = conn.cursor()
+            for location_id, metric, values, skipped in rows:
+                result["rows"] += 1
+                result["skipped_cells"] += skipped
+                count = seen.get((location_id, metric), 0) + 1
+                seen[(location_id, metric)] = count
+                if count > 1:
+                    metric = f"{metric} #{count}"
+                for day, value in values:
+                    batch.append((location_id, metric, day, value, source))
+                    if result["first_date"] is None or day < result["first_date"]:
+                        result["first_date"] = day
+                    if result["last_date"] is None or day > result["last_date"]:
+                        result["last_date"] = day
+                result["readings"] += len(values)
+                if len(batch) >= batch_size:
+                    cls._write(cursor, batch)
+                    batch.clear()
+            if batch:
+                cls._write(cursor, batch)
+            conn.commit()
+        
+        result["metrics"] = len(seen)
+        return result
+    
+    @classmethod
+    def ingest_file(
+        cls,
+        path: str,
+        location_id: str,
+        year: Optional[int] = None,
+        source: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Import a CSV file; the source defaults to the file name."""
+        with open(path, newline="", encoding="utf-8-sig") as stream:
+            return cls.ingest(stream, location_id, year, source or os.path.basename(path))
+    
+    @staticmethod
+    def _write(cursor: sqlite3.Cursor, batch: List[Tuple[str, str, str, float, Optional[str]]]) -> None:
+        """Write a batch of readings and refresh the rollups of the periods it touches."""
+        MeterReadingRepository.upsert_many(cursor, batch)
+        MeterRollupRepository.refresh(cursor, batch)
+    
+    @classmethod
+    def _metric_rows(
+        cls, rows: Iterator[List[str]], year: Optional[int]
+    ) -> Iterator[Tuple[str, List[Tuple[str, float]], int]]:
+        """(metric, [(date, value)], skipped cells) for every labelled row with values."""
+        dates, pending = cls._find_header(rows, year)
+        section: Optional[str] = None
+        # The empty row stands in for the header, which ends any section
+        for row in itertools.chain(pending, [[]], rows):
+            label = " ".join(row[0].split()) if row else ""
+            if not label:
+                section = None
+                continue
+            
+            values = []
+            skipped = 0
+            for column, day in dates.items():
+                if column >= len(row) or not row[column].strip():
+                    continue
+                value = parse_localized_number(row[column])
+                if value is None:
+                    skipped += 1
+                else:
+                    values.append((day, value))
+            
+            if not values:
+                if not skipped and label.lower() not in cls.NOTE_LABELS:
+                    section = label
+                continue
+            yield (f"{section} / {label}" if section else label), values, skipped
+    
+    @classmethod
+    def _site_rows(
+        cls, rows: Iterator[List[str]], year: int, prefix: str
+    ) -> Iterator[Tuple[str, str, List[Tuple[str, float]], int]]:
+        """
+        (site, metric, [(date, value)], skipped cells) per site and unit,
+        below a row of month headings (each carried right) and a row of units.
+        """
+        months: Dict[int, int] = {}
+        units: Dict[int, str] = {}
+        for number, row in enumerate(rows):
+            label = " ".join(row[0].split()) if row else ""
+            if not months:
+                if number >= cls.HEADER_SEARCH_ROWS:
+                    break
+                if label:
+                    continue
+                current = None
+                for column, cell in enumerate(row):
+                    current = _month_in(cell) or current
+                    if column > 0 and current is not None:
+                        months[column] = current
+                continue
+            if not units:
+                units = {
+                    column: cls.UNIT_NAMES.get(cell.strip().lower(), cell.strip())
+                    for column, cell in enumerate(row) if column in months and cell.strip()
+                }
+                continue
+            if not label:
+                continue
+            
+            by_unit: Dict[str, List[Tuple[str, float]]] = {}
+            skipped = 0
+            for column, unit in units.items():
+                if column >= len(row) or not row[column].strip():
+                    continue
+                value = parse_localized_number(row[column])
+                if value is None:
+                    skipped += 1
+                    continue
+                day = date(year, months[column], 1).isoformat()
+                by_unit.setdefault(unit, []).append((day, value))
+            for unit, values in by_unit.items():
+                yield label, f"{prefix} / {unit}", values, skipped
+                skipped = 0
+        if not units:
+            raise ValueError("No month and unit header rows found")
+    
+    @classmethod
+    def _find_header(
+        cls, rows: Iterator[List[str]], year: Optional[int]
+    ) -> Tuple[Dict[int, str], List[List[str]]]:
+        """
+        Read up to the date header. Returns the ISO date of every date
+        column and the data rows read on the way.
+        """
+        pending: List[List[str]] = []
+        years: Dict[int, int] = {}
+        for row in rows:
+            cells = {
+                column: cell.strip() for column, cell in enumerate(row)
+                if column > 0 and cell.strip()
+            }
+            if row and not row[0].strip() and cells:
+                if all(_DAY_MONTH.fullmatch(cell) for cell in cells.values()):
+                    return cls._day_columns(cells, year), pending
+                if all(_YEAR.fullmatch(cell) or _YEAR_RANGE.fullmatch(cell) for cell in cells.values()):
+                    years = cls._year_columns(row)
+                    continue
+                if all(cell.lower() in MONTHS for cell in cells.values()):
+                    return cls._month_columns(cells, years, year), pending
+            
+            pending.append(row)
+            if len(pending) > cls.HEADER_SEARCH_ROWS:
+                break
+        raise ValueError(
+            f"No date header (day.month or year and month columns) "
+            f"in the first {cls.HEADER_SEARCH_ROWS} rows"
+        )
+    
+    @staticmethod
+    def _day_columns(cells: Dict[int, str], year: Optional[int]) -> Dict[int, str]:
+        """Dates of "dd.mm[.yyyy]" columns, rolling the year over at new year."""
+        dates = {}
+        previous_month = None
+        for column, cell in cells.items():
+            day, month, cell_year = _DAY_MONTH.fullmatch(cell).groups()
+            if cell_year:
+                year = int(cell_year)
+            elif year is None:
+                raise ValueError("year is required for sheets with day.month columns")
+            elif previous_month is not None and int(month) < previous_month:
+                year += 1
+            previous_month = int(month)
+            try:
+                dates[column] = date(year, int(month), int(day)).isoformat()
+            except ValueError:
+                raise ValueError(f"Invalid date in header: {cell}")
+        return dates
+    
+    @staticmethod
+    def _year_columns(row: List[str]) -> Dict[int, int]:
+        """Year of every column, carried right from the last year cell."""
+        years = {}
+        current = None
+        for column, cell in enumerate(row):
+            cell = cell.strip()
+            if _YEAR.fullmatch(cell):
+                current = int(cell)
+            if current is not None:
+                years[column] = current
+        return years
+    
+    @staticmethod
+    def _month_columns(
+        cells: Dict[int, str], years: Dict[int, int], year: Optional[int]
+    ) -> Dict[int, str]:
+        """First-of-month dates of month-name columns."""
+        dates = {}
+        for column, cell in cells.items():
+            column_year = years.get(column, year)
+            if column_year is None:
+                raise ValueError("year is required for sheets with month columns but no year row")
+            dates[column] = date(column_year, MONTHS[cell.lower()], 1).isoformat()
+        return dates
+
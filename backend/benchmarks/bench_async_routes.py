@@ -0,0 +1,104 @@
+"""
+Benchmark: sync (threadpool) vs async (DB executor) request paths.
+
+Fires batches of concurrent requests at twin endpoints - the async routes
+the API ships and sync `def` copies of them registered only for this
+benchmark - and reports requests per second.
+
+Runs against a temporary copy of laundry.db, so the shipped database is
+never modified. Usage (from backend/):
+    python benchmarks/bench_async_routes.py [--requests 2000] [--concurrency 1 16 64 256]
+"""
+import argparse
+import asyncio
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+# Point the app at a scratch database before importing it
+_tmp_dir = tempfile.mkdtemp()
+os.environ["DATABASE_PATH"] = str(Path(_tmp_dir) / "bench.db")
+shutil.copy(BACKEND_DIR / "laundry.db", os.environ["DATABASE_PATH"])
+
+import httpx  # noqa: E402
+
+from app.main import app  # noqa: E402
+from app.models import CostCalculationRequest  # noqa: E402
+from app.repositories import ConfigurationRepository  # noqa: E402
+from app.services import CostCalculatorService, CostResultCache  # noqa: E402
+
+
+@app.get("/bench/sync/configurations")
+def sync_configurations():
+    return ConfigurationRepository.get_all_formatted()
+
+
+@app.post("/bench/sync/calculate-cost")
+def sync_calculate_cost(data: CostCalculationRequest):
+    return CostCalculatorService.calculate(data)
+
+
+def cost_payload(i: int) -> dict:
+    """Distinct payloads so every request misses the result cache."""
+    return {
+        "electricity_rate": 0.25,
+        "water_rate": 3.5,
+        "labor_rate": 12.0,
+        "season": "summer",
+        "tariff_mode": "standard",
+        "cycles_per_month": 100 + i,
+    }
+
+
+async def run(client: httpx.AsyncClient, method: str, url: str, total: int, concurrency: int) -> float:
+    """Send `total` requests with at most `concurrency` in flight; return req/s."""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i: int) -> None:
+        async with semaphore:
+            if method == "GET":
+                response = await client.get(url)
+            else:
+                response = await client.post(url, json=cost_payload(i))
+            response.raise_for_status()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(total)))
+    return total / (time.perf_counter() - started)
+
+
+async def main(total: int, levels: list) -> None:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        scenarios = [
+            ("GET configurations", "GET", "/bench/sync/configurations", "/api/configurations"),
+            ("POST calculate-cost", "POST", "/bench/sync/calculate-cost", "/api/calculate-cost"),
+        ]
+        print(f"{'endpoint':<22}{'concurrency':>12}{'sync req/s':>14}{'async req/s':>14}{'ratio':>8}")
+        for name, method, sync_url, async_url in scenarios:
+            for concurrency in levels:
+                CostResultCache.clear()
+                sync_rps = await run(client, method, sync_url, total, concurrency)
+                CostResultCache.clear()
+                async_rps = await run(client, method, async_url, total, concurrency)
+                print(
+                    f"{name:<22}{concurrency:>12}{sync_rps:>14.0f}{async_rps:>14.0f}"
+                    f"{async_rps / sync_rps:>8.2f}"
+                )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 16, 64, 256])
+    args = parser.parse_args()
+    try:
+        asyncio.run(main(args.requests, args.concurrency))
+    finally:
+        shutil.rmtree(_tmp_dir, ignore_errors=True)
@@ -0,0 +1,106 @@
+"""
+Benchmark: batched demand forecast vs a per-location fitting loop.
+
+Seeds a scratch copy of laundry.db with daily occupancy and laundry kg
+readings for many locations, then times:
+  - loop:   one least-squares fit per location (the naive path, here only
+            for comparison)
+  - batch:  DemandForecastService._fit over the whole (location, day) array
+  - day:    a full daily refit and forecast, including the readings query
+  - month:  a full monthly refit and forecast from the month rollups
+
+Usage (from backend/):
+    python benchmarks/bench_demand_forecast.py [--locations 200] [--days 730]
+"""
+import argparse
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import time
+import uuid
+from datetime import date, timedelta
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+# Point the app at a scratch database before importing it
+_tmp_dir = tempfile.mkdtemp()
+os.environ["DATABASE_PATH"] = str(Path(_tmp_dir) / "bench.db")
+shutil.copy(BACKEND_DIR / "laundry.db", os.environ["DATABASE_PATH"])
+
+import numpy as np  # noqa: E402
+
+from app.database import get_db, init_db  # noqa: E402
+from app.models import DemandForecastRequest  # noqa: E402
+from app.repositories import MeterReadingRepository, MeterRollupRepository  # noqa: E402
+from app.services import DemandForecastService  # noqa: E402
+
+
+def seed(locations: int, days: int) -> list:
+    """Daily occupancy and kg of `locations` new locations; returns their ids."""
+    rng = np.random.default_rng(0)
+    first = date(2024, 1, 1)
+    dates = [(first + timedelta(days=d)).isoformat() for d in range(days)]
+    ids = [str(uuid.uuid4()) for _ in range(locations)]
+    with get_db() as conn:
+        cursor = conn.cursor()
+        cursor.executemany(
+            "INSERT INTO locations (id, name, created_at) VALUES (?, ?, ?)",
+            [(location_id, f"Bench {location_id[:8]}", first.isoformat()) for location_id in ids]
+        )
+        for location_id in ids:
+            occupancy = rng.uniform(0.3, 1.0, days)
+            kg = 10 + rng.uniform(20, 80) * occupancy + rng.normal(0, 2, days)
+            rows = [(location_id, "Occupancy", day, float(value), "bench") for day, value in zip(dates, occupancy)]
+            rows += [(location_id, "Laundry / kg", day, float(value), "bench") for day, value in zip(dates, kg)]
+            MeterReadingRepository.upsert_many(cursor, rows)
+            MeterRollupRepository.refresh(cursor, rows)
+        conn.commit()
+    return ids
+
+
+def timed(func, *args) -> float:
+    """Wall time (ms) of one call."""
+    started = time.perf_counter()
+    func(*args)
+    return (time.perf_counter() - started) * 1000
+
+
+def loop_fit(drivers: np.ndarray, target: np.ndarray) -> None:
+    for location in range(drivers.shape[0]):
+        mask = np.isfinite(target[location]) & np.isfinite(drivers[location]).all(axis=1)
+        design = np.column_stack([np.ones(mask.sum()), drivers[location][mask]])
+        np.linalg.lstsq(design, target[location][mask], rcond=None)
+
+
+def main(locations: int, days: int) -> None:
+    logging.disable(logging.INFO)
+    init_db()
+    started = time.perf_counter()
+    ids = seed(locations, days)
+    print(f"seeded {locations} locations x {days} days in {time.perf_counter() - started:.1f}s")
+
+    _, _, values, _ = DemandForecastService._load(["Occupancy", "Laundry / kg"], "day", ids)
+    drivers, target = values[:, :, :1], values[:, :, 1]
+    print(f"{'path':<10}{'ms':>10}")
+    print(f"{'loop':<10}{timed(loop_fit, drivers, target):>10.1f}")
+    print(f"{'batch':<10}{timed(DemandForecastService._fit, drivers, target, 0.1):>10.1f}")
+    for resolution, periods in (("day", 365), ("month", 12)):
+        request = DemandForecastRequest(
+            sets_metric=None, location_ids=ids, resolution=resolution, start="2026-01-01", periods=periods
+        )
+        print(f"{resolution:<10}{timed(DemandForecastService.run, request):>10.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--locations", type=int, default=200)
+    parser.add_argument("--days", type=int, default=730)
+    args = parser.parse_args()
+    try:
+        main(args.locations, args.days)
+    finally:
+        shutil.rmtree(_tmp_dir, ignore_errors=True)
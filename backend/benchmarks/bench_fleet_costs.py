@@ -0,0 +1,108 @@
+"""
+Benchmark: pricing many configurations with mixed fleets in one batch.
+
+Seeds a scratch copy of laundry.db with washing, drying and ironing machine
+models, then times CostCalculatorService.calculate_batch for requests whose
+fleets mix several of those models per stage, against the same requests
+with a single machine per stage.
+
+Usage (from backend/):
+    python benchmarks/bench_fleet_costs.py [--requests 2000] [--models 6] [--repeat 5]
+"""
+import argparse
+import logging
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+# Point the app at a scratch database before importing it
+_tmp_dir = tempfile.mkdtemp()
+os.environ["DATABASE_PATH"] = str(Path(_tmp_dir) / "bench.db")
+shutil.copy(BACKEND_DIR / "laundry.db", os.environ["DATABASE_PATH"])
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.main import app  # noqa: E402
+from app.models import CostCalculationRequest  # noqa: E402
+from app.services import CostCalculatorService  # noqa: E402
+
+BASE = {
+    "electricity_rate": 0.25, "water_rate": 3.5, "labor_rate": 12.0,
+    "season": "summer", "tariff_mode": "standard", "operational_volume": 4000.0,
+}
+
+
+def seed(client: TestClient, models: int) -> dict:
+    """IDs of new machine models of every kind."""
+    catalog = {"washing": [], "drying": [], "ironing": []}
+    for index in range(models):
+        machines = {
+            "washing": {"capacity_kg": 8.0 + 4 * (index % 5), "water_consumption_l": 50.0 + 10 * index,
+                        "energy_consumption_kwh": 1.5 + index % 4, "cycle_duration_min": 60},
+            "drying": {"capacity_kg": 10.0 + 5 * (index % 3), "energy_consumption_kwh_per_cycle": 3.0 + index % 5},
+            "ironing": {"ironing_labor_hours": 10.0, "energy_consumption_kwh_per_hour": 2.0 + index % 3},
+        }
+        for kind, machine in machines.items():
+            response = client.post(f"/api/{kind}-machines", json={"model": f"Bench {kind} {index}", **machine})
+            catalog[kind].append(response.json()["id"])
+    return catalog
+
+
+def requests_for(catalog: dict, count: int, fleets: bool) -> list:
+    """Requests with random fleets, or with the first model of each fleet alone."""
+    rng = random.Random(7)
+    requests = []
+    for _ in range(count):
+        machines = [
+            {"kind": kind, "machine_id": machine_id, "quantity": rng.randint(1, 4)}
+            for kind, ids in catalog.items()
+            for machine_id in rng.sample(ids, rng.randint(1, len(ids)))
+        ]
+        data = {**BASE, "cycles_per_month": rng.randint(100, 600),
+                "fleet_allocation": rng.choice(["capacity", "efficiency"])}
+        if fleets:
+            data["machines"] = machines
+        else:
+            singles = {}
+            for machine in machines:
+                singles.setdefault(f"{machine['kind']}_machine_id", machine["machine_id"])
+            data.update(singles)
+        requests.append(CostCalculationRequest(**data))
+    return requests
+
+
+def main(count: int, models: int, repeat: int) -> None:
+    logging.disable(logging.INFO)
+    client = TestClient(app)
+    catalog = seed(client, models)
+
+    print(f"{count} requests, {models} models per stage")
+    for label, fleets in (("single machines", False), ("mixed fleets", True)):
+        requests = requests_for(catalog, count, fleets)
+        entries = sum(len(r.machines) for r in requests)
+        samples = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            CostCalculatorService.calculate_batch(requests)
+            samples.append((time.perf_counter() - started) * 1000)
+        samples.sort()
+        print(f"{label:>16}: {entries:>6} fleet entries, median {samples[len(samples) // 2]:.1f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--models", type=int, default=6)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    try:
+        main(args.requests, args.models, args.repeat)
+    finally:
+        shutil.rmtree(_tmp_dir, ignore_errors=True)
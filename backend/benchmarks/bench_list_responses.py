@@ -0,0 +1,106 @@
+"""
+Benchmark: Pydantic response_model list path vs pre-encoded orjson path.
+
+Seeds a scratch copy of laundry.db with catalog rows and configurations,
+then times full-list GETs through:
+  - pydantic:  rows -> dicts -> response_model validation -> JSON (the old path,
+               registered here only for the benchmark)
+  - cold:      rows -> orjson, encoded-body cache cleared before each request
+  - warm:      encoded body served from the per-version cache
+  - warm+gzip: as warm, with gzip negotiated (compressed once, then cached)
+
+Usage (from backend/):
+    python benchmarks/bench_list_responses.py [--rows 20000] [--repeat 20]
+"""
+import argparse
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+# Point the app at a scratch database before importing it
+_tmp_dir = tempfile.mkdtemp()
+os.environ["DATABASE_PATH"] = str(Path(_tmp_dir) / "bench.db")
+shutil.copy(BACKEND_DIR / "laundry.db", os.environ["DATABASE_PATH"])
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.main import app  # noqa: E402
+from app.models import Configuration, WashingMachine  # noqa: E402
+from app.repositories import ConfigurationRepository, WashingMachineRepository  # noqa: E402
+from app.routes.encoded import EncodedResponseCache  # noqa: E402
+
+
+@app.get("/bench/pydantic/washing-machines", response_model=list[WashingMachine])
+def pydantic_washing_machines():
+    return WashingMachineRepository.get_all()
+
+
+@app.get("/bench/pydantic/configurations", response_model=list[Configuration])
+def pydantic_configurations():
+    return ConfigurationRepository.get_all_formatted()
+
+
+def seed(client: TestClient, rows: int) -> None:
+    machine = {"model": "Bench Washer", "capacity_kg": 8.0, "water_consumption_l": 50.0,
+               "energy_consumption_kwh": 1.5, "cycle_duration_min": 60}
+    client.post("/api/washing-machines/bulk", json={"items": [machine] * rows})
+    config = {"electricity_rate": 0.25, "water_rate": 3.5, "labor_rate": 12.0,
+              "season": "summer", "tariff_mode": "standard", "cycles_per_month": 100}
+    items = [{**config, "name": f"Bench Config {i}"} for i in range(rows)]
+    client.post("/api/configurations/bulk", json={"items": items})
+
+
+def timed(client: TestClient, url: str, repeat: int, encoding: str = "identity",
+          clear: bool = False) -> tuple:
+    """Median latency (ms) and wire size (bytes) of `repeat` GETs."""
+    samples = []
+    size = 0
+    for _ in range(repeat):
+        if clear:
+            EncodedResponseCache.clear()
+        started = time.perf_counter()
+        response = client.get(url, headers={"Accept-Encoding": encoding})
+        samples.append((time.perf_counter() - started) * 1000)
+        response.raise_for_status()
+        size = int(response.headers.get("content-length", len(response.content)))
+    samples.sort()
+    return samples[len(samples) // 2], size
+
+
+def main(rows: int, repeat: int) -> None:
+    logging.disable(logging.INFO)
+    client = TestClient(app)
+    seed(client, rows)
+
+    print(f"{'endpoint':<22}{'path':<12}{'median ms':>11}{'bytes':>12}")
+    for name, api_url, pydantic_url in [
+        ("washing-machines", "/api/washing-machines", "/bench/pydantic/washing-machines"),
+        ("configurations", "/api/configurations", "/bench/pydantic/configurations"),
+    ]:
+        client.get(api_url)  # load the catalog snapshot
+        for path, args in [
+            ("pydantic", (pydantic_url, repeat)),
+            ("cold", (api_url, repeat, "identity", True)),
+            ("warm", (api_url, repeat)),
+            ("warm+gzip", (api_url, repeat, "gzip")),
+        ]:
+            ms, size = timed(client, *args)
+            print(f"{name:<22}{path:<12}{ms:>11.1f}{size:>12}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    try:
+        main(args.rows, args.repeat)
+    finally:
+        shutil.rmtree(_tmp_dir, ignore_errors=True)
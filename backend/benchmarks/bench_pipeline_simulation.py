@@ -0,0 +1,65 @@
+"""
+Benchmark: discrete-event simulation of a month of wash -> dry -> iron.
+
+Times PipelineSimulationService.run on a scratch copy of laundry.db for
+sites of growing volume, staffed so the pipeline roughly keeps up, and
+reports the number of events processed.
+
+Usage (from backend/):
+    python benchmarks/bench_pipeline_simulation.py [--days 30] [--repeat 5]
+"""
+import argparse
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+# Point the app at a scratch database before importing it
+_tmp_dir = tempfile.mkdtemp()
+os.environ["DATABASE_PATH"] = str(Path(_tmp_dir) / "bench.db")
+shutil.copy(BACKEND_DIR / "laundry.db", os.environ["DATABASE_PATH"])
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.main import app  # noqa: E402
+from app.models import PipelineSimulationRequest  # noqa: E402
+from app.services import PipelineSimulationService  # noqa: E402
+
+
+def main(days: int, repeat: int) -> None:
+    logging.disable(logging.INFO)
+    client = TestClient(app)
+    washer = client.get("/api/washing-machines").json()[0]["id"]
+    dryer = client.get("/api/drying-machines").json()[0]["id"]
+
+    print(f"{'kg/month':>10}{'units':>7}{'events':>9}{'median ms':>11}{'finished kg':>13}  bottleneck")
+    for volume, units in ((3000, 2), (15000, 8), (60000, 30), (150000, 75)):
+        request = PipelineSimulationRequest(
+            washing_machine_id=washer, drying_machine_id=dryer, operational_volume=volume,
+            washers=units, dryers=units, ironers=units // 2 + 1, operators=units // 2 + 1, days=days,
+        )
+        samples = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            result = PipelineSimulationService.run(request)
+            samples.append((time.perf_counter() - started) * 1000)
+        samples.sort()
+        print(f"{volume:>10}{units:>7}{result.events:>9}{samples[len(samples) // 2]:>11.1f}"
+              f"{result.finished_kg:>13.0f}  {result.bottleneck}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    try:
+        main(args.days, args.repeat)
+    finally:
+        shutil.rmtree(_tmp_dir, ignore_errors=True)
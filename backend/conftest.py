@@ -0,0 +1,55 @@
+"""
+Shared pytest fixtures.
+"""
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+# Snapshot of laundry.db as shipped, taken before any test module imports
+# the app (which migrates the database on startup)
+_shipped_db = sqlite3.connect(":memory:")
+_source = sqlite3.connect(Path(__file__).parent / "laundry.db")
+_source.backup(_shipped_db)
+_source.close()
+
+
+@pytest.fixture
+def shipped_db(tmp_path) -> Path:
+    """Path to a fresh copy of the shipped (unmigrated) laundry.db."""
+    path = tmp_path / "laundry.db"
+    copy = sqlite3.connect(path)
+    _shipped_db.backup(copy)
+    copy.close()
+    return path
+
+
+@pytest.fixture
+def isolated_db(tmp_path, monkeypatch) -> Path:
+    """
+    Point the app at a migrated copy of the shipped laundry.db for one test,
+    for tests that write more than they clean up (e.g. readings imports).
+    """
+    from app.config import settings
+    from app.database import close_pools, init_db
+    from app.repositories import CatalogCache
+    from app.routes.encoded import EncodedResponseCache
+    from app.services import CostResultCache
+    
+    def forget_cached_data():
+        # Cache keys embed table versions, which both databases share
+        CatalogCache.invalidate()
+        CostResultCache.clear()
+        EncodedResponseCache.clear()
+    
+    path = tmp_path / "isolated.db"
+    copy = sqlite3.connect(path)
+    _shipped_db.backup(copy)
+    copy.close()
+    monkeypatch.setattr(settings, "DB_PATH", path)
+    init_db()
+    forget_cached_data()
+    yield path
+    close_pools()
+    monkeypatch.undo()
+    forget_cached_data()
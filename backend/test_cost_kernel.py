@@ -0,0 +1,344 @@
+"""
+Equivalence tests for the pure cost kernel.
+Checks that every entry point (scalar service, batch, sweep, finance-team
+module) produces the same numbers as the original scalar formulas.
+Run with: pytest test_cost_kernel.py -v
+"""
+import importlib.util
+import random
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Add parent to path for imports
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app.models import (
+    CostCalculationRequest, CostSweepRequest,
+    WashingMachineCreate, DryingMachineCreate, IroningMachineCreate, ChemicalCreate,
+)
+from app.repositories import (
+    WashingMachineRepository, DryingMachineRepository,
+    IroningMachineRepository, ChemicalRepository,
+)
+from app.services import CostCalculatorService, CostSweepService
+from app.services.cost_kernel import (
+    BREAKDOWN_DECIMALS, KERNEL_INPUTS, compute_costs, fleet_spec_inputs, round_breakdowns, round_columns,
+    spec_inputs,
+)
+
+
+def reference_calculate(data, washing_machine, drying_machine, ironing_machine, chemicals):
+    """The original scalar formulas of CostCalculatorService.calculate (unrounded)."""
+    season_multiplier = 1.0
+    electricity_tariff_multiplier = data['electricity_tariff_price'] or 1.0
+    water_tariff_multiplier = data['water_tariff_price'] or 1.0
+    cycles = data['cycles_per_month']
+
+    monthly_water_m3 = 0.0
+    monthly_washing_kwh = 0.0
+    if washing_machine:
+        monthly_water_m3 = washing_machine['water_consumption_l'] / 1000 * cycles
+        monthly_washing_kwh = washing_machine['energy_consumption_kwh'] * cycles
+
+    if data['operational_volume'] > 0:
+        total_kg_processed = data['operational_volume']
+    elif washing_machine:
+        effective_capacity = washing_machine['capacity_kg'] * (data['washing_load_percentage'] / 100)
+        total_kg_processed = effective_capacity * cycles
+    else:
+        total_kg_processed = 0.0
+
+    monthly_drying_kwh = 0.0
+    drying_labor_hours = 0.0
+    if drying_machine:
+        effective_drying_capacity = drying_machine['capacity_kg'] * (data['drying_load_percentage'] / 100)
+        drying_cycles = total_kg_processed / effective_drying_capacity if effective_drying_capacity > 0 else 0
+        monthly_drying_kwh = drying_machine['energy_consumption_kwh_per_cycle'] * drying_cycles
+        if total_kg_processed > 0:
+            drying_labor_hours = (drying_cycles * 5.0) / 60
+
+    ironing_hours = data['ironing_labor_hours']
+    monthly_ironing_kwh = 0.0
+    if ironing_machine:
+        monthly_ironing_kwh = ironing_machine['energy_consumption_kwh_per_hour'] * ironing_hours
+
+    monthly_electricity_kwh = monthly_washing_kwh + monthly_drying_kwh + monthly_ironing_kwh
+    monthly_water_cost = monthly_water_m3 * data['water_rate'] * season_multiplier * water_tariff_multiplier
+    monthly_electricity_cost = (
+        monthly_electricity_kwh * data['electricity_rate'] * season_multiplier * electricity_tariff_multiplier
+    )
+    monthly_chemical_cost = 0.0
+    for chem in chemicals:
+        monthly_chemical_cost += (chem['package_price'] / chem['package_amount']) * chem['usage_per_cycle'] * cycles
+
+    monthly_labor_hours = (cycles * 5.0) / 60 + drying_labor_hours + ironing_hours
+    monthly_labor_cost = monthly_labor_hours * data['labor_rate']
+
+    monthly_transport_cost = 0.0
+    if data['transport_enabled']:
+        if data['transport_mode'] == "fixed":
+            monthly_transport_cost = data['transport_fixed_cost']
+        else:
+            monthly_transport_cost = (
+                data['transport_distance_km'] * data['transport_fuel_rate'] +
+                data['transport_time_hours'] * data['transport_labor_rate']
+            )
+
+    total_monthly_cost = (
+        monthly_electricity_cost + monthly_water_cost + monthly_chemical_cost +
+        monthly_labor_cost + monthly_transport_cost
+    )
+    per_kg = lambda value: value / total_kg_processed if total_kg_processed > 0 else 0  # noqa: E731
+    return {
+        "cost_per_kg": per_kg(total_monthly_cost),
+        "electricity_cost_per_kg": per_kg(monthly_electricity_cost),
+        "water_cost_per_kg": per_kg(monthly_water_cost),
+        "chemical_cost_per_kg": per_kg(monthly_chemical_cost),
+        "labor_cost_per_kg": per_kg(monthly_labor_cost),
+        "transport_cost_per_kg": per_kg(monthly_transport_cost),
+        "monthly_electricity_kwh": monthly_electricity_kwh,
+        "monthly_electricity_cost": monthly_electricity_cost,
+        "monthly_water_m3": monthly_water_m3,
+        "monthly_water_cost": monthly_water_cost,
+        "monthly_chemical_cost": monthly_chemical_cost,
+        "monthly_labor_hours": monthly_labor_hours,
+        "monthly_labor_cost": monthly_labor_cost,
+        "monthly_ironing_hours": ironing_hours,
+        "monthly_transport_cost": monthly_transport_cost,
+        "total_monthly_cost": total_monthly_cost,
+        "total_kg_processed": total_kg_processed,
+        "cost_per_cycle": total_monthly_cost / cycles if cycles > 0 else 0,
+    }
+
+
+def random_request(rng, washing_ids, drying_ids, ironing_ids, chemical_ids):
+    """A random request, including edge cases (no machines, zero tariffs, transport modes)."""
+    return {
+        "electricity_rate": rng.uniform(0, 1),
+        "water_rate": rng.uniform(0, 6),
+        "labor_rate": rng.uniform(0, 25),
+        "season": rng.choice(["summer", "winter", "spring"]),
+        "tariff_mode": "standard",
+        "electricity_tariff_price": rng.choice([0.0, 1.0, rng.uniform(0.5, 2)]),
+        "water_tariff_price": rng.choice([0.0, 1.0, rng.uniform(0.5, 2)]),
+        "cycles_per_month": rng.randint(0, 400),
+        "washing_load_percentage": rng.choice([0.0, rng.uniform(10, 100)]),
+        "drying_load_percentage": rng.choice([0.0, rng.uniform(10, 100)]),
+        "ironing_labor_hours": rng.uniform(0, 40),
+        "operational_volume": rng.choice([0.0, rng.uniform(1, 5000)]),
+        "washing_machine_id": rng.choice(washing_ids + [None]),
+        "drying_machine_id": rng.choice(drying_ids + [None]),
+        "ironing_machine_id": rng.choice(ironing_ids + [None]),
+        "chemical_ids": rng.sample(chemical_ids, rng.randint(0, len(chemical_ids))),
+        "transport_enabled": rng.random() < 0.5,
+        "transport_mode": rng.choice(["fixed", "calculated"]),
+        "transport_fixed_cost": rng.uniform(0, 500),
+        "transport_distance_km": rng.uniform(0, 100),
+        "transport_time_hours": rng.uniform(0, 8),
+        "transport_labor_rate": rng.uniform(0, 20),
+        "transport_fuel_rate": rng.uniform(0, 1),
+    }
+
+
+@pytest.fixture(scope="module")
+def catalog():
+    """Machines and chemicals created for the test, removed afterwards."""
+    washing = [
+        WashingMachineRepository.create(WashingMachineCreate(
+            model=f"Kernel Washer {i}", capacity_kg=cap, water_consumption_l=water,
+            energy_consumption_kwh=energy, cycle_duration_min=60,
+        ))
+        for i, (cap, water, energy) in enumerate([(8.0, 50.0, 1.5), (23.0, 160.0, 4.2)])
+    ]
+    drying = [
+        DryingMachineCreate(model="Kernel Dryer 0", capacity_kg=10.0, energy_consumption_kwh_per_cycle=3.0),
+        DryingMachineCreate(model="Kernel Dryer 1", capacity_kg=0.0, energy_consumption_kwh_per_cycle=2.0),
+    ]
+    drying = [DryingMachineRepository.create(machine) for machine in drying]
+    ironing = [IroningMachineRepository.create(IroningMachineCreate(
+        model="Kernel Ironer", ironing_labor_hours=10.0, energy_consumption_kwh_per_hour=2.5,
+    ))]
+    chemicals = [
+        ChemicalRepository.create(ChemicalCreate(
+            name=f"Kernel Chemical {i}", type="detergent", package_price=price,
+            package_amount=amount, usage_per_cycle=usage,
+        ))
+        for i, (price, amount, usage) in enumerate([(1400.0, 15000.0, 135.0), (850.0, 4000.0, 160.0), (30.0, 5.0, 0.1)])
+    ]
+    yield {
+        "washing": {m["id"]: m for m in washing},
+        "drying": {m["id"]: m for m in drying},
+        "ironing": {m["id"]: m for m in ironing},
+        "chemicals": {c["id"]: c for c in chemicals},
+    }
+    for record in washing:
+        WashingMachineRepository.delete(record["id"])
+    for record in drying:
+        DryingMachineRepository.delete(record["id"])
+    for record in ironing:
+        IroningMachineRepository.delete(record["id"])
+    for record in chemicals:
+        ChemicalRepository.delete(record["id"])
+
+
+@pytest.fixture(scope="module")
+def requests_payloads(catalog):
+    rng = random.Random(1234)
+    return [
+        random_request(
+            rng, list(catalog["washing"]), list(catalog["drying"]),
+            list(catalog["ironing"]), list(catalog["chemicals"]),
+        )
+        for _ in range(300)
+    ]
+
+
+def kernel_inputs_for(payload, catalog):
+    """Kernel inputs built directly from plain specs, without the database."""
+    request = CostCalculationRequest(**payload)
+    return {
+        **CostCalculatorService._request_inputs(request),
+        **spec_inputs(
+            catalog["washing"].get(payload["washing_machine_id"]),
+            catalog["drying"].get(payload["drying_machine_id"]),
+            catalog["ironing"].get(payload["ironing_machine_id"]),
+            [catalog["chemicals"][cid] for cid in payload["chemical_ids"]],
+        ),
+    }
+
+
+class TestKernelMatchesReference:
+    """The kernel reproduces the original scalar formulas."""
+
+    def test_scalar_kernel_matches_reference(self, catalog, requests_payloads):
+        for payload in requests_payloads:
+            expected = reference_calculate(
+                payload,
+                catalog["washing"].get(payload["washing_machine_id"]),
+                catalog["drying"].get(payload["drying_machine_id"]),
+                catalog["ironing"].get(payload["ironing_machine_id"]),
+                [catalog["chemicals"][cid] for cid in payload["chemical_ids"]],
+            )
+            actual = compute_costs(kernel_inputs_for(payload, catalog))
+            for name, value in expected.items():
+                assert float(actual[name]) == pytest.approx(value, rel=1e-12, abs=1e-12), name
+
+    def test_array_kernel_matches_scalar_kernel(self, catalog, requests_payloads):
+        rows = [kernel_inputs_for(payload, catalog) for payload in requests_payloads]
+        columns = {name: np.array([row[name] for row in rows], dtype=float) for name in KERNEL_INPUTS}
+        vectorized = compute_costs(columns)
+        for i, row in enumerate(rows):
+            scalar = compute_costs(row)
+            for name, value in scalar.items():
+                assert vectorized[name][i] == value, name
+
+    def test_rounding_matches_python_round(self):
+        # np.round scales, rounds and scales back, so halves can land the other way
+        results = {name: np.zeros(2) for name in BREAKDOWN_DECIMALS}
+        results["cost_per_kg"] = np.array([0.00025, 1.5])
+        results["total_monthly_cost"] = np.array([0.015, 2.0])
+        columns = round_columns(results)
+        assert columns["cost_per_kg"] == [round(0.00025, 4), 1.5]
+        assert columns["total_monthly_cost"] == [round(0.015, 2), 2.0]
+        rows = list(round_breakdowns(results))
+        assert [row["cost_per_kg"] for row in rows] == columns["cost_per_kg"]
+
+    def test_kernel_needs_no_specs(self):
+        result = compute_costs({"cycles_per_month": 100, "labor_rate": 12.0, "operational_volume": 500.0})
+        assert result["monthly_labor_hours"].shape == ()
+        assert float(result["total_monthly_cost"]) == pytest.approx((100 * 5.0 / 60 + 10.0) * 12.0)
+
+
+class TestEntryPointsAgree:
+    """Every entry point returns identical breakdowns."""
+
+    def test_service_matches_batch(self, requests_payloads):
+        requests = [CostCalculationRequest(**payload) for payload in requests_payloads]
+        batch = CostCalculatorService.calculate_batch(requests)
+        for request, result in zip(requests, batch):
+            assert CostCalculatorService.calculate(request) == result
+
+    def test_finance_module_is_the_backend_service(self, requests_payloads):
+        module_path = Path(__file__).parent.parent / "backend_calculation_code" / "cost_calculator.py"
+        spec = importlib.util.spec_from_file_location("finance_cost_calculator", module_path)
+        finance = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(finance)
+
+        assert finance.CostCalculatorService is CostCalculatorService
+        request = CostCalculationRequest(**requests_payloads[0])
+        assert finance.CostCalculatorService.calculate(request) == CostCalculatorService.calculate(request)
+
+    def test_sweep_matches_service(self, requests_payloads):
+        base = CostCalculationRequest(**requests_payloads[1])
+        cycles = [0, 75, 210]
+        sweep = CostSweepService.run(CostSweepRequest(
+            base=base, ranges=[{"field": "cycles_per_month", "values": cycles}],
+        ))
+        for i, value in enumerate(cycles):
+            single = CostCalculatorService.calculate(base.model_copy(update={"cycles_per_month": value}))
+            for name, column in sweep.results.items():
+                assert column[i] == getattr(single, name), name
+
+
+class TestFleetSpecInputs:
+    """Mixed fleets price like their machines run separately."""
+
+    def test_collapses_fleets_per_scenario(self):
+        inputs = {"washing_load_percentage": [80.0, 50.0], "drying_capacity_kg": [7.0, 9.0]}
+        fleet = {
+            "scenario": [0, 0, 1], "stage": [0, 0, 0], "quantity": [1, 3, 2],
+            "capacity_kg": [8.0, 16.0, 10.0], "water_consumption_l": [40.0, 80.0, 50.0],
+            "energy_kwh": [1.0, 3.0, 2.0],
+        }
+        specs = fleet_spec_inputs(inputs, fleet, [False, False])
+        # Every unit runs the same number of cycles
+        assert specs["washing_capacity_kg"].tolist() == pytest.approx([14.0, 10.0])
+        assert specs["washing_water_consumption_l"].tolist() == pytest.approx([70.0, 50.0])
+        # Stages without a fleet keep their specs
+        assert specs["drying_capacity_kg"].tolist() == [7.0, 9.0]
+
+    def test_fleet_matches_models_priced_separately(self, catalog, requests_payloads):
+        (small, large), (dryer, no_capacity) = catalog["washing"].values(), catalog["drying"].values()
+        payload = {**requests_payloads[0], "operational_volume": 0.0,
+                   "washing_load_percentage": 75.0, "drying_load_percentage": 90.0}
+        request = CostCalculationRequest(**payload, machines=[
+            {"kind": "washing", "machine_id": small["id"], "quantity": 2},
+            {"kind": "washing", "machine_id": large["id"]},
+            {"kind": "drying", "machine_id": dryer["id"]},
+            {"kind": "drying", "machine_id": no_capacity["id"], "quantity": 5},
+        ])
+        result = compute_costs(CostCalculatorService.build_kernel_inputs([request]))
+
+        cycles = {small["id"]: request.cycles_per_month * 2 / 3, large["id"]: request.cycles_per_month / 3}
+        washers = [small, large]
+        kg = sum(cycles[m["id"]] * m["capacity_kg"] for m in washers) * request.washing_load_percentage / 100
+        # A model without capacity takes no laundry
+        drying_cycles = kg / (dryer["capacity_kg"] * request.drying_load_percentage / 100)
+        kwh = (
+            sum(cycles[m["id"]] * m["energy_consumption_kwh"] for m in washers) +
+            drying_cycles * dryer["energy_consumption_kwh_per_cycle"] +
+            result["monthly_ironing_hours"][0] * (
+                catalog["ironing"][payload["ironing_machine_id"]]["energy_consumption_kwh_per_hour"]
+                if payload["ironing_machine_id"] in catalog["ironing"] else 0.0
+            )
+        )
+        assert result["total_kg_processed"][0] == pytest.approx(kg)
+        assert result["monthly_water_m3"][0] == pytest.approx(
+            sum(cycles[m["id"]] * m["water_consumption_l"] for m in washers) / 1000
+        )
+        assert result["monthly_electricity_kwh"][0] == pytest.approx(kwh)
+
+    def test_efficiency_shifts_volume_to_cheaper_models(self):
+        inputs = {"electricity_rate": [0.3], "labor_rate": [0.0]}
+        fleet = {
+            "scenario": [0, 0], "stage": [1, 1], "quantity": [1, 1],
+            "capacity_kg": [10.0, 10.0], "water_consumption_l": [0.0, 0.0], "energy_kwh": [2.0, 6.0],
+        }
+        by_capacity = fleet_spec_inputs(inputs, fleet, [False])
+        by_efficiency = fleet_spec_inputs(inputs, fleet, [True])
+        assert by_capacity["drying_energy_consumption_kwh_per_cycle"][0] == pytest.approx(4.0)
+        # Three times as expensive per kg, so a third of the share
+        assert by_efficiency["drying_energy_consumption_kwh_per_cycle"][0] == pytest.approx((2.0 * 3 + 6.0) / 4)
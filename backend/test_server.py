@@ -2,6 +2,7 @@
 Backend API Tests for Laundry Digital Twin
 Run with: pytest test_server.py -v
 """
+import math
 import pytest
 import sys
 from pathlib import Path
@@ -24,6 +25,165 @@ class TestHealthCheck:
         assert response.json() == {"message": "Laundry Digital Twin API"}
 
 
+class TestDatabasePool:
+    """Test pooled SQLite connections."""
+    
+    def test_connections_are_reused_with_pragmas(self):
+        from app.database import get_db
+        
+        with get_db() as conn:
+            first_id = id(conn)
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+            assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+            assert conn.execute("PRAGMA busy_timeout").fetchone()[0] == 5000
+            assert conn.execute("PRAGMA foreign_keys").fetchone()[0] == 1
+            # Nested use in the same thread shares the connection
+            with get_db() as nested:
+                assert nested is conn
+        with get_db() as conn:
+            assert id(conn) == first_id
+        
+        stats = client.get("/api/health/db").json()
+        assert stats["checkouts"] > 0
+        assert stats["size"] <= stats["max_size"]
+    
+    def test_waits_for_free_connection_when_exhausted(self, monkeypatch, tmp_path):
+        import threading
+        import time
+        from app.config import settings
+        from app.database import ConnectionPool
+        
+        monkeypatch.setattr(settings, "DB_POOL_SIZE", 1)
+        pool = ConnectionPool(str(tmp_path / "pool.db"))
+        held = pool.acquire()
+        threading.Timer(0.1, pool.release, args=(held,)).start()
+        
+        started = time.perf_counter()
+        conn = pool.acquire()
+        assert conn is held
+        assert time.perf_counter() - started >= 0.05
+        stats = pool.stats()
+        assert stats["waits"] == 1
+        assert stats["wait_time_max_ms"] > 0
+        pool.release(conn)
+        pool.close()
+    
+    def test_deleting_a_location_deletes_its_data(self, isolated_db):
+        from app.database import get_db
+        from app.repositories import MeterReadingRepository, MeterRollupRepository
+        
+        location_id = client.post("/api/locations", json={"name": "Cascade Location"}).json()["id"]
+        client.put(f"/api/tariffs/{location_id}", json={"hourly_prices": [0.2] * 24})
+        readings = [(location_id, "Occupancy", "2024-01-0" + str(day), 0.5, None) for day in (1, 2)]
+        tables = ("meter_readings", "meter_rollups", "electricity_tariffs")
+        
+        def counts():
+            with get_db() as conn:
+                return [
+                    conn.execute(f"SELECT COUNT(*) FROM {table} WHERE location_id = ?", (location_id,)).fetchone()[0]
+                    for table in tables
+                ]
+        
+        with get_db() as conn:
+            MeterReadingRepository.upsert_many(conn.cursor(), readings)
+            MeterRollupRepository.refresh(conn.cursor(), readings)
+            conn.commit()
+        assert all(counts())
+        
+        # Foreign keys are enforced, so the location's rows go with it
+        assert client.delete(f"/api/locations/{location_id}").status_code == 200
+        assert counts() == [0, 0, 0]
+
+
+class TestMigrations:
+    """Test versioned schema migrations."""
+    
+    def test_migrates_copy_of_shipped_database(self, shipped_db):
+        import sqlite3
+        from app.migrations import LATEST_VERSION, current_version, migrate
+        
+        conn = sqlite3.connect(shipped_db)
+        conn.execute("INSERT INTO locations (id, name, created_at) VALUES ('dup-1', 'Dup', 'x')")
+        conn.execute("INSERT INTO locations (id, name, created_at) VALUES ('dup-2', 'Dup', 'x')")
+        conn.execute(
+            "UPDATE configurations SET chemical_ids = chemical_ids || ',deleted-chemical' "
+            "WHERE rowid = (SELECT MIN(rowid) FROM configurations)"
+        )
+        conn.commit()
+        chemical_ids = dict(conn.execute("SELECT id, chemical_ids FROM configurations"))
+        counts = {
+            table: conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+            for table in ("locations", "washing_machines", "chemicals", "configurations")
+        }
+        
+        assert migrate(conn) == list(range(1, LATEST_VERSION + 1))
+        assert current_version(conn) == LATEST_VERSION
+        assert migrate(conn) == []  # nothing left to do
+        
+        indexes = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        assert {"idx_configurations_name", "idx_configurations_updated_at",
+                "idx_locations_name", "idx_chemicals_type",
+                "idx_meter_readings_location_date"} <= indexes
+        for table, count in counts.items():
+            assert conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0] == count
+        names = [row[0] for row in conn.execute("SELECT name FROM locations WHERE id LIKE 'dup-%' ORDER BY id")]
+        assert names == ["Dup", "Dup (dup-2)"]
+        
+        plan = conn.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM chemicals WHERE type = 'detergent'"
+        ).fetchall()
+        assert "idx_chemicals_type" in str(plan)
+        
+        # chemical_ids strings were moved to configuration_chemicals
+        columns = [row[1] for row in conn.execute("PRAGMA table_info(configurations)")]
+        assert "chemical_ids" not in columns
+        for config_id, ids in chemical_ids.items():
+            linked = [row[0] for row in conn.execute(
+                "SELECT chemical_id FROM configuration_chemicals WHERE configuration_id = ? ORDER BY position",
+                (config_id,)
+            )]
+            assert linked == [cid for cid in ids.split(',') if cid]
+        
+        # Every configuration starts its history with a full snapshot
+        revisions = conn.execute(
+            "SELECT COUNT(*) FROM configuration_revisions WHERE revision = 1 AND snapshot IS NOT NULL"
+        ).fetchone()[0]
+        assert revisions == counts["configurations"]
+        conn.close()
+    
+    def test_keeps_configurations_with_duplicate_names(self, shipped_db):
+        import sqlite3
+        from app.migrations import migrate
+        
+        conn = sqlite3.connect(shipped_db)
+        source_id, name = conn.execute("SELECT id, name FROM configurations LIMIT 1").fetchone()
+        chemical_id = conn.execute("SELECT id FROM chemicals LIMIT 1").fetchone()[0]
+        columns = [row[1] for row in conn.execute("PRAGMA table_info(configurations)")]
+        copied = ', '.join(col for col in columns if col not in ('id', 'chemical_ids', 'updated_at'))
+        for i, updated_at in enumerate(["2020-01-01", "2030-01-01"]):
+            conn.execute(
+                f"""INSERT INTO configurations (id, chemical_ids, updated_at, {copied})
+                SELECT ?, ?, ?, {copied} FROM configurations WHERE id = ?""",
+                (f"dup-config-{i}", chemical_id, updated_at, source_id)
+            )
+        conn.commit()
+        count = conn.execute("SELECT COUNT(*) FROM configurations").fetchone()[0]
+        
+        migrate(conn)
+        # Every row survives, with its chemical links; the latest keeps the name
+        assert conn.execute("SELECT COUNT(*) FROM configurations").fetchone()[0] == count
+        names = dict(conn.execute("SELECT id, name FROM configurations WHERE name LIKE ?", (f"{name}%",)))
+        assert names["dup-config-1"] == name
+        assert names["dup-config-0"] == f"{name} (dup-conf)"
+        assert names[source_id] == f"{name} ({source_id[:8]})"
+        for config_id in ("dup-config-0", "dup-config-1"):
+            linked = conn.execute(
+                "SELECT chemical_id FROM configuration_chemicals WHERE configuration_id = ?", (config_id,)
+            ).fetchall()
+            assert linked == [(chemical_id,)]
+        conn.close()
+
+
 class TestLocations:
     """Test location CRUD operations."""
     
@@ -53,6 +213,36 @@ class TestLocations:
         
         # Cleanup
         client.delete(f"/api/locations/{loc_id}")
+    
+    def test_concurrent_duplicates_fail_cleanly(self):
+        from concurrent.futures import ThreadPoolExecutor
+        
+        def create(_):
+            return client.post("/api/locations", json={"name": "Concurrent Location"})
+        
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            responses = list(pool.map(create, range(8)))
+        
+        created = [r.json() for r in responses if r.status_code == 200]
+        assert len(created) == 1
+        assert sorted(r.status_code for r in responses) == [200] + [400] * 7
+        client.delete(f"/api/locations/{created[0]['id']}")
+    
+    def test_rename_to_existing_name_fails(self):
+        first = client.post("/api/locations", json={"name": "Rename Test A"}).json()
+        second = client.post("/api/locations", json={"name": "Rename Test B"}).json()
+        
+        response = client.put(f"/api/locations/{second['id']}", json={"name": "Rename Test A"})
+        assert response.status_code == 400
+        # Keeping its own name is not a conflict
+        response = client.put(f"/api/locations/{second['id']}", json={"name": "Rename Test B"})
+        assert response.status_code == 200
+        names = {loc["id"]: loc["name"] for loc in client.get("/api/locations").json()}
+        assert names[first["id"]] == "Rename Test A"
+        assert names[second["id"]] == "Rename Test B"
+        
+        client.delete(f"/api/locations/{first['id']}")
+        client.delete(f"/api/locations/{second['id']}")
 
 
 class TestWashingMachines:
@@ -79,6 +269,697 @@ class TestWashingMachines:
         assert isinstance(response.json(), list)
 
 
+class TestBulkOperations:
+    """Test bulk upsert and delete endpoints."""
+    
+    machine = {
+        "model": "Bulk Washer",
+        "capacity_kg": 8.0,
+        "water_consumption_l": 50.0,
+        "energy_consumption_kwh": 1.5,
+        "cycle_duration_min": 60
+    }
+    
+    def test_bulk_upsert_reports_row_errors(self):
+        items = [{**self.machine, "model": f"Bulk Washer {i}"} for i in range(50)]
+        items.insert(10, {"model": "Missing fields"})
+        response = client.post("/api/washing-machines/bulk", json={"items": items})
+        assert response.status_code == 200
+        data = response.json()
+        assert len(data["created"]) == 50
+        assert [err["index"] for err in data["errors"]] == [10]
+        assert "capacity_kg" in data["errors"][0]["detail"]
+        
+        # Re-sending rows with their ids updates them
+        updates = [{**self.machine, "id": mid, "capacity_kg": 12.0} for mid in data["created"][:5]]
+        data2 = client.post("/api/washing-machines/bulk", json={"items": updates}).json()
+        assert data2["updated"] == data["created"][:5]
+        assert data2["created"] == [] and data2["errors"] == []
+        from app.repositories import WashingMachineRepository
+        assert WashingMachineRepository.get_by_id(data["created"][0])["capacity_kg"] == 12.0
+        
+        result = client.post(
+            "/api/washing-machines/bulk-delete",
+            json={"ids": data["created"] + ["missing-id", data["created"][0], "missing-id"]}
+        ).json()
+        # Repeated IDs are deleted (or reported missing) once
+        assert result["deleted"] == data["created"]
+        assert result["errors"] == [{"index": 50, "id": "missing-id", "detail": "Not found"}]
+    
+    def test_bulk_upsert_by_name(self):
+        name = "Bulk Location Test"
+        first = client.post("/api/locations/bulk", json={"items": [{"name": name}]}).json()
+        again = client.post("/api/locations/bulk", json={"items": [{"name": name}]}).json()
+        assert again["updated"] == first["created"]
+        
+        chemical = {"name": "Bulk Chem", "type": "detergent", "package_price": 10.0,
+                    "package_amount": 1000.0, "usage_per_cycle": 50.0}
+        chemicals = client.post("/api/chemicals/bulk", json={"items": [chemical, chemical]}).json()["created"]
+        config = {
+            "name": "Bulk Config Test",
+            "electricity_rate": 0.25,
+            "water_rate": 3.5,
+            "labor_rate": 12.0,
+            "season": "summer",
+            "tariff_mode": "standard",
+            "cycles_per_month": 100,
+            "chemical_ids": chemicals + ["unknown-chemical"],
+            "transport_enabled": True
+        }
+        created = client.post("/api/configurations/bulk", json={"items": [config]}).json()
+        updated = client.post(
+            "/api/configurations/bulk", json={"items": [{**config, "cycles_per_month": 300}]}
+        ).json()
+        assert updated["updated"] == created["created"]
+        saved = next(c for c in client.get("/api/configurations").json() if c["name"] == config["name"])
+        assert saved["cycles_per_month"] == 300
+        # Unknown chemical IDs are kept as saved
+        assert saved["chemical_ids"] == chemicals + ["unknown-chemical"]
+        assert saved["transport_enabled"] is True
+        
+        client.post("/api/locations/bulk-delete", json={"ids": first["created"]})
+        client.post("/api/configurations/bulk-delete", json={"ids": created["created"]})
+        client.post("/api/chemicals/bulk-delete", json={"ids": chemicals})
+
+
+class TestListEndpoints:
+    """Test keyset pagination, filters and field projection on list endpoints."""
+    
+    def _pages(self, url, **params):
+        items, cursor = [], None
+        while True:
+            query = {**params, **({"cursor": cursor} if cursor else {})}
+            response = client.get(url, params=query)
+            assert response.status_code == 200
+            items.extend(response.json())
+            cursor = response.headers.get("x-next-cursor")
+            if not cursor:
+                return items
+    
+    def test_paginates_filters_and_projects_catalog(self):
+        machines = [
+            {"model": "Page Washer", "capacity_kg": float(i), "water_consumption_l": 50.0,
+             "energy_consumption_kwh": 1.5, "cycle_duration_min": 60}
+            for i in range(1, 26)
+        ]
+        ids = client.post("/api/washing-machines/bulk", json={"items": machines}).json()["created"]
+        
+        paged = self._pages("/api/washing-machines", model="Page Washer", limit=10)
+        assert [m["id"] for m in paged] == ids
+        
+        filtered = self._pages(
+            "/api/washing-machines", model="Page Washer",
+            capacity_min=5, capacity_max=14, limit=4, fields="capacity_kg"
+        )
+        assert [m["capacity_kg"] for m in filtered] == [float(i) for i in range(5, 15)]
+        assert set(filtered[0]) == {"id", "capacity_kg"}
+        
+        assert client.get("/api/washing-machines", params={"fields": "nope"}).status_code == 400
+        assert client.get("/api/washing-machines", params={"cursor": "!!"}).status_code == 400
+        client.post("/api/washing-machines/bulk-delete", json={"ids": ids})
+    
+    def test_paginates_configurations(self):
+        base = {"electricity_rate": 0.25, "water_rate": 3.5, "labor_rate": 12.0,
+                "tariff_mode": "standard", "cycles_per_month": 100}
+        items = [{**base, "name": f"Page Config {i}", "season": "page-test"} for i in range(7)]
+        ids = client.post("/api/configurations/bulk", json={"items": items}).json()["created"]
+        
+        paged = self._pages("/api/configurations", season="page-test", limit=3)
+        assert [c["id"] for c in paged] == ids
+        assert all(c["chemical_ids"] == [] for c in paged)
+        client.post("/api/configurations/bulk-delete", json={"ids": ids})
+
+
+class TestConditionalGet:
+    """Test ETag / If-None-Match handling on catalog and configuration reads."""
+    
+    machine = {
+        "model": "ETag Washer",
+        "capacity_kg": 8.0,
+        "water_consumption_l": 50.0,
+        "energy_consumption_kwh": 1.5,
+        "cycle_duration_min": 60
+    }
+    
+    def test_not_modified_until_table_changes(self):
+        first = client.get("/api/washing-machines")
+        etag = first.headers["etag"]
+        checkouts = client.get("/api/health/db").json()["checkouts"]
+        
+        cached = client.get("/api/washing-machines", headers={"If-None-Match": etag})
+        assert cached.status_code == 304
+        assert cached.content == b""
+        assert cached.headers["etag"] == etag
+        # No pooled connection was used to answer the 304
+        assert client.get("/api/health/db").json()["checkouts"] == checkouts
+        
+        # Other representations of the table get their own tag
+        assert client.get("/api/washing-machines", params={"limit": 1}).headers["etag"] != etag
+        # Writes to other tables keep it valid
+        chem = client.post("/api/chemicals", json={
+            "name": "ETag Chem", "type": "detergent", "package_price": 1.0,
+            "package_amount": 1.0, "usage_per_cycle": 1.0
+        }).json()
+        assert client.get("/api/washing-machines", headers={"If-None-Match": etag}).status_code == 304
+        
+        created = client.post("/api/washing-machines", json=self.machine).json()
+        changed = client.get("/api/washing-machines", headers={"If-None-Match": etag})
+        assert changed.status_code == 200
+        assert changed.headers["etag"] != etag
+        assert created["id"] in [m["id"] for m in changed.json()]
+        
+        client.delete(f"/api/washing-machines/{created['id']}")
+        client.delete(f"/api/chemicals/{chem['id']}")
+    
+    def test_latest_configuration(self):
+        config = {
+            "name": "ETag Config",
+            "electricity_rate": 0.25,
+            "water_rate": 3.5,
+            "labor_rate": 12.0,
+            "season": "summer",
+            "tariff_mode": "standard",
+            "cycles_per_month": 100
+        }
+        saved = client.post("/api/configurations", json=config).json()
+        latest = client.get("/api/configurations/latest")
+        etag = latest.headers["etag"]
+        assert client.get(
+            "/api/configurations/latest", headers={"If-None-Match": f'W/{etag}, "other"'}
+        ).status_code == 304
+        
+        client.post("/api/configurations", json={**config, "cycles_per_month": 200})
+        latest = client.get("/api/configurations/latest", headers={"If-None-Match": etag})
+        assert latest.status_code == 200
+        assert latest.json()["cycles_per_month"] == 200
+        client.delete(f"/api/configurations/{saved['id']}")
+
+
+class TestEncodedResponses:
+    """Test the pre-encoded, compressed list response path."""
+    
+    def test_bodies_cached_per_version_and_compressed(self):
+        from app.routes.encoded import EncodedResponseCache
+        
+        machines = [
+            {"model": f"Encoded Washer {i}", "capacity_kg": 8.0, "water_consumption_l": 50.0,
+             "energy_consumption_kwh": 1.5, "cycle_duration_min": 60}
+            for i in range(50)
+        ]
+        ids = client.post("/api/washing-machines/bulk", json={"items": machines}).json()["created"]
+        
+        plain = client.get("/api/washing-machines", headers={"Accept-Encoding": "identity"})
+        assert "content-encoding" not in plain.headers
+        hits = EncodedResponseCache.stats()["hits"]
+        compressed = client.get("/api/washing-machines", headers={"Accept-Encoding": "gzip"})
+        assert compressed.headers["content-encoding"] == "gzip"
+        assert compressed.headers["etag"] == f"W/{plain.headers['etag']}"
+        assert compressed.json() == plain.json()
+        assert EncodedResponseCache.stats()["hits"] == hits + 1
+        
+        # The weak tag revalidates too
+        assert client.get(
+            "/api/washing-machines", headers={"If-None-Match": compressed.headers["etag"]}
+        ).status_code == 304
+        
+        client.post("/api/washing-machines/bulk-delete", json={"ids": ids})
+        after = client.get("/api/washing-machines").json()
+        assert not set(ids) & {m["id"] for m in after}
+    
+    def test_negotiates_encoding(self):
+        from starlette.requests import Request
+        from app.routes.encoded import negotiate_encoding
+        
+        def request(accept):
+            return Request({"type": "http", "headers": [(b"accept-encoding", accept.encode())]})
+        
+        assert negotiate_encoding(request("gzip, deflate")) == "gzip"
+        assert negotiate_encoding(request("gzip;q=0, deflate")) is None
+        assert negotiate_encoding(request("identity")) is None
+
+
+class TestCatalogCache:
+    """Test the in-memory catalog snapshot and its invalidation."""
+    
+    machine = {
+        "model": "Cache Washer",
+        "capacity_kg": 8.0,
+        "water_consumption_l": 50.0,
+        "energy_consumption_kwh": 1.5,
+        "cycle_duration_min": 60
+    }
+    
+    def test_repository_writes_bump_version(self):
+        from app.repositories import CatalogCache
+        
+        before = CatalogCache.version("washing_machines")
+        created = client.post("/api/washing-machines", json=self.machine).json()
+        after_create = CatalogCache.version("washing_machines")
+        assert after_create > before
+        
+        client.put(f"/api/washing-machines/{created['id']}", json={**self.machine, "capacity_kg": 11.0})
+        assert CatalogCache.version("washing_machines") > after_create
+        assert CatalogCache.get("washing_machines", created["id"])["capacity_kg"] == 11.0
+        
+        client.delete(f"/api/washing-machines/{created['id']}")
+        assert CatalogCache.get("washing_machines", created["id"]) is None
+    
+    def test_sees_writes_from_other_processes(self, monkeypatch):
+        import sqlite3
+        from app.config import settings
+        from app.repositories import CatalogCache
+        
+        monkeypatch.setattr(settings, "CATALOG_CHECK_INTERVAL", 0.0)
+        created = client.post("/api/washing-machines", json=self.machine).json()
+        assert CatalogCache.get("washing_machines", created["id"])["capacity_kg"] == 8.0
+        
+        # Simulate another worker writing to the same database file
+        other = sqlite3.connect(settings.DB_PATH)
+        other.execute("UPDATE washing_machines SET capacity_kg = 20.0 WHERE id = ?", (created["id"],))
+        other.commit()
+        other.close()
+        
+        assert CatalogCache.get("washing_machines", created["id"])["capacity_kg"] == 20.0
+        client.delete(f"/api/washing-machines/{created['id']}")
+
+
+@pytest.mark.usefixtures("isolated_db")
+class TestReadingsImport:
+    """Test streaming import of wide meter-readings sheets."""
+    
+    SHEETS = Path(__file__).parent.parent / "docs" / "Excels"
+    MASARYKA = "Readings_Electricity_,Heating_,Water_TGM.xlsx - Masaryka 2019 - by H.S. (Heating Station).csv"
+    SENSORS = "Readings_Electricity_,Heating_,Water_TGM.xlsx - Sensor Analysis.csv"
+    
+    @staticmethod
+    def _location(name):
+        import uuid
+        response = client.post("/api/locations", json={"name": f"{name} {uuid.uuid4().hex[:8]}"})
+        return response.json()["id"]
+    
+    def test_parses_localized_numbers(self):
+        from app.services import parse_localized_number
+        
+        assert parse_localized_number("65,088Kč") == 65088
+        assert parse_localized_number("€69.20") == 69.2
+        assert parse_localized_number("46%") == 0.46
+        assert parse_localized_number("5,616.6Kč") == 5616.6
+        assert parse_localized_number("74\u00a0939 Kč") == 74939
+        assert parse_localized_number("1.234,5") == 1234.5
+        assert parse_localized_number("1,5") == 1.5
+        assert parse_localized_number("(12)") == -12
+        for text in (" -", "#DIV/0!", "перерасчет", ""):
+            assert parse_localized_number(text) is None
+    
+    def test_imports_monthly_sheet(self):
+        location_id = self._location("Masaryka")
+        body = (self.SHEETS / self.MASARYKA).read_bytes()
+        
+        response = client.post("/api/readings/import", params={"location_id": location_id}, content=body)
+        assert response.status_code == 200
+        result = response.json()
+        assert result["first_date"] == "2022-01-01"
+        assert result["readings"] > 1000 and result["skipped_cells"] > 0
+        
+        occupancy = client.get("/api/readings", params={"location_id": location_id, "metric": "Occupancy"}).json()
+        assert occupancy[0]["date"] == "2022-01-01" and occupancy[0]["value"] == 0.46
+        assert occupancy[12]["date"] == "2023-01-01"
+        
+        metrics = {m["metric"] for m in client.get("/api/readings/metrics", params={"location_id": location_id}).json()}
+        assert "Electricity / Meter reading Entrance, elevator, laundry High tariff" in metrics
+        assert "Water / Total payment" in metrics
+        
+        # Re-importing replaces values instead of duplicating them
+        again = client.post("/api/readings/import", params={"location_id": location_id}, content=body).json()
+        assert again["readings"] == result["readings"]
+        count = sum(m["readings"] for m in client.get("/api/readings/metrics", params={"location_id": location_id}).json())
+        assert count == result["readings"]
+    
+    def test_imports_daily_sheet_in_small_batches(self, monkeypatch):
+        from app.config import settings
+        monkeypatch.setattr(settings, "READINGS_BATCH_SIZE", 7)
+        monkeypatch.setattr(settings, "READINGS_SPOOL_MAX_BYTES", 1024)
+        location_id = self._location("TGM")
+        body = (self.SHEETS / self.SENSORS).read_bytes()
+        
+        response = client.post("/api/readings/import", params={"location_id": location_id}, content=body)
+        assert response.status_code == 400  # day.month columns need a year
+        
+        response = client.post("/api/readings/import", params={"location_id": location_id, "year": 2025}, content=body)
+        assert response.status_code == 200
+        result = response.json()
+        assert (result["first_date"], result["last_date"]) == ("2025-04-15", "2025-12-04")
+        
+        washes = client.get("/api/readings", params={
+            "location_id": location_id, "metric": "Laundry / Number of washes",
+            "start": "2025-04-16", "end": "2025-04-17",
+        }).json()
+        assert [(r["date"], r["value"]) for r in washes] == [("2025-04-16", 3), ("2025-04-17", 4)]
+    
+    def test_rejects_sheet_without_date_header(self):
+        body = b"a,1,2\nb,3,4\n"
+        response = client.post("/api/readings/import", params={"location_id": "missing"}, content=body)
+        assert response.status_code == 404
+        response = client.post("/api/readings/import", params={"location_id": self._location("X")}, content=body)
+        assert response.status_code == 400
+
+
+@pytest.mark.usefixtures("isolated_db")
+class TestReadingRollups:
+    """Test incrementally maintained weekly/monthly/yearly rollups."""
+    
+    SHEETS = TestReadingsImport.SHEETS
+    
+    def test_rollups_match_full_recomputation(self, monkeypatch):
+        import sqlite3
+        from app.config import settings
+        from app.migrations.m0008_meter_rollups import PERIOD_STARTS
+        monkeypatch.setattr(settings, "READINGS_BATCH_SIZE", 50)
+        location_id = TestReadingsImport._location("Sensors")
+        body = (self.SHEETS / TestReadingsImport.SENSORS).read_bytes()
+        assert client.post("/api/readings/import", params={"location_id": location_id, "year": 2025}, content=body).status_code == 200
+        
+        conn = sqlite3.connect(settings.DB_PATH)
+        for resolution, period_start in PERIOD_STARTS.items():
+            expected = conn.execute(
+                f"SELECT metric, {period_start}, COUNT(*), ROUND(SUM(value), 6), MIN(value), MAX(value) "
+                "FROM meter_readings WHERE location_id = ? GROUP BY 1, 2 ORDER BY 1, 2",
+                (location_id,)
+            ).fetchall()
+            stored = conn.execute(
+                "SELECT metric, period_start, count, ROUND(total, 6), minimum, maximum FROM meter_rollups "
+                "WHERE location_id = ? AND resolution = ? ORDER BY 1, 2",
+                (location_id, resolution)
+            ).fetchall()
+            assert stored == expected
+        conn.close()
+    
+    def test_query_picks_coarsest_rollup(self):
+        from datetime import date
+        from app.repositories import MeterRollupRepository
+        location_id = TestReadingsImport._location("Masaryka")
+        body = (self.SHEETS / TestReadingsImport.MASARYKA).read_bytes()
+        client.post("/api/readings/import", params={"location_id": location_id}, content=body)
+        query = {"location_id": location_id, "metric": "Occupancy"}
+        
+        years = client.get("/api/readings/rollups", params={**query, "start": "2022-01-01", "end": "2023-12-31"}).json()
+        assert [(p["resolution"], p["period_start"], p["count"]) for p in years] == [
+            ("year", "2022-01-01", 12), ("year", "2023-01-01", 12),
+        ]
+        months = client.get("/api/readings/rollups", params={**query, "start": "2022-03-01", "end": "2022-05-31"}).json()
+        assert [p["resolution"] for p in months] == ["month"] * 3
+        assert months[0]["average"] == 0.73
+        
+        # Weeks up to the month boundary, whole months, then a week and days
+        periods = MeterRollupRepository.decompose(date(2022, 1, 3), date(2023, 3, 15))
+        assert periods[:5] == [
+            ("week", date(2022, 1, 3)), ("week", date(2022, 1, 10)), ("week", date(2022, 1, 17)),
+            ("week", date(2022, 1, 24)), ("day", date(2022, 1, 31)),
+        ]
+        assert periods[5:18] == [("month", date(2022, m, 1)) for m in range(2, 13)] + [
+            ("month", date(2023, 1, 1)), ("month", date(2023, 2, 1)),
+        ]
+        assert periods[18:] == (
+            [("day", date(2023, 3, d)) for d in range(1, 6)]
+            + [("week", date(2023, 3, 6))]
+            + [("day", date(2023, 3, d)) for d in range(13, 16)]
+        )
+        
+        summary = client.get("/api/readings/summary", params={**query, "start": "2022-02-10", "end": "2024-06-30"}).json()
+        readings = client.get("/api/readings", params={**query, "start": "2022-02-10", "end": "2024-06-30"}).json()
+        assert summary["count"] == len(readings)
+        assert abs(summary["total"] - sum(r["value"] for r in readings)) < 1e-9
+        assert summary["periods"]["year"] == 1 and summary["periods"]["month"] == 16
+    
+    def test_readings_move_to_location_ids(self, shipped_db):
+        import sqlite3
+        from app.migrations import MIGRATIONS, migrate
+        
+        conn = sqlite3.connect(shipped_db)
+        migrate_to_7 = [m for m in MIGRATIONS if m.VERSION <= 7]
+        conn.execute("CREATE TABLE schema_migrations (version INTEGER PRIMARY KEY, name TEXT NOT NULL, applied_at TEXT NOT NULL)")
+        for migration in migrate_to_7:
+            migration.upgrade(conn.cursor())
+            conn.execute("INSERT INTO schema_migrations VALUES (?, 'm', 'x')", (migration.VERSION,))
+        existing = conn.execute("SELECT id, name FROM locations LIMIT 1").fetchone()
+        conn.executemany(
+            "INSERT INTO meter_readings (location, metric, date, value) VALUES (?, 'Occupancy', ?, ?)",
+            [(existing[1], "2024-01-01", 0.5), (existing[1], "2024-01-02", 0.7), ("Nowhere", "2024-01-01", 0.1)]
+        )
+        conn.commit()
+        
+        assert migrate(conn)[0] == 8
+        rows = conn.execute(
+            "SELECT l.name, r.date FROM meter_readings r JOIN locations l ON l.id = r.location_id ORDER BY 1, 2"
+        ).fetchall()
+        assert sorted(rows) == sorted([(existing[1], "2024-01-01"), (existing[1], "2024-01-02"), ("Nowhere", "2024-01-01")])
+        rollup = conn.execute(
+            "SELECT count, total FROM meter_rollups WHERE location_id = ? AND resolution = 'month'",
+            (existing[0],)
+        ).fetchone()
+        assert rollup == (2, 1.2)
+        conn.close()
+
+
+@pytest.mark.usefixtures("isolated_db")
+class TestDemandForecast:
+    """Test occupancy-driven demand forecasts."""
+    
+    BASE = {"electricity_rate": 0.25, "water_rate": 3.5, "labor_rate": 12.0,
+            "season": "summer", "tariff_mode": "standard", "cycles_per_month": 1}
+    SHEETS = TestReadingsImport.SHEETS
+    VOLUME = "Expenses Tasks for HSKP Optimization.xlsx - For Laundry - Volume.csv"
+    
+    def _import_site(self):
+        """A fresh location with the ML row of the volume sheet and the sensor sheet's occupancy."""
+        import uuid
+        name = f"ML {uuid.uuid4().hex[:8]}"
+        location_id = client.post("/api/locations", json={"name": name}).json()["id"]
+        volume = (self.SHEETS / self.VOLUME).read_text(encoding="utf-8").replace("\nML,", f"\n{name},")
+        response = client.post("/api/readings/import-sites", params={"year": 2025}, content=volume.encode())
+        assert response.status_code == 200
+        assert response.json()["readings"] >= 14
+        assert "FL" in response.json()["unmatched_sites"]
+        
+        sensors = (self.SHEETS / TestReadingsImport.SENSORS).read_bytes()
+        assert client.post("/api/readings/import", params={"location_id": location_id, "year": 2025}, content=sensors).status_code == 200
+        return location_id
+    
+    def test_imports_site_volumes(self):
+        location_id = self._import_site()
+        metrics = {m["metric"]: m for m in client.get("/api/readings/metrics", params={"location_id": location_id}).json()}
+        assert metrics["Laundry / kg"]["readings"] == 7
+        assert metrics["Laundry / kg"]["first_date"] == "2025-04-01"
+        readings = client.get("/api/readings", params={"location_id": location_id, "metric": "Laundry / kg"}).json()
+        assert [r["value"] for r in readings][:4] == [985, 694, 820, 1047]
+    
+    def test_forecast_feeds_cost_requests(self):
+        location_id = self._import_site()
+        forecast = {"location_ids": [location_id], "start": "2026-01-01", "periods": 12}
+        response = client.post("/api/forecast/demand", json=forecast)
+        assert response.status_code == 200
+        data = response.json()
+        assert len(data["periods"]) == 12
+        kg_fit = next(f for f in data["fits"] if f["metric"] == "Laundry / kg")
+        assert kg_fit["observations"] == 7
+        assert "Occupancy" in kg_fit["coefficients"]
+        assert all(p["kg"] is not None and p["kg"] >= 0 for p in data["periods"])
+        assert all(p["sets"] is not None for p in data["periods"])
+        
+        machine = client.get("/api/washing-machines").json()[0]
+        base = {**self.BASE, "washing_machine_id": machine["id"], "washing_load_percentage": 80}
+        response = client.post("/api/forecast/cost-requests", json={"base": base, "forecast": forecast})
+        assert response.status_code == 200
+        requests = response.json()
+        assert len(requests) == 12
+        capacity = machine["capacity_kg"] * 0.8
+        for item, period in zip(requests, data["periods"]):
+            assert item["period_start"] == period["period_start"]
+            assert item["request"]["operational_volume"] == round(period["kg"], 1)
+            assert item["request"]["cycles_per_month"] == math.ceil(period["kg"] / capacity)
+        batch = client.post("/api/calculate-cost/batch", json=[item["request"] for item in requests])
+        assert batch.status_code == 200
+    
+    def test_fit_is_vectorized_across_locations(self):
+        import numpy as np
+        from app.services import DemandForecastService
+        
+        rng = np.random.default_rng(7)
+        drivers = rng.uniform(0.3, 1.0, size=(50, 365, 2))
+        slopes = rng.uniform(50, 200, size=(50, 2))
+        target = 20 + np.einsum("ltk,lk->lt", drivers, slopes)
+        drivers[0, :, :] = np.nan  # no data: left unfitted
+        coefficients, mean, scale, observations, r2 = DemandForecastService._fit(drivers, target, ridge=0.0)
+        
+        assert np.isnan(coefficients[0]).all() and observations[0] == 0
+        assert np.allclose(coefficients[1:, 1:] / scale[1:], slopes[1:])
+        assert np.allclose(r2[1:], 1.0)
+    
+    def test_rejects_bad_requests(self):
+        assert client.post("/api/forecast/demand", json={"start": "2026-01-01", "periods": 0}).status_code == 400
+        assert client.post("/api/forecast/demand", json={"start": "2026-01-01", "resolution": "week"}).status_code == 400
+        response = client.post(
+            "/api/forecast/cost-requests",
+            json={"base": self.BASE, "forecast": {"start": "2026-01-01", "resolution": "day"}},
+        )
+        assert response.status_code == 400
+
+
+@pytest.mark.usefixtures("isolated_db")
+class TestTariffScheduling:
+    """Test time-of-use tariffs and cycle scheduling."""
+    
+    # Cheap nights (22:00-06:00), dear weekday evenings
+    TARIFF = {
+        "name": "Night saver",
+        "base_price": 0.30,
+        "periods": [
+            {"start_hour": 22, "end_hour": 6, "price": 0.10},
+            {"start_hour": 17, "end_hour": 20, "price": 0.45, "days": [0, 1, 2, 3, 4]},
+        ],
+    }
+    
+    @staticmethod
+    def _washer(duration=90, energy=2.0):
+        machine = {"model": "TOU Washer", "capacity_kg": 10.0, "water_consumption_l": 60.0,
+                   "energy_consumption_kwh": energy, "cycle_duration_min": duration}
+        return client.post("/api/washing-machines", json=machine).json()["id"]
+    
+    def test_expands_periods_to_hour_of_week_prices(self):
+        from app.models import TariffSchedule
+        from app.services import tariff_prices
+        
+        prices = tariff_prices(TariffSchedule(**self.TARIFF)).reshape(7, 24)
+        assert prices[0, 23] == prices[1, 0] == prices[6, 5] == 0.10
+        assert prices[2, 18] == 0.45
+        assert prices[5, 18] == prices[0, 12] == 0.30
+        assert tariff_prices(TariffSchedule(hourly_prices=list(range(24)))).shape == (168,)
+    
+    def test_stores_tariff_per_location(self):
+        location_id = TestReadingsImport._location("Tariff")
+        response = client.put(f"/api/tariffs/{location_id}", json=self.TARIFF)
+        assert response.status_code == 200
+        stored = client.get(f"/api/tariffs/{location_id}").json()
+        assert stored["name"] == "Night saver"
+        assert stored["periods"][1]["days"] == [0, 1, 2, 3, 4]
+        
+        assert client.put(f"/api/tariffs/{location_id}", json={"hourly_prices": [0.2] * 5}).status_code == 400
+        assert client.put("/api/tariffs/missing", json=self.TARIFF).status_code == 404
+        assert client.delete(f"/api/tariffs/{location_id}").status_code == 200
+        assert client.get(f"/api/tariffs/{location_id}").status_code == 404
+    
+    def test_schedules_cycles_into_cheapest_hours(self):
+        location_id = TestReadingsImport._location("Tariff")
+        client.put(f"/api/tariffs/{location_id}", json=self.TARIFF)
+        washer = self._washer()
+        payload = {
+            "location_id": location_id,
+            "start": "2026-03-02",
+            "days": 2,
+            "open_hour": 0,
+            "close_hour": 24,
+            "slot_minutes": 30,
+            "fleet": [{"kind": "washing", "machine_id": washer, "units": 2, "cycles": 10}],
+        }
+        response = client.post("/api/tariffs/schedule", json=payload)
+        assert response.status_code == 200
+        data = response.json()
+        group = data["groups"][0]
+        assert group["cycles_scheduled"] == 10
+        # Every cycle runs entirely within a 0.10 night window
+        assert data["cost"] == pytest.approx(10 * 2.0 * 0.10)
+        assert data["average_price"] == pytest.approx(0.10)
+        assert data["savings"] > 0
+        
+        # Never more than two machines running at once
+        from datetime import datetime, timedelta
+        running = {}
+        for start in group["starts"]:
+            begin = datetime.fromisoformat(start["start"])
+            for minute in range(0, 90, 30):
+                slot = begin + timedelta(minutes=minute)
+                assert slot.hour >= 22 or slot.hour < 6
+                running[slot] = running.get(slot, 0) + start["cycles"]
+        assert max(running.values()) <= 2
+    
+    def test_reports_cycles_that_do_not_fit(self):
+        washer = self._washer(duration=60)
+        payload = {
+            "tariff": {"hourly_prices": [0.2] * 24},
+            "start": "2026-03-02",
+            "days": 1,
+            "open_hour": 8,
+            "close_hour": 12,
+            "fleet": [{"kind": "washing", "machine_id": washer, "cycles": 6}],
+        }
+        group = client.post("/api/tariffs/schedule", json=payload).json()["groups"][0]
+        assert group["cycles_scheduled"] == 4
+        assert [s["start"] for s in group["starts"]] == [f"2026-03-02T{h:02d}:00" for h in range(8, 12)]
+        
+        payload["fleet"][0]["kind"] = "ironing"
+        assert client.post("/api/tariffs/schedule", json=payload).status_code == 400
+        payload["fleet"][0]["kind"] = "washing"
+        payload["slot_minutes"] = 7
+        assert client.post("/api/tariffs/schedule", json=payload).status_code == 400
+
+
+class TestPipelineSimulation:
+    """Test discrete-event simulation of the wash -> dry -> iron pipeline."""
+    
+    @staticmethod
+    def _payload(**overrides):
+        washer = client.get("/api/washing-machines").json()[0]
+        dryer = client.get("/api/drying-machines").json()[0]
+        return {
+            "washing_machine_id": washer["id"],
+            "drying_machine_id": dryer["id"],
+            "operational_volume": 1500.0,
+            "washers": 2,
+            "dryers": 2,
+            **overrides,
+        }
+    
+    def test_small_site_keeps_up(self):
+        response = client.post("/api/operations/simulate", json=self._payload())
+        assert response.status_code == 200
+        data = response.json()
+        assert data["keeps_up"] is True
+        assert data["arrived_kg"] == pytest.approx(1500 * 12 / 365 * 30, abs=0.5)
+        assert 0 < data["lead_time_hours"] < 48
+        
+        stages = {stage["name"]: stage for stage in data["stages"]}
+        assert list(stages) == ["washing", "drying", "ironing", "operators"]
+        # Nothing is created or lost between stages
+        assert data["arrived_kg"] >= stages["washing"]["kg"] >= stages["drying"]["kg"] >= stages["ironing"]["kg"]
+        assert stages["ironing"]["kg"] == pytest.approx(data["finished_kg"], abs=0.2)
+        assert all(0 <= stage["utilization"] <= 1 for stage in stages.values())
+    
+    def test_finds_the_bottleneck(self):
+        payload = self._payload(operational_volume=3000.0, washers=10, dryers=10, operators=4, ironing_kg_per_hour=5.0)
+        data = client.post("/api/operations/simulate", json=payload).json()
+        assert data["bottleneck"] == "ironing"
+        assert data["keeps_up"] is False
+        stages = {stage["name"]: stage for stage in data["stages"]}
+        assert stages["ironing"]["max_queue_kg"] > stages["washing"]["max_queue_kg"]
+        
+        payload = self._payload(operational_volume=20000.0, washers=1, dryers=4, operators=4, ironers=4)
+        assert client.post("/api/operations/simulate", json=payload).json()["bottleneck"] == "washing"
+        
+        payload = self._payload(ironers=0)
+        data = client.post("/api/operations/simulate", json=payload).json()
+        assert [stage["name"] for stage in data["stages"]] == ["washing", "drying", "operators"]
+    
+    def test_rejects_bad_requests(self):
+        assert client.post("/api/operations/simulate", json=self._payload(washers=0)).status_code == 400
+        assert client.post("/api/operations/simulate", json=self._payload(days=0)).status_code == 400
+        payload = self._payload(drying_machine_id="missing")
+        assert client.post("/api/operations/simulate", json=payload).status_code == 400
+        payload = self._payload(arrivals_per_day=10**8)
+        response = client.post("/api/operations/simulate", json=payload)
+        assert response.status_code == 400
+        assert "arrivals_per_day" in response.json()["detail"]
+
+
 class TestCostCalculation:
     """Test cost calculation endpoint."""
     
@@ -103,6 +984,583 @@ class TestCostCalculation:
         assert data["total_monthly_cost"] > 0
 
 
+class TestCostResultCache:
+    """Test memoization of cost results."""
+    
+    def test_repeated_request_hits_and_edit_invalidates(self):
+        machine = {
+            "model": "Memo Washer",
+            "capacity_kg": 8.0,
+            "water_consumption_l": 50.0,
+            "energy_consumption_kwh": 1.5,
+            "cycle_duration_min": 60
+        }
+        used = client.post("/api/washing-machines", json=machine).json()
+        unrelated = client.post("/api/washing-machines", json=machine).json()
+        payload = {
+            "electricity_rate": 0.25,
+            "water_rate": 3.5,
+            "labor_rate": 12.0,
+            "season": "summer",
+            "tariff_mode": "standard",
+            "cycles_per_month": 173,
+            "washing_machine_id": used["id"]
+        }
+        
+        first = client.post("/api/calculate-cost", json=payload).json()
+        stats = client.get("/api/calculate-cost/cache-stats").json()
+        assert client.post("/api/calculate-cost", json=payload).json() == first
+        assert client.get("/api/calculate-cost/cache-stats").json()["hits"] == stats["hits"] + 1
+        
+        # Editing a machine the result does not use keeps it cached
+        client.put(f"/api/washing-machines/{unrelated['id']}", json={**machine, "capacity_kg": 9.0})
+        client.post("/api/calculate-cost", json=payload)
+        assert client.get("/api/calculate-cost/cache-stats").json()["hits"] == stats["hits"] + 2
+        
+        # Editing the machine it uses invalidates it
+        client.put(f"/api/washing-machines/{used['id']}", json={**machine, "energy_consumption_kwh": 3.0})
+        updated = client.post("/api/calculate-cost", json=payload).json()
+        after = client.get("/api/calculate-cost/cache-stats").json()
+        assert after["invalidations"] == stats["invalidations"] + 1
+        assert updated["monthly_electricity_kwh"] > first["monthly_electricity_kwh"]
+        
+        client.delete(f"/api/washing-machines/{used['id']}")
+        client.delete(f"/api/washing-machines/{unrelated['id']}")
+    
+    def test_concurrent_identical_requests_are_coalesced(self, monkeypatch):
+        import threading
+        import time
+        from app.services import CostCalculatorService, CostResultCache
+        
+        CostResultCache.clear()
+        original = CostCalculatorService._calculate_uncached.__func__
+        calls = []
+        
+        def slow_calculate(cls, data):
+            calls.append(data)
+            time.sleep(0.3)
+            return original(cls, data)
+        
+        monkeypatch.setattr(CostCalculatorService, "_calculate_uncached", classmethod(slow_calculate))
+        payload = {
+            "electricity_rate": 0.31,
+            "water_rate": 3.5,
+            "labor_rate": 12.0,
+            "season": "summer",
+            "tariff_mode": "standard",
+            "cycles_per_month": 211
+        }
+        before = client.get("/api/calculate-cost/cache-stats").json()
+        barrier = threading.Barrier(10)
+        responses = []
+        
+        def send():
+            barrier.wait()
+            responses.append(client.post("/api/calculate-cost", json=payload).json())
+        
+        threads = [threading.Thread(target=send) for _ in range(10)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        assert len(calls) == 1
+        assert all(response == responses[0] for response in responses)
+        # Callers either joined the running calculation or, if they were
+        # queued behind it, found its memoized result
+        after = client.get("/api/calculate-cost/cache-stats").json()
+        assert after["coalesced"] > before["coalesced"]
+        assert (after["coalesced"] - before["coalesced"]) + (after["hits"] - before["hits"]) == 9
+    
+    def test_coalesced_requests_do_not_hold_database_threads(self, monkeypatch):
+        import threading
+        import time
+        from app.config import settings
+        from app.database import close_pools
+        from app.services import CostCalculatorService, CostResultCache, CostSingleFlight
+        
+        CostResultCache.clear()
+        original = CostCalculatorService._calculate_uncached.__func__
+        release = threading.Event()
+        
+        def held_calculate(cls, data):
+            release.wait(10)
+            return original(cls, data)
+        
+        monkeypatch.setattr(CostCalculatorService, "_calculate_uncached", classmethod(held_calculate))
+        # The held calculation occupies one database thread; the other must
+        # stay free for each waiter's cache lookup
+        monkeypatch.setattr(settings, "DB_EXECUTOR_THREADS", 2)
+        close_pools()
+        payload = {
+            "electricity_rate": 0.29,
+            "water_rate": 3.5,
+            "labor_rate": 12.0,
+            "season": "summer",
+            "tariff_mode": "standard",
+            "cycles_per_month": 197
+        }
+        before = CostSingleFlight.stats()["coalesced"]
+        responses = []
+        threads = [
+            threading.Thread(target=lambda: responses.append(client.post("/api/calculate-cost", json=payload)))
+            for _ in range(5)
+        ]
+        try:
+            for thread in threads:
+                thread.start()
+            deadline = time.monotonic() + 5
+            while CostSingleFlight.stats()["coalesced"] - before < 4 and time.monotonic() < deadline:
+                time.sleep(0.01)
+            coalesced = CostSingleFlight.stats()["coalesced"] - before
+        finally:
+            release.set()
+            for thread in threads:
+                thread.join()
+            close_pools()
+        
+        assert coalesced == 4
+        assert all(response.status_code == 200 for response in responses)
+        assert all(response.json() == responses[0].json() for response in responses)
+    
+    def test_requests_after_a_catalog_edit_do_not_join_stale_calculations(self, monkeypatch):
+        import threading
+        from app.services import CostCalculatorService, CostResultCache
+        
+        machine = {
+            "model": "Flight Washer",
+            "capacity_kg": 8.0,
+            "water_consumption_l": 50.0,
+            "energy_consumption_kwh": 1.5,
+            "cycle_duration_min": 60
+        }
+        washer = client.post("/api/washing-machines", json=machine).json()
+        CostResultCache.clear()
+        original = CostCalculatorService._calculate_uncached.__func__
+        computed, release = threading.Event(), threading.Event()
+        calls = []
+        
+        def held_calculate(cls, data):
+            calls.append(data)
+            result = original(cls, data)
+            if len(calls) == 1:
+                computed.set()
+                release.wait(5)
+            return result
+        
+        monkeypatch.setattr(CostCalculatorService, "_calculate_uncached", classmethod(held_calculate))
+        payload = {
+            "electricity_rate": 0.25,
+            "water_rate": 3.5,
+            "labor_rate": 12.0,
+            "season": "summer",
+            "tariff_mode": "standard",
+            "cycles_per_month": 187,
+            "washing_machine_id": washer["id"]
+        }
+        responses = []
+        stale = threading.Thread(
+            target=lambda: responses.append(client.post("/api/calculate-cost", json=payload).json())
+        )
+        stale.start()
+        computed.wait(5)
+        
+        # The running calculation priced the old specs, so this one runs on its own
+        client.put(f"/api/washing-machines/{washer['id']}", json={**machine, "energy_consumption_kwh": 3.0})
+        fresh = client.post("/api/calculate-cost", json=payload).json()
+        release.set()
+        stale.join()
+        
+        assert len(calls) == 2
+        assert fresh["monthly_electricity_kwh"] > responses[0]["monthly_electricity_kwh"]
+        client.delete(f"/api/washing-machines/{washer['id']}")
+
+
+class TestCostBatch:
+    """Test batch cost calculation endpoint."""
+    
+    def test_batch_matches_single_calculations(self):
+        base = {
+            "currency": "EUR",
+            "electricity_rate": 0.25,
+            "water_rate": 3.5,
+            "labor_rate": 12.0,
+            "season": "summer",
+            "tariff_mode": "standard",
+            "ironing_labor_hours": 10.0
+        }
+        payloads = [
+            {**base, "cycles_per_month": 200},
+            {**base, "cycles_per_month": 50, "operational_volume": 400.0},
+            {**base, "cycles_per_month": 120, "transport_enabled": True,
+             "transport_mode": "calculated", "transport_distance_km": 30.0,
+             "transport_fuel_rate": 0.4, "transport_time_hours": 2.0,
+             "transport_labor_rate": 15.0},
+        ]
+        response = client.post("/api/calculate-cost/batch", json=payloads)
+        assert response.status_code == 200
+        results = response.json()
+        assert len(results) == len(payloads)
+        for payload, result in zip(payloads, results):
+            single = client.post("/api/calculate-cost", json=payload).json()
+            assert result == pytest.approx(single)
+    
+    def test_empty_batch(self):
+        response = client.post("/api/calculate-cost/batch", json=[])
+        assert response.status_code == 200
+        assert response.json() == []
+    
+    def test_rejects_oversized_batch(self, monkeypatch):
+        from app.config import settings
+        monkeypatch.setattr(settings, "BATCH_MAX_REQUESTS", 3)
+        payload = {"electricity_rate": 0.25, "water_rate": 3.5, "labor_rate": 12.0,
+                   "season": "summer", "tariff_mode": "standard", "cycles_per_month": 100}
+        assert client.post("/api/calculate-cost/batch", json=[payload] * 3).status_code == 200
+        response = client.post("/api/calculate-cost/batch", json=[payload] * 4)
+        assert response.status_code == 400
+        assert "limit is 3" in response.json()["detail"]
+
+
+class TestCostSweep:
+    """Test parameter sweep endpoint."""
+    
+    base = {
+        "currency": "EUR",
+        "electricity_rate": 0.25,
+        "water_rate": 3.5,
+        "labor_rate": 12.0,
+        "season": "summer",
+        "tariff_mode": "standard",
+        "cycles_per_month": 200,
+        "operational_volume": 1000.0
+    }
+    
+    def test_sweep_grid_matches_single_calculations(self):
+        payload = {
+            "base": self.base,
+            "ranges": [
+                {"field": "cycles_per_month", "values": [100, 200, 300]},
+                {"field": "labor_rate", "start": 10.0, "stop": 20.0, "steps": 2}
+            ]
+        }
+        response = client.post("/api/calculate-cost/sweep", json=payload)
+        assert response.status_code == 200
+        data = response.json()
+        assert data["fields"] == ["cycles_per_month", "labor_rate"]
+        assert data["shape"] == [3, 2]
+        assert data["axes"]["labor_rate"] == [10.0, 20.0]
+        assert len(data["results"]["total_monthly_cost"]) == 6
+        
+        # Row-major order: the last field varies fastest
+        point = {**self.base, "cycles_per_month": 300, "labor_rate": 10.0}
+        single = client.post("/api/calculate-cost", json=point).json()
+        assert {name: values[4] for name, values in data["results"].items()} == single
+    
+    def test_sweep_rejects_unknown_field(self):
+        payload = {"base": self.base, "ranges": [{"field": "season", "values": [1.0]}]}
+        response = client.post("/api/calculate-cost/sweep", json=payload)
+        assert response.status_code == 400
+    
+    def test_sweep_rejects_oversized_grids_before_building_them(self, monkeypatch):
+        import numpy as np
+        from app.config import settings
+        
+        monkeypatch.setattr(settings, "SWEEP_MAX_POINTS", 100)
+        monkeypatch.setattr(np, "linspace", lambda *args, **kwargs: pytest.fail("axis was built"))
+        for ranges in (
+            [{"field": "cycles_per_month", "start": 0, "stop": 1, "steps": 10**10}],
+            [{"field": "cycles_per_month", "start": 0, "stop": 1, "steps": 0}],
+            [{"field": "cycles_per_month", "start": 0, "stop": 1, "steps": 20},
+             {"field": "labor_rate", "values": [1.0, 2.0, 3.0, 4.0, 5.0, 6.0]}],
+        ):
+            response = client.post("/api/calculate-cost/sweep", json={"base": self.base, "ranges": ranges})
+            assert response.status_code == 400
+
+
+class TestFleetSizing:
+    """Test mixed fleets of several machine models per stage."""
+    
+    base = TestCostSweep.base
+    
+    @pytest.fixture(autouse=True)
+    def _machines(self):
+        """Delete the machines a test created."""
+        self.created = []
+        yield
+        for kind, machine_id in self.created:
+            client.delete(f"/api/{kind}-machines/{machine_id}")
+    
+    def _machine(self, kind, model, **specs):
+        machine_id = client.post(f"/api/{kind}-machines", json={"model": model, **specs}).json()["id"]
+        self.created.append((kind, machine_id))
+        return machine_id
+    
+    def _washer(self, capacity, water, energy):
+        return self._machine("washing", "Fleet Washer", capacity_kg=capacity, water_consumption_l=water,
+                             energy_consumption_kwh=energy, cycle_duration_min=60)
+    
+    def _dryer(self, capacity, energy):
+        return self._machine("drying", "Fleet Dryer", capacity_kg=capacity, energy_consumption_kwh_per_cycle=energy)
+    
+    def test_single_model_fleet_matches_machine_ids(self):
+        washer = self._washer(12.0, 70.0, 2.5)
+        dryer = self._dryer(15.0, 5.0)
+        single = client.post("/api/calculate-cost", json={
+            **self.base, "washing_machine_id": washer, "drying_machine_id": dryer,
+        }).json()
+        for quantity in (1, 4):
+            fleet = client.post("/api/calculate-cost", json={
+                **self.base,
+                # A stage with a fleet ignores its single machine ID
+                "drying_machine_id": washer,
+                "machines": [
+                    {"kind": "washing", "machine_id": washer, "quantity": quantity},
+                    {"kind": "drying", "machine_id": dryer, "quantity": quantity},
+                ],
+            }).json()
+            assert fleet == single
+    
+    def test_capacity_allocation_shares_cycles_per_unit(self):
+        small, large = self._washer(10.0, 60.0, 2.0), self._washer(20.0, 100.0, 5.0)
+        small_dryer, large_dryer = self._dryer(10.0, 4.0), self._dryer(20.0, 6.0)
+        request = {
+            **self.base,
+            "operational_volume": 0.0,
+            "machines": [
+                {"kind": "washing", "machine_id": small, "quantity": 2},
+                {"kind": "washing", "machine_id": large},
+                {"kind": "drying", "machine_id": small_dryer},
+                {"kind": "drying", "machine_id": large_dryer},
+            ],
+        }
+        data = client.post("/api/calculate-cost", json=request).json()
+        
+        # Every washer runs the same number of the 200 cycles
+        assert data["monthly_water_m3"] == pytest.approx(200 * (2 * 60 + 100) / 3 / 1000, abs=0.01)
+        kg = 200 * (2 * 10 + 20) / 3 * 0.8
+        assert data["total_kg_processed"] == pytest.approx(kg, abs=0.01)
+        # Dryers take kg in proportion to capacity, i.e. the same cycles each
+        dryer_cycles = kg / (10 + 20) / 0.8
+        washing_kwh = 200 * (2 * 2 + 5) / 3
+        assert data["monthly_electricity_kwh"] == pytest.approx(washing_kwh + dryer_cycles * (4 + 6), abs=0.01)
+        
+        # The order of the fleet does not matter
+        reordered = client.post("/api/calculate-cost", json={**request, "machines": request["machines"][::-1]})
+        assert reordered.json() == data
+    
+    def test_efficiency_allocation_prefers_cheaper_models(self):
+        efficient, thirsty = self._dryer(20.0, 4.0), self._dryer(20.0, 12.0)
+        request = {
+            **self.base,
+            "machines": [
+                {"kind": "drying", "machine_id": efficient},
+                {"kind": "drying", "machine_id": thirsty},
+            ],
+        }
+        by_capacity = client.post("/api/calculate-cost", json=request).json()
+        by_efficiency = client.post("/api/calculate-cost", json={**request, "fleet_allocation": "efficiency"}).json()
+        assert by_efficiency["monthly_electricity_kwh"] < by_capacity["monthly_electricity_kwh"]
+        assert by_efficiency["cost_per_kg"] < by_capacity["cost_per_kg"]
+        # Same capacities, so both run the same drying cycles
+        assert by_efficiency["monthly_labor_hours"] == pytest.approx(by_capacity["monthly_labor_hours"], abs=0.01)
+    
+    def test_rejects_invalid_fleets_everywhere(self):
+        washer = self._washer(10.0, 60.0, 2.0)
+        invalid = [
+            {"fleet_allocation": "cheapest"},
+            {"machines": [{"kind": "folding", "machine_id": washer}]},
+            {"machines": [{"kind": "washing", "machine_id": washer, "quantity": 0}]},
+        ]
+        for fields in invalid:
+            request = {**self.base, **fields}
+            assert client.post("/api/calculate-cost", json=request).status_code == 422
+            assert client.post("/api/calculate-cost/batch", json=[request]).status_code == 422
+            config = {**request, "name": "Invalid Fleet Config"}
+            assert client.post("/api/configurations", json=config).status_code == 422
+            # Bulk saves report the row instead of storing it without the entry
+            bulk = client.post("/api/configurations/bulk", json={"items": [config]}).json()
+            assert bulk["created"] == [] and [e["index"] for e in bulk["errors"]] == [0]
+    
+    def test_sweep_reallocates_fleet_at_every_point(self):
+        # Per kg, the small dryer is cheaper at high electricity rates, the large one at low rates
+        small, large = self._dryer(10.0, 2.0), self._dryer(20.0, 8.0)
+        request = {
+            **self.base,
+            "fleet_allocation": "efficiency",
+            "machines": [
+                {"kind": "drying", "machine_id": small},
+                {"kind": "drying", "machine_id": large},
+            ],
+        }
+        for rate in (0.05, 2.0):
+            single = client.post("/api/calculate-cost", json={**request, "electricity_rate": rate}).json()
+            sweep = client.post("/api/calculate-cost/sweep", json={
+                "base": request, "ranges": [{"field": "electricity_rate", "values": [rate]}],
+            }).json()
+            assert {name: values[0] for name, values in sweep["results"].items()} == single
+    
+    def test_configuration_saves_fleet(self):
+        small, large = self._washer(10.0, 60.0, 2.0), self._washer(20.0, 100.0, 5.0)
+        config = {
+            **self.base,
+            "name": "Fleet Config",
+            "fleet_allocation": "efficiency",
+            "machines": [
+                {"kind": "washing", "machine_id": large, "quantity": 2},
+                {"kind": "washing", "machine_id": small},
+                {"kind": "washing", "machine_id": large},
+                {"kind": "washing", "machine_id": "no-such-machine"},
+            ],
+        }
+        saved = client.post("/api/configurations", json=config).json()
+        # Repeated models add up; unknown ones are kept and priced as missing
+        machines = [
+            {"kind": "washing", "machine_id": large, "quantity": 3},
+            {"kind": "washing", "machine_id": small, "quantity": 1},
+            {"kind": "washing", "machine_id": "no-such-machine", "quantity": 1},
+        ]
+        assert saved["machines"] == machines
+        assert saved["fleet_allocation"] == "efficiency"
+        listed = next(c for c in client.get("/api/configurations").json() if c["id"] == saved["id"])
+        assert listed["machines"] == machines
+        
+        client.post("/api/configurations", json={**config, "machines": machines[:1]})
+        revisions = client.get(f"/api/configurations/{saved['id']}/revisions").json()
+        assert revisions[-1]["changes"] == {"machines": machines[:1]}
+        
+        history = client.get(f"/api/configurations/{saved['id']}/cost-history").json()
+        direct = client.post("/api/calculate-cost", json={**config, "machines": machines[:1]}).json()
+        assert history[-1]["breakdown"] == direct
+        assert history[0]["breakdown"] != direct
+        assert history[0]["breakdown"] == client.post("/api/calculate-cost", json=config).json()
+        
+        client.delete(f"/api/configurations/{saved['id']}")
+
+
+class TestCostSimulation:
+    """Test Monte Carlo simulation endpoint."""
+    
+    payload = {
+        "base": {
+            "currency": "EUR",
+            "electricity_rate": 0.25,
+            "water_rate": 3.5,
+            "labor_rate": 12.0,
+            "season": "summer",
+            "tariff_mode": "standard",
+            "cycles_per_month": 200,
+            "operational_volume": 1000.0
+        },
+        "distributions": [
+            {"field": "labor_rate", "distribution": "normal", "mean": 12.0, "std": 1.5},
+            {"field": "operational_volume", "distribution": "uniform", "low": 800.0, "high": 1200.0},
+            {"field": "cycles_per_month", "distribution": "triangular", "low": 150, "mode": 200, "high": 260}
+        ],
+        "samples": 20000,
+        "seed": 42
+    }
+    
+    def test_simulation_is_reproducible(self):
+        first = client.post("/api/calculate-cost/simulate", json=self.payload)
+        second = client.post("/api/calculate-cost/simulate", json=self.payload)
+        assert first.status_code == 200
+        assert first.json() == second.json()
+        
+        total = first.json()["total_monthly_cost"]
+        assert set(total["percentiles"]) == {"p5", "p50", "p95"}
+        assert total["percentiles"]["p5"] <= total["percentiles"]["p50"] <= total["percentiles"]["p95"]
+        assert first.json()["seed"] == 42
+    
+    def test_simulation_rejects_unknown_distribution(self):
+        payload = {**self.payload, "distributions": [
+            {"field": "labor_rate", "distribution": "lognormal", "mean": 1.0, "std": 1.0}
+        ]}
+        response = client.post("/api/calculate-cost/simulate", json=payload)
+        assert response.status_code == 400
+
+
+class TestCostProjection:
+    """Test month-by-month cost projection endpoint."""
+    
+    base = TestCostSweep.base
+    
+    def test_projection_matches_single_calculations(self):
+        volumes = [900.0 + 50 * i for i in range(12)]
+        payload = {
+            "base": self.base,
+            "start": "2026-11",
+            "months": 14,
+            "profiles": {
+                "operational_volume": volumes,
+                "electricity_rate": [0.25 + 0.01 * i for i in range(14)],
+            },
+            "season_multipliers": {"winter": 1.15, "summer": 0.95},
+        }
+        response = client.post("/api/calculate-cost/projection", json=payload)
+        assert response.status_code == 200
+        data = response.json()
+        months = data["months"]
+        assert [m["month"] for m in months[:3]] == ["2026-11", "2026-12", "2027-01"]
+        assert [m["season"] for m in months[:3]] == ["autumn", "winter", "winter"]
+        
+        # 12-value profiles follow the calendar: January is index 0
+        assert months[2]["breakdown"]["total_kg_processed"] == volumes[0]
+        assert months[0]["breakdown"]["total_kg_processed"] == volumes[10]
+        
+        multiplier = months[1]["season_multiplier"]
+        assert multiplier == 1.15
+        # The request's season itself has no effect on the single calculation
+        single = client.post("/api/calculate-cost", json={
+            **self.base, "operational_volume": volumes[11], "electricity_rate": 0.26,
+        }).json()
+        assert months[1]["breakdown"]["monthly_water_cost"] == pytest.approx(single["monthly_water_cost"] * multiplier, abs=0.01)
+        assert months[1]["breakdown"]["monthly_labor_cost"] == single["monthly_labor_cost"]
+        
+        totals = data["totals"]
+        assert totals["total_cost"] == pytest.approx(sum(m["breakdown"]["total_monthly_cost"] for m in months), abs=0.05)
+        assert totals["total_kg_processed"] == pytest.approx(sum(volumes[10:] + volumes), abs=0.01)
+        assert totals["cost_per_kg"] == pytest.approx(totals["total_cost"] / totals["total_kg_processed"], abs=1e-4)
+    
+    def test_projection_rejects_bad_profiles(self):
+        for profiles in ({"season": [1.0] * 12}, {"water_rate": [1.0] * 5}):
+            payload = {"base": self.base, "start": "2026-01", "profiles": profiles}
+            assert client.post("/api/calculate-cost/projection", json=payload).status_code == 400
+        payload = {"base": self.base, "start": "January"}
+        assert client.post("/api/calculate-cost/projection", json=payload).status_code == 400
+
+
+class TestCostSensitivity:
+    """Test sensitivity analysis endpoint."""
+    
+    def test_sensitivity_elasticities(self):
+        payload = {
+            "base": {
+                "currency": "EUR",
+                "electricity_rate": 0.25,
+                "water_rate": 3.5,
+                "labor_rate": 12.0,
+                "season": "summer",
+                "tariff_mode": "standard",
+                "cycles_per_month": 200,
+                "operational_volume": 1000.0
+            },
+            "perturbation_percentage": 10.0
+        }
+        response = client.post("/api/calculate-cost/sensitivity", json=payload)
+        assert response.status_code == 200
+        data = response.json()
+        entries = {entry["field"]: entry for entry in data["entries"]}
+        
+        # Labor is the only cost without machines, so cost_per_kg moves 1:1 with it
+        assert entries["labor_rate"]["elasticities"]["cost_per_kg"] == pytest.approx(1.0)
+        assert entries["labor_rate"]["elasticities"]["labor_cost_per_kg"] == pytest.approx(1.0)
+        # Cost per kg is inversely proportional to volume
+        assert entries["operational_volume"]["elasticities"]["cost_per_kg"] < 0
+        # Sorted by absolute cost_per_kg elasticity
+        magnitudes = [abs(entry["elasticities"]["cost_per_kg"]) for entry in data["entries"]]
+        assert magnitudes == sorted(magnitudes, reverse=True)
+
+
 class TestConfigurations:
     """Test configuration CRUD operations."""
     
@@ -125,6 +1583,137 @@ class TestConfigurations:
     def test_get_latest_configuration(self):
         response = client.get("/api/configurations/latest")
         assert response.status_code == 200
+    
+    def test_chemical_links_and_impact(self):
+        chemical = {"name": "Impact Chem", "type": "softener", "package_price": 20.0,
+                    "package_amount": 1000.0, "usage_per_cycle": 50.0}
+        chem_id = client.post("/api/chemicals", json=chemical).json()["id"]
+        other_id = client.post("/api/chemicals", json=chemical).json()["id"]
+        config = {
+            "name": "Impact Config",
+            "electricity_rate": 0.25,
+            "water_rate": 3.5,
+            "labor_rate": 12.0,
+            "season": "summer",
+            "tariff_mode": "standard",
+            "cycles_per_month": 100,
+            "chemical_ids": [other_id, chem_id]
+        }
+        saved = client.post("/api/configurations", json=config).json()
+        assert saved["chemical_ids"] == [other_id, chem_id]
+        
+        impact = client.get(f"/api/chemicals/{chem_id}/impact").json()
+        assert [entry["configuration_id"] for entry in impact] == [saved["id"]]
+        before = impact[0]["breakdown"]["monthly_chemical_cost"]
+        client.put(f"/api/chemicals/{chem_id}", json={**chemical, "package_price": 40.0})
+        after = client.get(f"/api/chemicals/{chem_id}/impact").json()[0]["breakdown"]["monthly_chemical_cost"]
+        assert after == pytest.approx(before + 100 * 50 * 20.0 / 1000, abs=0.01)
+        
+        # Configurations keep the IDs of deleted (and not yet created) chemicals as saved
+        client.delete(f"/api/chemicals/{chem_id}")
+        latest = next(c for c in client.get("/api/configurations").json() if c["id"] == saved["id"])
+        assert latest["chemical_ids"] == [other_id, chem_id]
+        assert client.get(f"/api/chemicals/{chem_id}/impact").status_code == 404
+        resaved = client.post("/api/configurations", json={
+            **config, "chemical_ids": ["future-chemical", other_id, chem_id, other_id],
+        }).json()
+        assert resaved["chemical_ids"] == ["future-chemical", other_id, chem_id, other_id]
+        # ...and cost calculations skip the unknown ones
+        cost = client.post("/api/calculate-cost", json={**config, "chemical_ids": resaved["chemical_ids"]}).json()
+        assert cost["monthly_chemical_cost"] == pytest.approx(100 * 50 * 20.0 / 1000, abs=0.01)
+        impact = client.get(f"/api/chemicals/{other_id}/impact").json()
+        assert [entry["configuration_id"] for entry in impact] == [saved["id"]]
+        
+        client.delete(f"/api/configurations/{saved['id']}")
+        client.delete(f"/api/chemicals/{other_id}")
+    
+    def test_revision_history_and_as_of(self):
+        import time
+        from datetime import datetime, timezone
+        from app.repositories import ConfigurationRevisionRepository
+        
+        config = {
+            "name": "History Config",
+            "electricity_rate": 0.25,
+            "water_rate": 3.5,
+            "labor_rate": 12.0,
+            "season": "summer",
+            "tariff_mode": "standard",
+            "cycles_per_month": 100
+        }
+        saved_at = []
+        for i in range(20):
+            saved = client.post("/api/configurations", json={**config, "cycles_per_month": 100 + i}).json()
+            saved_at.append(saved["updated_at"])
+            time.sleep(0.002)
+        # Saving the same values again is not a new revision
+        client.post("/api/configurations", json={**config, "cycles_per_month": 119})
+        
+        revisions = client.get(f"/api/configurations/{saved['id']}/revisions").json()
+        assert [r["revision"] for r in revisions] == list(range(1, 21))
+        assert revisions[5]["changes"] == {"cycles_per_month": 105}
+        
+        # Revisions past a keyframe are rebuilt from it, not from revision 1
+        interval = ConfigurationRevisionRepository.KEYFRAME_INTERVAL
+        assert ConfigurationRevisionRepository._keyframe(interval + 3) == interval + 1
+        for i in (0, 7, interval, 19):
+            as_of = client.get(
+                f"/api/configurations/{saved['id']}/as-of", params={"timestamp": saved_at[i]}
+            ).json()
+            assert as_of["revision"] == i + 1
+            assert as_of["configuration"]["cycles_per_month"] == 100 + i
+        before = datetime(2000, 1, 1, tzinfo=timezone.utc).isoformat()
+        assert client.get(
+            f"/api/configurations/{saved['id']}/as-of", params={"timestamp": before}
+        ).status_code == 404
+        
+        history = client.get(f"/api/configurations/{saved['id']}/cost-history").json()
+        assert [h["revision"] for h in history] == list(range(1, 21))
+        single = client.post(
+            "/api/calculate-cost", json={**config, "cycles_per_month": 110, "operational_volume": 1000.0}
+        ).json()
+        assert history[10]["breakdown"] == single
+        assert len(client.get("/api/configurations/cost-history").json()) >= 20
+        
+        # Deleting a configuration deletes its history
+        client.delete(f"/api/configurations/{saved['id']}")
+        assert client.get(f"/api/configurations/{saved['id']}/revisions").status_code == 404
+        assert client.get(f"/api/configurations/{saved['id']}/cost-history").status_code == 404
+        everything = client.get("/api/configurations/cost-history").json()
+        assert all(h["configuration_id"] != saved["id"] for h in everything)
+    
+    def test_concurrent_saves_return_own_row(self):
+        from concurrent.futures import ThreadPoolExecutor
+        from app.models import ConfigurationCreate
+        from app.repositories import ConfigurationRepository
+        
+        base = {
+            "electricity_rate": 0.25,
+            "water_rate": 3.5,
+            "labor_rate": 12.0,
+            "season": "summer",
+            "tariff_mode": "standard",
+        }
+        
+        def save(i):
+            # Even saves share one name, odd saves use their own
+            name = "Concurrent Shared" if i % 2 == 0 else f"Concurrent {i}"
+            data = ConfigurationCreate(name=name, cycles_per_month=1000 + i, **base)
+            return i, name, ConfigurationRepository.save(data)
+        
+        with ThreadPoolExecutor(max_workers=16) as pool:
+            results = list(pool.map(save, range(64)))
+        
+        for i, name, saved in results:
+            assert saved["name"] == name
+            assert saved["cycles_per_month"] == 1000 + i
+        
+        configs = [c for c in client.get("/api/configurations").json() if c["name"].startswith("Concurrent")]
+        assert len(configs) == 33
+        shared_ids = {saved["id"] for i, _, saved in results if i % 2 == 0}
+        assert len(shared_ids) == 1
+        for config in configs:
+            client.delete(f"/api/configurations/{config['id']}")
 
 
 if __name__ == "__main__":